@@ -0,0 +1,29 @@
+"""add intake session expiry index
+
+Revision ID: 5b1e7c2d9a40
+Revises: 693c901b2616
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7c2d9a40'
+down_revision = '693c901b2616'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets batched expired-session cleanup find paused rows without a table scan
+    op.create_index(
+        'ix_intake_sessions_status_expires_at',
+        'intake_sessions',
+        ['status', 'expires_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_intake_sessions_status_expires_at', table_name='intake_sessions')
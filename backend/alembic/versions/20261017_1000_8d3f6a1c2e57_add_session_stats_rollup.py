@@ -0,0 +1,35 @@
+"""add session stats rollup
+
+Revision ID: 8d3f6a1c2e57
+Revises: 5b1e7c2d9a40
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3f6a1c2e57'
+down_revision = '5b1e7c2d9a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-status session counts, kept current by ORM listeners on IntakeSession
+    op.create_table(
+        'session_stats',
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status')
+    )
+    op.execute(
+        "INSERT INTO session_stats (status, count) "
+        "SELECT COALESCE(status, 'unknown'), COUNT(*) FROM intake_sessions "
+        "GROUP BY COALESCE(status, 'unknown')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('session_stats')
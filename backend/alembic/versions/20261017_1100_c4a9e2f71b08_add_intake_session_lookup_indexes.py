@@ -0,0 +1,38 @@
+"""add intake session lookup indexes
+
+Revision ID: c4a9e2f71b08
+Revises: 8d3f6a1c2e57
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e2f71b08'
+down_revision = '8d3f6a1c2e57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # resume_session: resume_token = ? AND status = 'paused' (partial, so only paused rows are indexed)
+    op.create_index(
+        'ix_intake_sessions_resume_lookup',
+        'intake_sessions',
+        ['resume_token', 'status'],
+        postgresql_where=sa.text("status = 'paused'"),
+        sqlite_where=sa.text("status = 'paused'"),
+    )
+    # get_my_sessions: patient_id = ? AND status IN (...) ORDER BY updated_at DESC
+    op.create_index(
+        'ix_intake_sessions_patient_status_updated',
+        'intake_sessions',
+        ['patient_id', 'status', 'updated_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_intake_sessions_patient_status_updated', table_name='intake_sessions')
+    op.drop_index('ix_intake_sessions_resume_lookup', table_name='intake_sessions')
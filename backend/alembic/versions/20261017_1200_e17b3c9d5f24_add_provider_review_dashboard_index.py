@@ -0,0 +1,29 @@
+"""add provider review dashboard index
+
+Revision ID: e17b3c9d5f24
+Revises: c4a9e2f71b08
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e17b3c9d5f24'
+down_revision = 'c4a9e2f71b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_dashboard_stats completed_today: provider_id = ? AND reviewed_at >= today
+    op.create_index(
+        'ix_provider_reviews_provider_reviewed_at',
+        'provider_reviews',
+        ['provider_id', 'reviewed_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_provider_reviews_provider_reviewed_at', table_name='provider_reviews')
@@ -0,0 +1,30 @@
+"""unique provider review per report
+
+Revision ID: 3a6f0d8c7b19
+Revises: e17b3c9d5f24
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a6f0d8c7b19'
+down_revision = 'e17b3c9d5f24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_review upserts with ON CONFLICT (report_id, provider_id)
+    op.create_index(
+        'uq_provider_reviews_report_provider',
+        'provider_reviews',
+        ['report_id', 'provider_id'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_provider_reviews_report_provider', table_name='provider_reviews')
@@ -0,0 +1,36 @@
+"""add intake report list indexes
+
+Revision ID: 9c2e5a7f4d16
+Revises: 3a6f0d8c7b19
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2e5a7f4d16'
+down_revision = '3a6f0d8c7b19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_my_reports / list_reports: patient_id = ? ORDER BY created_at DESC LIMIT n
+    op.create_index(
+        'ix_intake_reports_patient_created',
+        'intake_reports',
+        ['patient_id', 'created_at'],
+    )
+    # list_reports (providers): shared_with_provider_id = ? ORDER BY created_at DESC
+    op.create_index(
+        'ix_intake_reports_shared_provider_created',
+        'intake_reports',
+        ['shared_with_provider_id', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_intake_reports_shared_provider_created', table_name='intake_reports')
+    op.drop_index('ix_intake_reports_patient_created', table_name='intake_reports')
@@ -0,0 +1,29 @@
+"""add generated chief_complaint column to intake reports
+
+Revision ID: 5b8d1e4a7c23
+Revises: 9c2e5a7f4d16
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8d1e4a7c23'
+down_revision = '9c2e5a7f4d16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        computed = sa.Computed("report_data ->> 'chief_complaint'", persisted=True)
+    else:
+        # SQLite can only add VIRTUAL generated columns to an existing table
+        computed = sa.Computed("json_extract(report_data, '$.chief_complaint')", persisted=False)
+    op.add_column('intake_reports', sa.Column('chief_complaint', sa.String(), computed, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('intake_reports', 'chief_complaint')
@@ -0,0 +1,50 @@
+"""add intake report assignment and review columns
+
+Revision ID: 7e4c2b9a1d58
+Revises: 5b8d1e4a7c23
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4c2b9a1d58'
+down_revision = '5b8d1e4a7c23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Plain add_column rather than batch mode: SQLite cannot copy the generated
+    # chief_complaint column into a rebuilt table, so the FK is Postgres-only
+    op.add_column('intake_reports', sa.Column('assigned_provider_id', sa.String(length=36), nullable=True))
+    op.add_column('intake_reports', sa.Column('assigned_at', sa.DateTime(), nullable=True))
+    op.add_column('intake_reports', sa.Column('review_status', sa.String(length=20), nullable=True))
+    op.add_column('intake_reports', sa.Column('reviewed_at', sa.DateTime(), nullable=True))
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_foreign_key(
+            'fk_intake_reports_assigned_provider_id_users',
+            'intake_reports',
+            'users',
+            ['assigned_provider_id'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+    # Provider queue / dashboard: assigned_provider_id = ? AND review_status IN (...)
+    op.create_index(
+        'ix_intake_reports_assigned_provider_status',
+        'intake_reports',
+        ['assigned_provider_id', 'review_status'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_intake_reports_assigned_provider_status', table_name='intake_reports')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('fk_intake_reports_assigned_provider_id_users', 'intake_reports', type_='foreignkey')
+    op.drop_column('intake_reports', 'reviewed_at')
+    op.drop_column('intake_reports', 'review_status')
+    op.drop_column('intake_reports', 'assigned_at')
+    op.drop_column('intake_reports', 'assigned_provider_id')
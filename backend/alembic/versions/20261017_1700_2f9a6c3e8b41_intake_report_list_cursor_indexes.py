@@ -0,0 +1,53 @@
+"""extend intake report list indexes with id for (created_at, id) cursors
+
+Revision ID: 2f9a6c3e8b41
+Revises: 7e4c2b9a1d58
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f9a6c3e8b41'
+down_revision = '7e4c2b9a1d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_reports pages on (created_at, id) < cursor ORDER BY created_at DESC, id DESC
+    op.drop_index('ix_intake_reports_patient_created', table_name='intake_reports')
+    op.create_index(
+        'ix_intake_reports_patient_created',
+        'intake_reports',
+        ['patient_id', 'created_at', 'id'],
+    )
+    op.drop_index('ix_intake_reports_shared_provider_created', table_name='intake_reports')
+    op.create_index(
+        'ix_intake_reports_shared_provider_created',
+        'intake_reports',
+        ['shared_with_provider_id', 'created_at', 'id'],
+    )
+    op.create_index(
+        'ix_intake_reports_created_id',
+        'intake_reports',
+        ['created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_intake_reports_created_id', table_name='intake_reports')
+    op.drop_index('ix_intake_reports_shared_provider_created', table_name='intake_reports')
+    op.create_index(
+        'ix_intake_reports_shared_provider_created',
+        'intake_reports',
+        ['shared_with_provider_id', 'created_at'],
+    )
+    op.drop_index('ix_intake_reports_patient_created', table_name='intake_reports')
+    op.create_index(
+        'ix_intake_reports_patient_created',
+        'intake_reports',
+        ['patient_id', 'created_at'],
+    )
@@ -0,0 +1,31 @@
+"""add provider review follow-up and risk assessment columns
+
+Revision ID: 9c2e5a7f3b16
+Revises: 2f9a6c3e8b41
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2e5a7f3b16'
+down_revision = '2f9a6c3e8b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('provider_reviews', sa.Column('risk_assessment', sa.Text(), nullable=True))
+    op.add_column(
+        'provider_reviews',
+        sa.Column('follow_up_required', sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column('provider_reviews', sa.Column('follow_up_date', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('provider_reviews', 'follow_up_date')
+    op.drop_column('provider_reviews', 'follow_up_required')
+    op.drop_column('provider_reviews', 'risk_assessment')
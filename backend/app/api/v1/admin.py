@@ -3,7 +3,7 @@ Admin Endpoints
 Administrative functions for managing the platform, providers, and assignments
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, raiseload
 from sqlalchemy import desc, and_, or_
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -123,7 +123,7 @@ async def get_unassigned_reports(
     """
     Get reports that haven't been assigned to any provider
     """
-    reports = assignment_service.get_unassigned_reports(db, limit)
+    reports = assignment_service.get_unassigned_report_summaries(db, limit)
     
     return [
         {
@@ -132,7 +132,7 @@ async def get_unassigned_reports(
             "risk_level": report.risk_level,
             "urgency": report.urgency,
             "created_at": report.created_at,
-            "chief_complaint": report.report_data.get("chief_complaint") if report.report_data else None
+            "chief_complaint": report.chief_complaint
         } for report in reports
     ]
 
@@ -301,7 +301,11 @@ async def get_high_risk_intakes(
     """
     Get all high-risk intake sessions for review
     """
-    high_risk_reports = db.query(IntakeReport).filter(
+    # Session tokens come from the same query; any other relationship access raises
+    high_risk_reports = db.query(IntakeReport).options(
+        joinedload(IntakeReport.session).load_only(IntakeSession.session_token),
+        raiseload("*")
+    ).filter(
         IntakeReport.risk_level == "high"
     ).order_by(desc(IntakeReport.created_at)).all()
     
@@ -479,7 +483,7 @@ async def assign_report_to_provider(
         type="report_assigned",
         priority="medium",
         title="New Intake Report Assigned",
-        message=f"A new intake report has been assigned to you for review.\n\nChief Complaint: {report.report_data.get('chief_complaint', 'N/A')}\nSeverity: {report.severity_level}\nRisk Level: {report.risk_level}",
+        message=f"A new intake report has been assigned to you for review.\n\nChief Complaint: {report.chief_complaint or 'N/A'}\nSeverity: {report.severity_level}\nRisk Level: {report.risk_level}",
         resource_type="intake_report",
         resource_id=report.id
     )
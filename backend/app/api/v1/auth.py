@@ -4,12 +4,13 @@ User registration, login, and token management
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.models.user import User, UserRole
 from app.models.provider_profile import ProviderProfile
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import verify_password, get_password_hash, password_needs_rehash, create_access_token
 from app.core.deps import get_current_user
 from app.core.config import settings
 
@@ -23,11 +24,11 @@ async def create_demo_user(db: Session = Depends(get_db)):
     """
     demo_email = "demo@demo.com"
     
-    # Check if demo user already exists
-    existing_user = db.query(User).filter(User.email == demo_email).first()
-    if existing_user:
+    # Check if demo user already exists (only the id is needed for the token)
+    existing_user_id = db.scalar(select(User.id).where(User.email == demo_email))
+    if existing_user_id is not None:
         # Return existing demo user
-        access_token = create_access_token(data={"sub": str(existing_user.id)})
+        access_token = create_access_token(data={"sub": str(existing_user_id)})
         return Token(access_token=access_token)
     
     # Create demo user
@@ -59,8 +60,8 @@ async def register(
     For providers: account is created with pending approval status
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    email_taken = db.scalar(select(select(User.id).where(User.email == user_data.email).exists()))
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -115,6 +116,11 @@ async def login(
             detail="Account is inactive"
         )
     
+    # Upgrade legacy hashes while the plain password is at hand
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(credentials.password)
+        db.commit()
+    
     # Check if provider is approved
     if user.role == UserRole.PROVIDER:
         provider_profile = db.query(ProviderProfile).filter(
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user, get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.schemas.billing import (
     InvoiceCreateRequest,
     InvoiceResponse,
@@ -71,14 +71,14 @@ async def get_invoices(
     """Get invoices for current user"""
     
     try:
-        if current_user.role == "patient":
+        if current_user.role is UserRole.PATIENT:
             invoices = billing_service.get_patient_invoices(
                 patient_id=current_user.id,
                 status=status,
                 limit=limit,
                 db=db
             )
-        elif current_user.role == "provider":
+        elif current_user.role is UserRole.PROVIDER:
             # Get invoices created by provider
             invoices = billing_service.get_patient_invoices(
                 patient_id=current_user.id,  # This should be modified to get provider's invoices
@@ -2,29 +2,38 @@
 Intake Endpoints
 Patient intake session and conversation management
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, load_only
 from typing import AsyncIterator
 import json
+import orjson
 from datetime import datetime, timedelta
 import asyncio
-import secrets
+import base64
+import collections
+import os
 import logging
+import threading
+import time
 
 from app.schemas.intake import (
     IntakeSessionCreate,
     IntakeSessionResponse,
     ChatRequest,
     ChatResponse,
-    FinishIntakeRequest
+    FinishIntakeRequest,
+    TransferSessionRequest
 )
 from app.services.conversation_service import conversation_service
 from app.core.rate_limit import (
     limiter, 
-    get_chat_rate_limit, 
     get_start_rate_limit, 
-    get_pause_resume_rate_limit
+    chat_token_bucket,
+    pause_resume_token_bucket,
+    token_bucket_limit
 )
 from typing import Optional
 
@@ -33,9 +42,10 @@ logger = logging.getLogger(__name__)
 
 # Conditional imports - these may fail if database is not available
 try:
-    from app.db.session import get_db
+    from app.db.session import get_db, SessionLocal, CleanupSessionLocal
     from app.models.intake_session import IntakeSession
     from app.models.intake_report import IntakeReport
+    from app.models.session_stat import adjust_session_stats
     from app.services.report_service import report_service
     from app.services.escalation_service import escalation_service
     from app.services.pdf_service import pdf_service
@@ -45,13 +55,16 @@ try:
     from app.models.user import User
     DB_AVAILABLE = True
 except Exception as e:
-    logger.warning(f"Database dependencies not available: {e}")
+    logger.warning("Database dependencies not available: %s", e)
     DB_AVAILABLE = False
     # Create dummy dependencies to prevent NameError
     def get_db():
         raise HTTPException(status_code=503, detail="Database not available")
+    SessionLocal = None
+    CleanupSessionLocal = None
     IntakeSession = None
     IntakeReport = None
+    adjust_session_stats = None
     report_service = None
     escalation_service = None
     pdf_service = None
@@ -60,24 +73,43 @@ except Exception as e:
     get_current_user_optional = None
     User = None
 
+# Short-lived cache for /stats so bursts of dashboard polls share one aggregation
+STATS_CACHE_TTL_SECONDS = 30
+_stats_cache = {"ts": 0.0, "value": None}
+_stats_cache_lock = asyncio.Lock()
 
-@router.get("/session/{session_token}/recover")
+# Upper bound on sessions returned by /sessions/me
+MY_SESSIONS_LIMIT = 100
+
+# Resume tokens are cut from one larger os.urandom() read instead of one read per pause
+RESUME_TOKEN_BYTES = 32
+RESUME_TOKEN_BATCH = 256
+_resume_token_pool = collections.deque()
+_resume_token_pool_lock = threading.Lock()
+
+
+def _find_session_by_token(db: Session, session_token: str) -> Optional[IntakeSession]:
+    """Blocking lookup of an intake session by its token (run via asyncio.to_thread)"""
+    return db.query(IntakeSession).filter(
+        IntakeSession.session_token == session_token
+    ).first()
+
+
+@router.get("/session/{session_token}/recover", response_class=ORJSONResponse)
 async def recover_session(session_token: str, db: Session = Depends(get_db)):
     """Recover a session that encountered an error"""
     try:
         # Check if session exists
-        session = db.query(IntakeSession).filter(
-            IntakeSession.session_token == session_token
-        ).first()
+        session = await asyncio.to_thread(_find_session_by_token, db, session_token)
         
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Try to load session from database first
-        loaded_session = conversation_service.load_session_from_db(session_token, db)
+        loaded_session = await asyncio.to_thread(conversation_service.load_session_from_db, session_token, db)
         
         # Get conversation history from conversation service
-        conversation_history = conversation_service.get_conversation_history(session_token)
+        conversation_history = await asyncio.to_thread(conversation_service.get_conversation_history, session_token)
         
         # If no conversation history in memory, try to get it from database
         if not conversation_history and session.conversation_history:
@@ -100,7 +132,7 @@ async def recover_session(session_token: str, db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        logger.error(f"Error recovering session {session_token}: {str(e)}")
+        logger.error("Error recovering session %s: %s", session_token, e)
         raise HTTPException(status_code=500, detail="Failed to recover session")
 
 
@@ -117,12 +149,13 @@ async def start_intake_session(
     """
     try:
         # Create session in conversation service (no database required)
-        conv_session = conversation_service.create_session(
+        conv_session = await asyncio.to_thread(
+            conversation_service.create_session,
             patient_id=session_data.patient_id,
             user_name=session_data.user_name
         )
         
-        logger.info(f"Session created: {conv_session['session_token']}")
+        logger.info("Session created: %s", conv_session['session_token'])
         
         # Always return in-memory session (database optional for now)
         return IntakeSessionResponse(
@@ -133,18 +166,152 @@ async def start_intake_session(
             created_at=datetime.fromisoformat(conv_session["created_at"])
         )
     except Exception as e:
-        logger.error(f"Session creation failed: {e}")
+        logger.error("Session creation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create session: {str(e)}"
         )
 
 
-@router.post("/chat")
-@limiter.limit(get_chat_rate_limit)
+def _new_resume_token() -> str:
+    """URL-safe random token, equivalent to secrets.token_urlsafe(RESUME_TOKEN_BYTES)"""
+    with _resume_token_pool_lock:
+        if not _resume_token_pool:
+            buffer = os.urandom(RESUME_TOKEN_BYTES * RESUME_TOKEN_BATCH)
+            _resume_token_pool.extend(
+                base64.urlsafe_b64encode(buffer[i:i + RESUME_TOKEN_BYTES]).rstrip(b"=").decode("ascii")
+                for i in range(0, len(buffer), RESUME_TOKEN_BYTES)
+            )
+        return _resume_token_pool.popleft()
+
+
+# Headers for every SSE response. X-Accel-Buffering stops nginx-style proxies
+# from holding tokens back until their buffer fills.
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _sse_frame(message: ChatResponse) -> str:
+    """Serialize a chat message as one Server-Sent Events frame"""
+    return f"data: {message.model_dump_json()}\n\n"
+
+
+# Streamed text chunks always have this shape (same bytes as ChatResponse.model_dump_json()),
+# so build them from a template instead of constructing a model per token
+_CHUNK_FRAME_TEMPLATE = (
+    b'data: {"role":"model","content":%s,"timestamp":"%s","done":false,"options":null,'
+    b'"pdf_report":null,"patient_pdf":null,"clinician_pdf":null,"completion_status":null}\n\n'
+)
+
+
+def _sse_timestamp() -> bytes:
+    """Current time in the encoding _sse_chunk_frame expects"""
+    return datetime.utcnow().isoformat().encode()
+
+
+def _sse_chunk_frame(content: str, timestamp: bytes) -> bytes:
+    """
+    SSE frame for an in-progress (done=False) text chunk
+    Streams stamp every chunk with one timestamp taken when the stream starts
+    """
+    return _CHUNK_FRAME_TEMPLATE % (orjson.dumps(content), timestamp)
+
+
+def _static_sse_frame(content: str, completion_status: Optional[str] = None, done: bool = False) -> bytes:
+    """Serialize a fixed message once; its timestamp is the server start time"""
+    return _sse_frame(ChatResponse(
+        role="model",
+        content=content,
+        timestamp=datetime.utcnow(),
+        done=done,
+        completion_status=completion_status
+    )).encode()
+
+
+# :finish progress frames never change, so serialize them once at import.
+# The client stamps messages with its own clock, so the frozen timestamp is never shown.
+_FINISH_STARTED_FRAMES = _static_sse_frame(
+    "🏁 Completing your assessment...\n\n┌─────────────────────────────────────────┐\n│ ✅ Analyzing your responses              │\n│ ⏳ Generating personalized report...     │\n│ ⏳ Creating downloadable PDF...          │\n│ ⏳ Finalizing everything...             │\n└─────────────────────────────────────────┘\n\nThis usually takes 30-60 seconds...",
+    completion_status="processing"
+) + _static_sse_frame("📊 Generating your personalized report...", completion_status="generating_report")
+_FINISH_PDF_FRAME = _static_sse_frame("📄 Creating your downloadable report...", completion_status="generating_pdf")
+_FINISH_COMPLETED_FRAMES = _static_sse_frame(
+    "✅ Finalizing everything...", completion_status="finalizing"
+) + _static_sse_frame(
+    "✅ Assessment complete! Your report has been generated and saved to your dashboard.",
+    completion_status="completed"
+)
+_FINISH_HIGH_RISK_FRAME = _static_sse_frame("\n🚨 HIGH RISK ALERT: Admin has been notified for immediate review.")
+_FINISH_ERROR_FRAME = _static_sse_frame(
+    "❌ Sorry, there was an error completing your assessment. Please try again or contact support.",
+    done=True
+)
+
+
+def _persist_completion(
+    session_token: str,
+    session_id: Optional[str],
+    patient_id: Optional[str],
+    patient_report: dict,
+    clinician_report: dict,
+    risk_level: str,
+):
+    """
+    Store the intake report and mark the session completed
+    Runs as a background task once the :finish stream has closed, on its own DB session
+    """
+    db = SessionLocal()
+    try:
+        session_record = db.query(IntakeSession).filter(
+            IntakeSession.session_token == session_token
+        ).first()
+        
+        # Create intake report record
+        db.add(IntakeReport(
+            session_id=session_id or (session_record.id if session_record else None),
+            patient_id=patient_id,
+            report_data=patient_report,
+            clinician_report_data=clinician_report,
+            severity_level=patient_report.get("severity_level"),
+            risk_level=risk_level,
+            urgency=patient_report.get("urgency"),
+            patient_pdf_path="generated",  # Mark as generated
+            clinician_pdf_path="generated"
+        ))
+        
+        # Update session status
+        if session_record:
+            session_record.status = "completed"
+            session_record.completed_at = datetime.utcnow()
+        
+        db.commit()
+    except Exception as e:
+        logger.error("Failed to save report to database: %s", e)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _save_session_snapshot(session_token: str):
+    """
+    Write the conversation session to its DB row once the chat stream has closed
+    Runs as a background task, after the request's DB session is gone, so it opens its own
+    """
+    db = SessionLocal()
+    try:
+        conversation_service.save_session_to_db(session_token, db)
+    finally:
+        db.close()
+
+
+@router.post("/chat", dependencies=[Depends(token_bucket_limit(chat_token_bucket))])
 async def chat(
     request: Request,
     chat_request: ChatRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
@@ -153,8 +320,8 @@ async def chat(
     
     Uses Server-Sent Events (SSE) for streaming
     """
-    # Get in-memory session (no database required)
-    session = conversation_service.get_session(chat_request.session_token)
+    # Get in-memory session (no database required); a snapshot when sessions live in Redis
+    session = await asyncio.to_thread(conversation_service.get_session, chat_request.session_token)
     
     if not session:
         raise HTTPException(
@@ -164,30 +331,20 @@ async def chat(
     
     # Handle initial greeting (empty prompt)
     if not chat_request.prompt or chat_request.prompt.strip() == "":
-        greeting = await conversation_service.get_initial_greeting(chat_request.session_token)
+        async with conversation_service.session_scope(chat_request.session_token):
+            greeting = await conversation_service.get_initial_greeting(chat_request.session_token)
+            # Add to history
+            conversation_service.add_message(chat_request.session_token, "model", greeting)
         
         # Format as SSE
         async def stream_greeting():
             # Send greeting
-            message = ChatResponse(
-                role="model",
-                content=greeting,
-                timestamp=datetime.utcnow(),
-                done=False
-            )
-            yield f"data: {message.model_dump_json()}\n\n"
-            
-            # Add to history
-            conversation_service.add_message(chat_request.session_token, "model", greeting)
+            yield _sse_chunk_frame(greeting, _sse_timestamp())
         
         return StreamingResponse(
             stream_greeting(),
             media_type="text/event-stream",
-            headers={
-                "X-Session-ID": chat_request.session_token,
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            }
+            headers={"X-Session-ID": chat_request.session_token, **_SSE_HEADERS}
         )
     
     # Handle :finish command
@@ -199,24 +356,9 @@ async def chat(
         async def stream_completion_with_progress():
             try:
                 # Step 1: Initial confirmation
-                progress_msg = ChatResponse(
-                    role="model",
-                    content="🏁 Completing your assessment...\n\n┌─────────────────────────────────────────┐\n│ ✅ Analyzing your responses              │\n│ ⏳ Generating personalized report...     │\n│ ⏳ Creating downloadable PDF...          │\n│ ⏳ Finalizing everything...             │\n└─────────────────────────────────────────┘\n\nThis usually takes 30-60 seconds...",
-                    timestamp=datetime.utcnow(),
-                    done=False,
-                    completion_status="processing"
-                )
-                yield f"data: {progress_msg.model_dump_json()}\n\n"
-                
                 # Step 2: Generate reports
-                progress_msg = ChatResponse(
-                    role="model",
-                    content="📊 Generating your personalized report...",
-                    timestamp=datetime.utcnow(),
-                    done=False,
-                    completion_status="generating_report"
-                )
-                yield f"data: {progress_msg.model_dump_json()}\n\n"
+                # Both frames go out back-to-back, so send them in a single write
+                yield _FINISH_STARTED_FRAMES
                 
                 dual_reports = await report_service.generate_dual_reports(session)
                 patient_report = dual_reports["patient_report"]
@@ -237,18 +379,14 @@ async def chat(
                     )
                 
                 # Step 4: Generate PDFs
-                progress_msg = ChatResponse(
-                    role="model",
-                    content="📄 Creating your downloadable report...",
-                    timestamp=datetime.utcnow(),
-                    done=False,
-                    completion_status="generating_pdf"
-                )
-                yield f"data: {progress_msg.model_dump_json()}\n\n"
+                yield _FINISH_PDF_FRAME
                 
                 patient_name = f"{current_user.first_name} {current_user.last_name}".strip() if current_user else "Patient"
-                patient_pdf_base64 = pdf_service.generate_patient_report_base64(patient_report, patient_name)
-                clinician_pdf_base64 = pdf_service.generate_clinician_report_base64(clinician_report, patient_name)
+                # PDF rendering is CPU-bound; keep it off the event loop and render both side by side
+                patient_pdf_base64, clinician_pdf_base64 = await asyncio.gather(
+                    asyncio.to_thread(pdf_service.generate_patient_report_base64, patient_report, patient_name),
+                    asyncio.to_thread(pdf_service.generate_clinician_report_base64, clinician_report, patient_name),
+                )
                 
                 # Step 4.5: Email reports to admin (non-blocking)
                 try:
@@ -262,37 +400,16 @@ async def chat(
                             )
                         )
                 except Exception as e:
-                    logger.error(f"Failed to schedule completion email for {session_token_str}: {e}")
+                    logger.error("Failed to schedule completion email for %s: %s", session_token_str, e)
                 
                 # Step 5: Final completion
-                progress_msg = ChatResponse(
-                    role="model",
-                    content="✅ Finalizing everything...",
-                    timestamp=datetime.utcnow(),
-                    done=False,
-                    completion_status="finalizing"
-                )
-                yield f"data: {progress_msg.model_dump_json()}\n\n"
-                
-                # Final completion message
-                conf_msg = ChatResponse(
-                    role="model",
-                    content="✅ Assessment complete! Your report has been generated and saved to your dashboard.",
-                    timestamp=datetime.utcnow(),
-                    done=False,
-                    completion_status="completed"
-                )
-                yield f"data: {conf_msg.model_dump_json()}\n\n"
+                # Everything from here to the report frame is ready at once; buffer and send in one write
+                # (finalizing + final completion message)
+                final_frames = [_FINISH_COMPLETED_FRAMES]
                 
                 # High-risk alert (if applicable)
                 if risk_level == "high":
-                    alert_msg = ChatResponse(
-                        role="model",
-                        content="\n🚨 HIGH RISK ALERT: Admin has been notified for immediate review.",
-                        timestamp=datetime.utcnow(),
-                        done=False
-                    )
-                    yield f"data: {alert_msg.model_dump_json()}\n\n"
+                    final_frames.append(_FINISH_HIGH_RISK_FRAME)
                 
                 # Report summary (formatted nicely)
                 summary_content = f"""Assessment Summary:
@@ -318,123 +435,89 @@ Both reports are available for download below.
                     patient_pdf=patient_pdf_base64,  # Patient version
                     clinician_pdf=clinician_pdf_base64  # Clinician version
                 )
-                yield f"data: {report_msg.model_dump_json()}\n\n"
+                final_frames.append(_sse_frame(report_msg).encode())
+                yield b"".join(final_frames)
                 
-                # Save report to database
-                try:
-                    if DB_AVAILABLE:
-                        # Create intake report record
-                        report_record = IntakeReport(
-                            session_id=session.get("id"),
-                            patient_id=current_user.id if current_user else None,
-                            report_data=patient_report,
-                            clinician_report_data=clinician_report,
-                            severity_level=patient_report.get("severity_level"),
-                            risk_level=risk_level,
-                            urgency=patient_report.get("urgency"),
-                            patient_pdf_path="generated",  # Mark as generated
-                            clinician_pdf_path="generated"
-                        )
-                        db.add(report_record)
-                        db.commit()
-                        
-                        # Update session status
-                        session_record = db.query(IntakeSession).filter(
-                            IntakeSession.session_token == session_token_str
-                        ).first()
-                        if session_record:
-                            session_record.status = "completed"
-                            session_record.completed_at = datetime.utcnow()
-                            db.commit()
-                except Exception as e:
-                    logger.error(f"Failed to save report to database: {e}")
-                    # Continue anyway - report generation succeeded
+                # Save report to database after the stream has closed
+                if DB_AVAILABLE and SessionLocal is not None:
+                    background_tasks.add_task(
+                        _persist_completion,
+                        session_token_str,
+                        session.get("id"),
+                        current_user.id if current_user else None,
+                        patient_report,
+                        clinician_report,
+                        risk_level,
+                    )
                 
             except Exception as e:
-                logger.error(f"Error during assessment completion: {e}")
+                logger.error("Error during assessment completion: %s", e)
                 # Send error message
-                error_msg = ChatResponse(
-                    role="model",
-                    content="❌ Sorry, there was an error completing your assessment. Please try again or contact support.",
-                    timestamp=datetime.utcnow(),
-                    done=True
-                )
-                yield f"data: {error_msg.model_dump_json()}\n\n"
+                yield _FINISH_ERROR_FRAME
         
         return StreamingResponse(
             stream_completion_with_progress(),
             media_type="text/event-stream",
-            headers={
-                "X-Session-ID": session_token_str,
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            }
+            headers={"X-Session-ID": session_token_str, **_SSE_HEADERS}
         )
     
     
     # Normal conversation
     async def stream_response():
-        full_response = ""
-        
-        try:
-            async for chunk in conversation_service.process_user_message(
-                chat_request.session_token,
-                chat_request.prompt
-            ):
-                full_response += chunk
-                
-                # Send chunk
-                message = ChatResponse(
-                    role="model",
-                    content=chunk,
-                    timestamp=datetime.utcnow(),
-                    done=False
-                )
-                yield f"data: {message.model_dump_json()}\n\n"
-        
-        except Exception as e:
-            logger.error(f"Error processing message for session {chat_request.session_token}: {str(e)}")
+        # Concurrent messages for the same session (double taps, retries) take turns
+        # instead of interleaving their history appends
+        async with conversation_service.session_lock(chat_request.session_token), \
+                conversation_service.session_scope(chat_request.session_token):
+            full_response = ""
+            stream_timestamp = _sse_timestamp()
             
-            # Send error message to user
-            error_message = ChatResponse(
-                role="model",
-                content="I apologize, but I encountered an error processing your message. Please try rephrasing your response or continue with the assessment. Your progress is saved.",
-                timestamp=datetime.utcnow(),
-                done=True
-            )
-            yield f"data: {error_message.model_dump_json()}\n\n"
-            return
-        
-        # Check for options and send final message with options if available
-        session = conversation_service.get_session(chat_request.session_token)
-        if session and session["conversation_history"]:
-            last_message = session["conversation_history"][-1]
-            if last_message.get("options"):
-                # Send final message with options
-                final_message = ChatResponse(
+            try:
+                async for chunk in conversation_service.process_user_message(
+                    chat_request.session_token,
+                    chat_request.prompt
+                ):
+                    full_response += chunk
+            
+                    # Send chunk
+                    yield _sse_chunk_frame(chunk, stream_timestamp)
+            
+            except Exception as e:
+                logger.error("Error processing message for session %s: %s", chat_request.session_token, e)
+            
+                # Send error message to user
+                error_message = ChatResponse(
                     role="model",
-                    content="",  # No additional content, just options
+                    content="I apologize, but I encountered an error processing your message. Please try rephrasing your response or continue with the assessment. Your progress is saved.",
                     timestamp=datetime.utcnow(),
-                    done=True,
-                    options=last_message["options"]
+                    done=True
                 )
-                yield f"data: {final_message.model_dump_json()}\n\n"
-        
-        # Update database with comprehensive session data
-        try:
-            conversation_service.save_session_to_db(chat_request.session_token, db)
-        except Exception as e:
-            logger.error(f"Error saving session to database: {str(e)}")
-            # Continue without failing the response
+                yield f"data: {error_message.model_dump_json()}\n\n"
+                return
+            
+            # Check for options and send final message with options if available
+            session = conversation_service.get_session(chat_request.session_token)
+            if session and session["conversation_history"]:
+                last_message = session["conversation_history"][-1]
+                if last_message.get("options"):
+                    # Send final message with options
+                    final_message = ChatResponse(
+                        role="model",
+                        content="",  # No additional content, just options
+                        timestamp=datetime.utcnow(),
+                        done=True,
+                        options=last_message["options"]
+                    )
+                    yield f"data: {final_message.model_dump_json()}\n\n"
+    
+    # Update database with comprehensive session data once the stream has closed
+    # (save_session_to_db logs its own errors and skips unchanged sessions)
+    if DB_AVAILABLE and SessionLocal is not None:
+        background_tasks.add_task(_save_session_snapshot, chat_request.session_token)
     
     return StreamingResponse(
         stream_response(),
         media_type="text/event-stream",
-        headers={
-            "X-Session-ID": chat_request.session_token,
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+        headers={"X-Session-ID": chat_request.session_token, **_SSE_HEADERS}
     )
 
 
@@ -454,11 +537,25 @@ async def get_my_sessions(
         # For anonymous users, we can't fetch sessions without authentication
         return {"sessions": [], "message": "Please sign in to see your sessions"}
     
-    # Get all sessions for this user
-    sessions = db.query(IntakeSession).filter(
+    # Get this user's most recent sessions, loading only the columns listed below
+    # (skips the conversation_history / extracted_data JSON blobs)
+    sessions = db.query(IntakeSession).options(
+        load_only(
+            IntakeSession.id,
+            IntakeSession.session_token,
+            IntakeSession.status,
+            IntakeSession.current_phase,
+            IntakeSession.resume_token,
+            IntakeSession.paused_at,
+            IntakeSession.expires_at,
+            IntakeSession.created_at,
+            IntakeSession.updated_at,
+            IntakeSession.completed_screeners,
+        )
+    ).filter(
         IntakeSession.patient_id == str(current_user.id),
         IntakeSession.status.in_(["active", "paused"])
-    ).order_by(IntakeSession.updated_at.desc()).all()
+    ).order_by(IntakeSession.updated_at.desc()).limit(MY_SESSIONS_LIMIT).all()
     
     result = []
     for session in sessions:
@@ -489,14 +586,12 @@ async def get_session(
     Returns current session data
     """
     # Check in-memory first
-    conv_session = conversation_service.get_session(session_token)
+    conv_session = await asyncio.to_thread(conversation_service.get_session, session_token)
     if conv_session:
         return conv_session
     
     # Check database
-    db_session = db.query(IntakeSession).filter(
-        IntakeSession.session_token == session_token
-    ).first()
+    db_session = await asyncio.to_thread(_find_session_by_token, db, session_token)
     
     if not db_session:
         raise HTTPException(
@@ -513,8 +608,7 @@ async def get_session(
     }
 
 
-@router.post("/pause")
-@limiter.limit(get_pause_resume_rate_limit)
+@router.post("/pause", dependencies=[Depends(token_bucket_limit(pause_resume_token_bucket))])
 async def pause_session(
     request: Request,
     pause_request: ChatRequest,
@@ -526,9 +620,7 @@ async def pause_session(
     Can only pause between conversations and after completed assessments
     """
     # Verify session exists
-    db_session = db.query(IntakeSession).filter(
-        IntakeSession.session_token == pause_request.session_token
-    ).first()
+    db_session = await asyncio.to_thread(_find_session_by_token, db, pause_request.session_token)
     
     if not db_session:
         raise HTTPException(
@@ -543,7 +635,7 @@ async def pause_session(
         )
     
     # Check if we can pause (not in middle of an assessment)
-    session_data = conversation_service.get_session(pause_request.session_token)
+    session_data = await asyncio.to_thread(conversation_service.get_session, pause_request.session_token)
     if not session_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -560,38 +652,39 @@ async def pause_session(
         )
     
     # Generate secure resume token
-    resume_token = secrets.token_urlsafe(32)
+    resume_token = _new_resume_token()
     
     # Calculate expiration (24 hours from now)
-    expires_at = datetime.utcnow() + timedelta(hours=24)
+    paused_at = datetime.utcnow()
+    expires_at = paused_at + timedelta(hours=24)
     
     # Update session with pause information
     db_session.status = "paused"
-    db_session.paused_at = datetime.utcnow()
+    db_session.paused_at = paused_at
     db_session.expires_at = expires_at
     db_session.resume_token = resume_token
     
     # Track completed screeners and current progress
-    db_session.completed_screeners = session_data.get("completed_screeners", [])
+    completed_screeners = session_data.get("completed_screeners", [])
+    db_session.completed_screeners = completed_screeners
     db_session.current_screener = session_data.get("current_screener")
     db_session.screener_progress = session_data.get("screener_progress", {})
     
-    db.commit()
+    await asyncio.to_thread(db.commit)
     
     return {
         "message": "Session paused successfully",
         "resume_token": resume_token,
         "expires_at": expires_at.isoformat(),
-        "completed_screeners": db_session.completed_screeners,
+        "completed_screeners": completed_screeners,
         "can_resume": True
     }
 
 
-@router.post("/resume")
-@limiter.limit(get_pause_resume_rate_limit)
+@router.post("/resume", dependencies=[Depends(token_bucket_limit(pause_resume_token_bucket))])
 async def resume_session(
-    http_request: Request,
-    request: dict,  # {"resume_token": "..."}
+    request: Request,
+    resume_request: dict,  # {"resume_token": "..."}
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
@@ -599,69 +692,116 @@ async def resume_session(
     Resume a paused intake session
     Checks expiration and restores session state
     """
-    resume_token = request.get("resume_token")
+    resume_token = resume_request.get("resume_token")
     if not resume_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Resume token required"
         )
     
-    # Find paused session by resume token
-    db_session = db.query(IntakeSession).filter(
-        IntakeSession.resume_token == resume_token,
-        IntakeSession.status == "paused"
-    ).first()
+    # Find paused session by resume token (id and expiry only)
+    paused = await asyncio.to_thread(_find_paused_session, db, resume_token)
     
-    if not db_session:
+    if not paused:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Paused session not found or already resumed"
         )
     
     # Check if session has expired
-    if db_session.expires_at and db_session.expires_at < datetime.utcnow():
+    if paused.expires_at and paused.expires_at < datetime.utcnow():
         # Mark as abandoned and clean up
-        db_session.status = "abandoned"
-        db.commit()
+        await asyncio.to_thread(_set_paused_session_status, db, paused.id, "abandoned")
         raise HTTPException(
             status_code=status.HTTP_410_GONE,
             detail="Session has expired. Please start a new assessment."
         )
     
-    # Restore session state
-    db_session.status = "active"
-    db_session.paused_at = None
-    db_session.expires_at = None
-    db_session.resume_token = None
+    # Restore session state; the UPDATE returns the saved progress in the same round-trip
+    restored = await asyncio.to_thread(
+        _set_paused_session_status, db, paused.id, "active", _RESUME_RETURNING,
+        paused_at=None, expires_at=None, resume_token=None
+    )
+    if restored is None:
+        # Resumed (or expired) by another request since the lookup
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paused session not found or already resumed"
+        )
     
     # Restore conversation service state
     session_data = {
-        "conversation_history": db_session.conversation_history or [],
-        "extracted_data": db_session.extracted_data or {},
-        "screener_scores": db_session.screener_scores or {},
-        "completed_screeners": db_session.completed_screeners or [],
-        "current_screener": db_session.current_screener,
-        "screener_progress": db_session.screener_progress or {},
-        "current_phase": db_session.current_phase
+        "conversation_history": restored.conversation_history or [],
+        "extracted_data": restored.extracted_data or {},
+        "screener_scores": restored.screener_scores or {},
+        "completed_screeners": restored.completed_screeners or [],
+        "current_screener": restored.current_screener,
+        "screener_progress": restored.screener_progress or {},
+        "current_phase": restored.current_phase
     }
-    
-    conversation_service.restore_session(db_session.session_token, session_data)
-    
-    db.commit()
+    await asyncio.to_thread(conversation_service.restore_session, paused.session_token, session_data)
     
     # Generate smart, compassionate welcome back message with next question
     welcome_message = await _generate_resume_message(session_data)
     
     return {
         "message": "Session resumed successfully",
-        "session_token": db_session.session_token,
+        "session_token": paused.session_token,
         "welcome_message": welcome_message,
-        "conversation_history": db_session.conversation_history or [],
-        "completed_screeners": db_session.completed_screeners,
-        "current_phase": db_session.current_phase
+        "conversation_history": session_data["conversation_history"],
+        "completed_screeners": restored.completed_screeners,
+        "current_phase": restored.current_phase
     }
 
 
+# Progress columns resume_session needs back from its UPDATE
+_RESUME_RETURNING = (
+    IntakeSession.conversation_history,
+    IntakeSession.extracted_data,
+    IntakeSession.screener_scores,
+    IntakeSession.completed_screeners,
+    IntakeSession.current_screener,
+    IntakeSession.screener_progress,
+    IntakeSession.current_phase,
+) if DB_AVAILABLE else ()
+
+
+def _find_paused_session(db: Session, resume_token: str):
+    """
+    Blocking lookup of a paused session by resume token (run via asyncio.to_thread)
+    Returns (id, session_token, expires_at) only; the JSON progress columns are not read
+    """
+    return db.execute(
+        select(IntakeSession.id, IntakeSession.session_token, IntakeSession.expires_at)
+        .where(IntakeSession.resume_token == resume_token, IntakeSession.status == "paused")
+    ).first()
+
+
+def _set_paused_session_status(db: Session, session_id: int, new_status: str, returning=(), **values):
+    """
+    Move a paused session to new_status (plus any extra column values) in one UPDATE and commit
+    Returns the requested columns, or None if the session is no longer paused
+    """
+    stmt = (
+        update(IntakeSession)
+        .where(IntakeSession.id == session_id, IntakeSession.status == "paused")
+        .values(status=new_status, **values)
+    )
+    if returning:
+        result = db.execute(stmt.returning(*returning))
+        row = result.first()
+        changed = row is not None
+    else:
+        row = None
+        changed = db.execute(stmt).rowcount > 0
+    
+    if changed:
+        # Core UPDATEs skip the ORM listeners that maintain the status rollup
+        adjust_session_stats(db.connection(), {"paused": -1, new_status: 1})
+    db.commit()
+    return row
+
+
 def _can_pause_session(session_data: dict) -> bool:
     """
     Determine if session can be paused based on current state
@@ -669,24 +809,21 @@ def _can_pause_session(session_data: dict) -> bool:
     Cannot pause: during active assessments
     """
     current_phase = session_data.get("current_phase", "")
-    conversation_history = session_data.get("conversation_history", [])
+    if current_phase != "screening":
+        # Can pause between conversations or after completed assessments
+        return True
+    
+    # Flags maintained by conversation_service.add_message / restore_session
+    if "awaiting_screener_answer" not in session_data:
+        conversation_service.derive_pause_flags(session_data)
     
     # Can't pause during safety assessment (C-SSRS)
-    if current_phase == "screening" and "C-SSRS" in str(conversation_history):
+    if session_data.get("safety_assessment_started"):
         return False
     
-    # Can pause if not in the middle of a screener
-    if current_phase == "screening":
-        # Check if we're in the middle of a screener question
-        if conversation_history:
-            last_message = conversation_history[-1]
-            if last_message.get("role") == "model":
-                content = last_message.get("content", "")
-                # If the last message was asking a screener question, we're in the middle
-                if any(indicator in content for indicator in [
-                    "PHQ-9 Question", "GAD-7 Question", "C-SSRS Question"
-                ]):
-                    return False
+    # Can't pause in the middle of a screener question
+    if session_data["awaiting_screener_answer"]:
+        return False
     
     # Can pause between conversations or after completed assessments
     return True
@@ -698,7 +835,7 @@ async def _generate_resume_message(session_data: dict) -> str:
     Uses LLM to create context-aware continuation
     """
     from app.services.llm_service import llm_service
-    from app.prompts.system_prompts import INTAKE_SYSTEM_PROMPT
+    from app.prompts.system_prompts import INTAKE_SYSTEM_PROMPT, INTAKE_PROMPT_CACHE_KEY
     
     conversation_history = session_data.get("conversation_history", [])
     completed_screeners = session_data.get("completed_screeners", [])
@@ -740,14 +877,17 @@ Let's continue with understanding your anxiety patterns. Over the last 2 weeks,
 NOW GENERATE: Your compassionate welcome + immediate next question in ONE cohesive message.
 """
     
-    # Use LLM to generate smart resume message
+    # Use LLM to generate smart resume message. The unchanged system prompt goes
+    # first so the provider can reuse its cached prefix across resumes.
     messages = [
         {"role": "system", "content": INTAKE_SYSTEM_PROMPT},
         {"role": "user", "content": resume_prompt}
     ]
     
     try:
-        response = await llm_service.get_chat_completion(messages, temperature=0.8)
+        response = await llm_service.get_chat_completion(
+            messages, temperature=0.8, prompt_cache_key=INTAKE_PROMPT_CACHE_KEY
+        )
         return response
     except Exception as e:
         # Fallback to simple message if LLM fails
@@ -770,58 +910,100 @@ def _format_recent_messages(conversation_history: list, last_n: int = 4) -> str:
     return "\n".join(formatted)
 
 
-@router.post("/cleanup")
+def _read_stats_cache(ttl: float):
+    """Return cached stats if still fresh, otherwise None"""
+    if _stats_cache["value"] is not None and time.monotonic() - _stats_cache["ts"] < ttl:
+        return _stats_cache["value"]
+    return None
+
+
+def _store_stats_cache(stats: dict) -> None:
+    """Store freshly computed stats (empty results signal a failure and are not cached)"""
+    if stats:
+        _stats_cache["value"] = stats
+        _stats_cache["ts"] = time.monotonic()
+
+
+async def _get_cached_stats(db: Session, ttl: float = STATS_CACHE_TTL_SECONDS) -> dict:
+    """
+    Get session statistics, recomputing at most once per TTL window
+    Concurrent requests during a miss wait for the first one instead of stampeding the DB
+    """
+    cached = _read_stats_cache(ttl)
+    if cached is not None:
+        return cached
+    
+    async with _stats_cache_lock:
+        # Another request may have refreshed the cache while we were waiting
+        cached = _read_stats_cache(ttl)
+        if cached is not None:
+            return cached
+        
+        stats = await asyncio.to_thread(session_cleanup_service.get_session_stats, db)
+        _store_stats_cache(stats)
+        return stats
+
+
+@router.post("/cleanup", status_code=status.HTTP_202_ACCEPTED, response_class=ORJSONResponse)
 async def cleanup_sessions(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Cleanup expired and abandoned sessions
-    This endpoint can be called by a scheduled task or manually
+    Cleanup already runs on a schedule (see SessionCleanupService.run_periodic_cleanup);
+    this endpoint queues an extra pass to run after the response is sent
     """
+    if CleanupSessionLocal is None:
+        # Nothing can be queued without the cleanup session factory
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Session cleanup not available"
+        )
+    
     try:
-        # Clean up expired paused sessions
-        expired_cleaned = session_cleanup_service.cleanup_expired_sessions(db)
-        
-        # Clean up old abandoned sessions from memory
-        abandoned_cleaned = session_cleanup_service.cleanup_abandoned_sessions(db)
+        # Runs in the threadpool on its own DB session once the response is out
+        background_tasks.add_task(session_cleanup_service.run_cleanup_cycle)
         
-        # Get current stats
-        stats = session_cleanup_service.get_session_stats(db)
+        # Current numbers come from the /stats cache; they won't include this pass yet
+        stats = await _get_cached_stats(db)
         
         return {
-            "message": "Session cleanup completed",
-            "expired_sessions_cleaned": expired_cleaned,
-            "abandoned_sessions_cleaned": abandoned_cleaned,
+            "message": "Session cleanup scheduled",
+            "status": "scheduled",
             "current_stats": stats
         }
         
-    except Exception as e:
+    except SQLAlchemyError:
+        logger.exception("Session cleanup request failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Cleanup failed: {str(e)}"
+            detail="Cleanup failed"
         )
 
 
-@router.get("/stats")
+@router.get("/stats", response_class=ORJSONResponse)
 async def get_session_stats(
     db: Session = Depends(get_db)
 ):
     """
     Get session statistics
+    Served from a short-lived in-process cache (see STATS_CACHE_TTL_SECONDS)
     """
     try:
-        stats = session_cleanup_service.get_session_stats(db)
+        stats = await _get_cached_stats(db)
         return stats
-    except Exception as e:
+    except SQLAlchemyError:
+        logger.exception("Failed to get session stats")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get stats: {str(e)}"
+            detail="Failed to get stats"
         )
 
 
-@router.post("/transfer-session")
+@router.post("/transfer-session", response_class=ORJSONResponse)
 async def transfer_session(
-    request: dict,
+    payload: TransferSessionRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_optional)
 ):
@@ -829,48 +1011,58 @@ async def transfer_session(
     Transfer an anonymous session to a newly created authenticated account
     Used when a patient creates an account mid-assessment
     """
-    session_token = request.get("session_token")
-    new_user_id = request.get("new_user_id")
-    user_name = request.get("user_name")
+    session_token = payload.session_token
+    new_user_id = payload.new_user_id
+    user_name = payload.user_name
     
-    if not session_token or not new_user_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="session_token and new_user_id required"
-        )
-    
-    # Find the session
-    db_session = db.query(IntakeSession).filter(
-        IntakeSession.session_token == session_token
+    # Transfer session to new user and read back the previous owner in one round-trip.
+    # The CTE is evaluated before the UPDATE, so RETURNING sees the old patient_id.
+    previous_owner = (
+        select(IntakeSession.id, IntakeSession.patient_id)
+        .where(IntakeSession.session_token == session_token)
+        .cte("previous_owner")
+        .prefix_with("MATERIALIZED")
+    )
+    row = db.execute(
+        update(IntakeSession)
+        .where(IntakeSession.id.in_(select(previous_owner.c.id)))
+        .values(patient_id=new_user_id)
+        .returning(select(previous_owner.c.patient_id).scalar_subquery().label("old_patient_id")),
+        execution_options={"synchronize_session": False},
     ).first()
     
-    if not db_session:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found"
         )
     
-    # Transfer session to new user
-    old_patient_id = db_session.patient_id
-    db_session.patient_id = str(new_user_id)
+    old_patient_id = row.old_patient_id
     
     # Update in-memory session if exists
-    conv_session = conversation_service.get_session(session_token)
-    if conv_session:
-        conv_session["patient_id"] = str(new_user_id)
+    def _apply_transfer(conv_session):
+        conv_session["patient_id"] = new_user_id
         conv_session["user_name"] = user_name
         # Update extracted data with new name if not already set
-        if not conv_session.get("extracted_data", {}).get("name"):
-            if "extracted_data" not in conv_session:
-                conv_session["extracted_data"] = {}
-            conv_session["extracted_data"]["name"] = user_name
+        extracted = conv_session.setdefault("extracted_data", {})
+        if not extracted.get("name"):
+            extracted["name"] = user_name
+    
+    # Idempotent retry (same owner, same name): leave the conversation session alone
+    already_transferred = old_patient_id == new_user_id
+    if already_transferred and user_name:
+        conv_session = await asyncio.to_thread(conversation_service.get_session, session_token)
+        already_transferred = not conv_session or conv_session.get("user_name") == user_name
+    
+    if not already_transferred:
+        await asyncio.to_thread(conversation_service.mutate_session, session_token, _apply_transfer)
     
     db.commit()
     
     return {
         "message": "Session transferred successfully",
         "old_patient_id": old_patient_id,
-        "new_patient_id": str(new_user_id),
+        "new_patient_id": new_user_id,
         "session_token": session_token
     }
 
@@ -888,7 +1080,7 @@ async def get_reports_for_session(
     """
     try:
         # Try in-memory session first
-        sess = conversation_service.get_session(session_token)
+        sess = await asyncio.to_thread(conversation_service.get_session, session_token)
         if not sess and DB_AVAILABLE:
             # Minimal reconstruction from DB
             db_session = db.query(IntakeSession).filter(
@@ -913,8 +1105,10 @@ async def get_reports_for_session(
         clinician_report = dual_reports["clinician_report"]
 
         patient_name = f"{current_user.first_name} {current_user.last_name}".strip() if current_user else "Patient"
-        patient_pdf_base64 = pdf_service.generate_patient_report_base64(patient_report, patient_name)
-        clinician_pdf_base64 = pdf_service.generate_clinician_report_base64(clinician_report, patient_name)
+        patient_pdf_base64, clinician_pdf_base64 = await asyncio.gather(
+            asyncio.to_thread(pdf_service.generate_patient_report_base64, patient_report, patient_name),
+            asyncio.to_thread(pdf_service.generate_clinician_report_base64, clinician_report, patient_name),
+        )
 
         # Optionally email
         emailed = False
@@ -931,7 +1125,7 @@ async def get_reports_for_session(
                 )
                 emailed = True
             except Exception as e:
-                logger.error(f"Failed to schedule email for reports: {e}")
+                logger.error("Failed to schedule email for reports: %s", e)
 
         return {
             "patient_pdf": patient_pdf_base64,
@@ -942,6 +1136,6 @@ async def get_reports_for_session(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating reports for {session_token}: {e}")
+        logger.error("Error generating reports for %s: %s", session_token, e)
         raise HTTPException(status_code=500, detail="Failed to generate reports for session")
 
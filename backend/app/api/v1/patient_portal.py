@@ -2,16 +2,19 @@
 Patient Portal API endpoints
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_patient, get_db
+from app.core.etag import make_etag, is_not_modified, not_modified
 from app.models.user import User
 from app.schemas.patient_portal import (
     PatientDashboardResponse,
     AppointmentRequest,
+    RescheduleRequest,
     AppointmentResponse,
     AppointmentListResponse,
     AppointmentSlotResponse,
@@ -24,20 +27,17 @@ from app.core.rate_limit import limiter
 
 router = APIRouter()
 
+# Validates the whole slot list in one pass against a compiled schema
+_slot_list_adapter = TypeAdapter(List[AppointmentSlotResponse])
+
 
 @router.get("/dashboard", response_model=PatientDashboardResponse)
-async def get_patient_dashboard(
-    current_user: User = Depends(get_current_user),
+def get_patient_dashboard(
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get patient dashboard data"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         dashboard_data = patient_portal_service.get_patient_dashboard_data(
             patient_id=current_user.id,
@@ -54,21 +54,26 @@ async def get_patient_dashboard(
 
 
 @router.get("/appointments/upcoming", response_model=AppointmentListResponse)
-async def get_upcoming_appointments(
+def get_upcoming_appointments(
+    request: Request,
+    response: Response,
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
-    """Get upcoming appointments for patient"""
+    """Get upcoming appointments for patient (304 when If-None-Match still matches)"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
+    # The date part retires the tag once a day as appointments move into the past
+    etag = make_etag(
+        "upcoming", current_user.id, patient_portal_service.appointments_version(current_user.id, db),
+        datetime.utcnow().date(), limit
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     
     try:
-        appointments = patient_portal_service.get_upcoming_appointments(
+        appointments, total_count = patient_portal_service.get_upcoming_appointments_page(
             patient_id=current_user.id,
             db=db,
             limit=limit
@@ -76,7 +81,7 @@ async def get_upcoming_appointments(
         
         return AppointmentListResponse(
             appointments=appointments,
-            total_count=len(appointments)
+            total_count=total_count
         )
         
     except Exception as e:
@@ -87,21 +92,15 @@ async def get_upcoming_appointments(
 
 
 @router.get("/appointments/recent", response_model=AppointmentListResponse)
-async def get_recent_appointments(
+def get_recent_appointments(
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get recent appointments for patient"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
-        appointments = patient_portal_service.get_recent_appointments(
+        appointments, total_count = patient_portal_service.get_recent_appointments_page(
             patient_id=current_user.id,
             db=db,
             limit=limit
@@ -109,7 +108,7 @@ async def get_recent_appointments(
         
         return AppointmentListResponse(
             appointments=appointments,
-            total_count=len(appointments)
+            total_count=total_count
         )
         
     except Exception as e:
@@ -121,20 +120,14 @@ async def get_recent_appointments(
 
 @router.post("/appointments", response_model=AppointmentResponse)
 @limiter.limit("10/minute")
-async def create_appointment_request(
+def create_appointment_request(
     request: Request,
     appointment_request: AppointmentRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Create appointment request"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         result = patient_portal_service.create_appointment_request(
             patient_id=current_user.id,
@@ -159,21 +152,15 @@ async def create_appointment_request(
 
 @router.post("/appointments/{appointment_id}/cancel", response_model=AppointmentResponse)
 @limiter.limit("10/minute")
-async def cancel_appointment(
+def cancel_appointment(
     request: Request,
     appointment_id: int,
     cancellation_reason: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Cancel appointment"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         result = patient_portal_service.cancel_appointment(
             appointment_id=appointment_id,
@@ -198,26 +185,20 @@ async def cancel_appointment(
 
 @router.post("/appointments/{appointment_id}/reschedule", response_model=AppointmentResponse)
 @limiter.limit("10/minute")
-async def reschedule_appointment(
+def reschedule_appointment(
     request: Request,
     appointment_id: int,
-    new_datetime: str,
-    current_user: User = Depends(get_current_user),
+    reschedule_request: RescheduleRequest,
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Reschedule appointment"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         result = patient_portal_service.reschedule_appointment(
             appointment_id=appointment_id,
             patient_id=current_user.id,
-            new_datetime=new_datetime,
+            new_datetime=reschedule_request.new_datetime,
             db=db
         )
         
@@ -237,20 +218,14 @@ async def reschedule_appointment(
 
 @router.post("/appointments/{appointment_id}/confirm", response_model=AppointmentResponse)
 @limiter.limit("10/minute")
-async def confirm_appointment(
+def confirm_appointment(
     request: Request,
     appointment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Confirm appointment"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         result = patient_portal_service.confirm_appointment(
             appointment_id=appointment_id,
@@ -273,21 +248,15 @@ async def confirm_appointment(
 
 
 @router.get("/appointments/available-slots", response_model=List[AppointmentSlotResponse])
-async def get_available_slots(
+def get_available_slots(
     provider_id: int,
-    start_date: str,
-    end_date: str,
-    current_user: User = Depends(get_current_user),
+    start_date: date,
+    end_date: date,
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get available appointment slots for provider"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         slots = patient_portal_service.get_available_slots(
             provider_id=provider_id,
@@ -295,7 +264,7 @@ async def get_available_slots(
             db=db
         )
         
-        return [AppointmentSlotResponse(**slot) for slot in slots]
+        return _slot_list_adapter.validate_python(slots)
         
     except Exception as e:
         raise HTTPException(
@@ -305,18 +274,12 @@ async def get_available_slots(
 
 
 @router.get("/health-records", response_model=HealthRecordsResponse)
-async def get_health_records(
-    current_user: User = Depends(get_current_user),
+def get_health_records(
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get patient health records"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         health_records = patient_portal_service.get_patient_health_records(
             patient_id=current_user.id,
@@ -333,18 +296,12 @@ async def get_health_records(
 
 
 @router.get("/tasks", response_model=TaskListResponse)
-async def get_pending_tasks(
-    current_user: User = Depends(get_current_user),
+def get_pending_tasks(
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get pending tasks for patient"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
-    
     try:
         tasks = patient_portal_service.get_pending_tasks(
             patient_id=current_user.id,
@@ -364,21 +321,25 @@ async def get_pending_tasks(
 
 
 @router.get("/notifications", response_model=NotificationListResponse)
-async def get_notifications(
+def get_notifications(
+    request: Request,
+    response: Response,
     limit: int = 20,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
-    """Get patient notifications"""
+    """Get patient notifications (304 when If-None-Match still matches)"""
     
-    if current_user.role != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied. Patient role required."
-        )
+    etag = make_etag(
+        "notifications", current_user.id,
+        patient_portal_service.notification_service.notifications_version(current_user.id, db), limit
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     
     try:
-        notifications = patient_portal_service.get_patient_notifications(
+        notifications, total_count = patient_portal_service.get_patient_notifications_page(
             patient_id=current_user.id,
             db=db,
             limit=limit
@@ -386,7 +347,7 @@ async def get_notifications(
         
         return NotificationListResponse(
             notifications=notifications,
-            total_count=len(notifications)
+            total_count=total_count
         )
         
     except Exception as e:
@@ -2,15 +2,21 @@
 Provider Endpoints
 Provider-specific functionality including dashboard, notifications, and assignments
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, func, case, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import List, Optional
 from datetime import datetime, timedelta
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from app.db.session import get_db
+from app.db.functions import utcnow, utc_current_date
+from app.core.cache import cache
+from app.core.etag import make_etag, is_not_modified, not_modified
 from app.schemas.report import ReportResponse, ReportListItem
+from app.schemas.notification import NotificationResponse
 from app.models.intake_report import IntakeReport
 from app.models.provider_review import ProviderReview
 from app.models.notification import Notification
@@ -21,6 +27,34 @@ from app.services.notification_service import notification_service
 
 router = APIRouter()
 
+# Provider dashboards poll these stats; a short TTL keeps repeat polls off the database
+DASHBOARD_STATS_CACHE_TTL_SECONDS = 45
+
+
+def _dashboard_stats_key(provider_id: int) -> str:
+    return f"dash:stats:{provider_id}"
+
+
+def _dialect_insert(db: Session):
+    """INSERT construct with ON CONFLICT support for the session's database"""
+    if db.get_bind().dialect.name == "postgresql":
+        return pg_insert
+    return sqlite_insert
+
+
+def invalidate_dashboard_stats(provider_id: int) -> None:
+    """Drop a provider's cached dashboard stats after a change they should see immediately"""
+    cache.delete(_dashboard_stats_key(provider_id))
+
+
+def _dashboard_stats_response(request: Request, response: Response, payload: str):
+    """Serve serialized dashboard stats, or a 304 if the client already has exactly these"""
+    etag = make_etag("dash", payload)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return DashboardStats.model_validate_json(payload)
+
 
 # Pydantic models for new endpoints
 class DashboardStats(BaseModel):
@@ -45,64 +79,79 @@ class ClinicalNotesRequest(BaseModel):
     risk_assessment: Optional[str] = None
 
 
-class NotificationResponse(BaseModel):
-    id: int
-    type: str
-    title: str
-    message: str
-    priority: str
-    data: dict
-    is_read: bool
-    created_at: datetime
+class ProviderReviewResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    report_id: str
+    provider_id: str
+    status: str
+    clinical_notes: Optional[str] = None
+    recommendations: Optional[str] = None
+    risk_assessment: Optional[str] = None
+    follow_up_required: bool = False
+    follow_up_date: Optional[datetime] = None
+    reviewed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
+# List responses are validated in one pass against a compiled schema instead of per-item model construction
+_report_list_adapter = TypeAdapter(List[ReportListItem])
+_notification_list_adapter = TypeAdapter(List[NotificationResponse])
 
 
 @router.get("/dashboard-stats", response_model=DashboardStats)
-async def get_dashboard_stats(
+def get_dashboard_stats(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
     """
     Get provider dashboard statistics
+    Served from cache for up to DASHBOARD_STATS_CACHE_TTL_SECONDS; 304 when If-None-Match still matches
+    The ETag is a digest of the stats themselves, so a 304 is never staler than a full response
     """
-    # Get assigned reports count
-    total_assigned = db.query(IntakeReport).filter(
-        IntakeReport.assigned_provider_id == current_user.id
-    ).count()
-    
-    # Get pending review count
-    pending_review = db.query(IntakeReport).filter(
-        IntakeReport.assigned_provider_id == current_user.id,
-        IntakeReport.review_status.in_(["pending", "in_review"])
-    ).count()
+    cache_key = _dashboard_stats_key(current_user.id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _dashboard_stats_response(request, response, cached.decode("utf-8"))
     
-    # Get high-risk pending count
-    high_risk_pending = db.query(IntakeReport).filter(
-        IntakeReport.assigned_provider_id == current_user.id,
-        IntakeReport.risk_level == "high",
-        IntakeReport.review_status.in_(["pending", "in_review"])
-    ).count()
+    # Assigned, pending review and high-risk pending counts in one pass over the provider's reports
+    is_pending = IntakeReport.review_status.in_(["pending", "in_review"])
+    report_counts = db.query(
+        func.count().label("total_assigned"),
+        func.coalesce(func.sum(case((is_pending, 1), else_=0)), 0).label("pending_review"),
+        func.coalesce(
+            func.sum(case((and_(is_pending, IntakeReport.risk_level == "high"), 1), else_=0)), 0
+        ).label("high_risk_pending"),
+    ).filter(
+        IntakeReport.assigned_provider_id == current_user.id
+    ).one()
     
-    # Get completed today count
-    today = datetime.utcnow().date()
+    # Get completed today count (UTC day, taken from the database clock)
     completed_today = db.query(ProviderReview).filter(
         ProviderReview.provider_id == current_user.id,
-        ProviderReview.reviewed_at >= today
+        ProviderReview.reviewed_at >= utc_current_date()
     ).count()
     
     # Get unread notifications count
     unread_notifications = notification_service.get_unread_count(current_user.id, db)
     
-    return DashboardStats(
-        total_assigned=total_assigned,
-        pending_review=pending_review,
-        high_risk_pending=high_risk_pending,
+    stats = DashboardStats(
+        total_assigned=report_counts.total_assigned,
+        pending_review=report_counts.pending_review,
+        high_risk_pending=report_counts.high_risk_pending,
         completed_today=completed_today,
         unread_notifications=unread_notifications
     )
+    payload = stats.model_dump_json()
+    cache.setex(cache_key, DASHBOARD_STATS_CACHE_TTL_SECONDS, payload)
+    return _dashboard_stats_response(request, response, payload)
 
 
 @router.get("/assigned-reports", response_model=List[ReportListItem])
-async def get_assigned_reports(
+def get_assigned_reports(
     status_filter: Optional[str] = Query(None, description="Filter by review status"),
     risk_level_filter: Optional[str] = Query(None, description="Filter by risk level"),
     limit: int = Query(50, description="Maximum number of reports to return"),
@@ -112,8 +161,8 @@ async def get_assigned_reports(
     """
     Get all intake reports assigned to this provider with optional filters
     """
-    # Use assignment service to get filtered reports
-    reports = assignment_service.get_provider_assigned_reports(
+    # Use assignment service to get the filtered list-view columns
+    reports = assignment_service.get_provider_assigned_report_summaries(
         current_user.id, 
         status_filter, 
         risk_level_filter, 
@@ -121,25 +170,12 @@ async def get_assigned_reports(
         db
     )
     
-    result = []
-    for report in reports:
-        item = ReportListItem(
-            id=report.id,
-            patient_id=report.patient_id,
-            severity_level=report.severity_level,
-            risk_level=report.risk_level,
-            urgency=report.urgency,
-            created_at=report.created_at,
-            chief_complaint=report.report_data.get("chief_complaint") if report.report_data else None
-        )
-        result.append(item)
-    
-    return result
+    return _report_list_adapter.validate_python(reports, from_attributes=True)
 
 
 @router.get("/reports/{report_id}", response_model=ReportResponse)
-async def get_report_detail(
-    report_id: int,
+def get_report_detail(
+    report_id: str,
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
@@ -160,9 +196,9 @@ async def get_report_detail(
     return report
 
 
-@router.post("/reports/{report_id}/review")
-async def create_review(
-    report_id: int,
+@router.post("/reports/{report_id}/review", response_model=ProviderReviewResponse)
+def create_review(
+    report_id: str,
     request: ClinicalNotesRequest,
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
@@ -170,93 +206,88 @@ async def create_review(
     """
     Add clinical review to an intake report
     """
-    # Verify report is assigned to this provider
-    report = db.query(IntakeReport).filter(
-        IntakeReport.id == report_id,
-        IntakeReport.assigned_provider_id == current_user.id
-    ).first()
+    # Both timestamps come from the database clock in this transaction, so they match
+    now = utcnow()
     
-    if not report:
+    # Mark the report reviewed only if it is assigned to this provider; the guarded
+    # UPDATE doubles as the ownership check and row-locks the report for the review write
+    owned_report_id = db.execute(
+        update(IntakeReport)
+        .where(
+            IntakeReport.id == report_id,
+            IntakeReport.assigned_provider_id == current_user.id
+        )
+        .values(review_status="completed", reviewed_at=now)
+        .returning(IntakeReport.id)
+    ).scalar_one_or_none()
+    
+    if owned_report_id is None:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found or not assigned to you"
         )
     
-    # Check if review already exists
-    existing_review = db.query(ProviderReview).filter(
-        ProviderReview.report_id == report_id,
-        ProviderReview.provider_id == current_user.id
-    ).first()
-    
-    if existing_review:
-        # Update existing review
-        existing_review.clinical_notes = request.clinical_notes
-        existing_review.recommendations = request.treatment_plan
-        existing_review.follow_up_required = request.follow_up_required
-        existing_review.follow_up_date = request.follow_up_date
-        existing_review.risk_assessment = request.risk_assessment
-        existing_review.status = "completed"
-        existing_review.reviewed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(existing_review)
-        return existing_review
-    
-    # Create new review
-    review = ProviderReview(
+    # Insert the review, or overwrite this provider's earlier review of the same report,
+    # in one statement; the unique (report_id, provider_id) index arbitrates concurrent submits
+    review_values = {
+        "clinical_notes": request.clinical_notes,
+        "recommendations": request.treatment_plan,
+        "risk_assessment": request.risk_assessment,
+        "follow_up_required": request.follow_up_required,
+        "follow_up_date": request.follow_up_date,
+        "status": "completed",
+        "reviewed_at": now,
+    }
+    insert_stmt = _dialect_insert(db)(ProviderReview).values(
         report_id=report_id,
         provider_id=current_user.id,
-        clinical_notes=request.clinical_notes,
-        recommendations=request.treatment_plan,
-        follow_up_required=request.follow_up_required,
-        follow_up_date=request.follow_up_date,
-        risk_assessment=request.risk_assessment,
-        status="completed",
-        reviewed_at=datetime.utcnow()
+        **review_values
     )
-    
-    db.add(review)
-    
-    # Update report status
-    report.review_status = "completed"
-    report.reviewed_at = datetime.utcnow()
+    review = db.scalars(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[ProviderReview.report_id, ProviderReview.provider_id],
+            set_=review_values
+        ).returning(ProviderReview),
+        execution_options={"populate_existing": True}
+    ).one()
     
     db.commit()
-    db.refresh(review)
+    invalidate_dashboard_stats(current_user.id)
     
     return review
 
 
 @router.get("/notifications", response_model=List[NotificationResponse])
-async def get_notifications(
+def get_notifications(
+    request: Request,
+    response: Response,
     unread_only: bool = Query(False, description="Return only unread notifications"),
     limit: int = Query(50, description="Maximum number of notifications"),
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
     """
-    Get notifications for the current provider
+    Get notifications for the current provider (304 when If-None-Match still matches)
     """
+    etag = make_etag(
+        "notifications", current_user.id, notification_service.notifications_version(current_user.id, db),
+        unread_only, limit
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
     notifications = notification_service.get_user_notifications(
         current_user.id, limit, unread_only, db
     )
     
-    return [
-        NotificationResponse(
-            id=n.id,
-            type=n.type,
-            title=n.title,
-            message=n.message,
-            priority=n.priority,
-            data=n.data,
-            is_read=n.is_read,
-            created_at=n.created_at
-        ) for n in notifications
-    ]
+    return _notification_list_adapter.validate_python(notifications, from_attributes=True)
 
 
 @router.post("/notifications/{notification_id}/read")
-async def mark_notification_read(
-    notification_id: int,
+def mark_notification_read(
+    notification_id: str,
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
@@ -271,11 +302,12 @@ async def mark_notification_read(
             detail="Notification not found or not accessible"
         )
     
+    invalidate_dashboard_stats(current_user.id)
     return {"message": "Notification marked as read"}
 
 
 @router.post("/notifications/read-all")
-async def mark_all_notifications_read(
+def mark_all_notifications_read(
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
@@ -283,6 +315,7 @@ async def mark_all_notifications_read(
     Mark all notifications as read for current provider
     """
     updated_count = notification_service.mark_all_notifications_read(current_user.id, db)
+    invalidate_dashboard_stats(current_user.id)
     
     return {
         "message": f"Marked {updated_count} notifications as read",
@@ -291,7 +324,7 @@ async def mark_all_notifications_read(
 
 
 @router.get("/workload")
-async def get_provider_workload(
+def get_provider_workload(
     current_user: User = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
@@ -2,23 +2,33 @@
 Reports Endpoints
 Intake report management
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import desc, tuple_
+from typing import List, Tuple
+from datetime import datetime
+from pydantic import TypeAdapter
 
 from app.db.session import get_db
 from app.schemas.report import ReportResponse, ReportListItem
-from app.models.intake_report import IntakeReport
+from app.models.intake_report import IntakeReport, report_summary_columns
 from app.core.deps import get_current_user, get_current_user_optional
-from app.models.user import User
+from app.core.etag import make_etag, is_not_modified, not_modified
+from app.services.pdf_service import pdf_service
+from app.models.user import User, UserRole
 from typing import Optional
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Validates a whole list of projected rows in one pass against a compiled schema
+_report_list_adapter = TypeAdapter(List[ReportListItem])
 
 
 @router.get("/me", response_model=List[ReportListItem])
-async def get_my_reports(
+def get_my_reports(
     limit: int = 3,
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
@@ -35,30 +45,35 @@ async def get_my_reports(
     # Limit to reasonable maximum
     limit = min(limit, 50)
     
-    # Get patient's reports
-    reports = db.query(IntakeReport).filter(
+    # Get patient's reports (list-view columns only)
+    reports = db.query(*report_summary_columns()).filter(
         IntakeReport.patient_id == str(current_user.id)
     ).order_by(desc(IntakeReport.created_at)).limit(limit).all()
     
-    # Create list items with details
-    result = []
-    for report in reports:
-        item = ReportListItem(
-            id=report.id,
-            patient_id=report.patient_id,
-            severity_level=report.severity_level,
-            risk_level=report.risk_level,
-            urgency=report.urgency,
-            created_at=report.created_at,
-            chief_complaint=report.report_data.get("chief_complaint") if report.report_data else None
+    return _report_list_adapter.validate_python(reports, from_attributes=True)
+
+
+def _report_cursor(report) -> str:
+    """Opaque list cursor naming the last report of a page"""
+    return f"{report.created_at.isoformat()},{report.id}"
+
+
+def _parse_report_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, report_id = cursor.split(",", 1)
+        return datetime.fromisoformat(created_at), report_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
         )
-        result.append(item)
-    
-    return result
 
 
 @router.get("/", response_model=List[ReportListItem])
-async def list_reports(
+def list_reports(
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor: the X-Next-Cursor header of the previous page"),
+    limit: int = Query(100, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -67,56 +82,45 @@ async def list_reports(
     
     Patients see their own reports
     Providers see reports assigned to them
+    
+    Newest first, one page at a time: pass the X-Next-Cursor header of a
+    response as `after` to fetch the next page
     """
-    if current_user.role.value == "patient":
+    # List-view columns only; chief complaint is extracted by the database
+    query = db.query(*report_summary_columns())
+    if current_user.role is UserRole.PATIENT:
         # Patient sees their own reports
-        reports = db.query(IntakeReport).filter(
-            IntakeReport.patient_id == str(current_user.id)
-        ).order_by(desc(IntakeReport.created_at)).all()
-    elif current_user.role.value == "provider":
+        query = query.filter(IntakeReport.patient_id == str(current_user.id))
+    elif current_user.role is UserRole.PROVIDER:
         # Provider sees reports assigned to them
-        reports = db.query(IntakeReport).filter(
-            IntakeReport.shared_with_provider_id == current_user.id
-        ).order_by(desc(IntakeReport.created_at)).all()
-    else:
-        # Admin sees all reports
-        reports = db.query(IntakeReport).order_by(desc(IntakeReport.created_at)).limit(100).all()
-    
-    # Create list items with chief complaint
-    result = []
-    for report in reports:
-        item = ReportListItem(
-            id=report.id,
-            patient_id=report.patient_id,
-            severity_level=report.severity_level,
-            risk_level=report.risk_level,
-            urgency=report.urgency,
-            created_at=report.created_at,
-            chief_complaint=report.report_data.get("chief_complaint") if report.report_data else None
+        query = query.filter(IntakeReport.shared_with_provider_id == current_user.id)
+    # Admin sees all reports
+    
+    # Keyset pagination on (created_at, id) rides the (owner, created_at, id) indexes at any depth;
+    # the id tiebreak keeps reports that share a timestamp from being skipped between pages
+    if after is not None:
+        query = query.filter(
+            tuple_(IntakeReport.created_at, IntakeReport.id) < tuple_(*_parse_report_cursor(after))
         )
-        result.append(item)
+    reports = query.order_by(desc(IntakeReport.created_at), desc(IntakeReport.id)).limit(limit).all()
     
-    return result
+    if len(reports) == limit:
+        response.headers["X-Next-Cursor"] = _report_cursor(reports[-1])
+    
+    return _report_list_adapter.validate_python(reports, from_attributes=True)
 
 
-@router.get("/{report_id}", response_model=ReportResponse)
-async def get_report(
-    report_id: str,
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
-):
+def _authorize_report_access(report_id: str, current_user: Optional[User], db: Session) -> None:
     """
-    Get detailed intake report
-    
-    Authorization:
-    - Anonymous users can access reports they just created (via localStorage)
-    - Patients can access their own reports
-    - Providers can access reports assigned to them
-    - Admins can access any report
+    Raise 404/403 unless the caller may read this report
+    Reads only the two ownership columns, so denied requests never load report data
     """
-    report = db.query(IntakeReport).filter(IntakeReport.id == report_id).first()
+    owners = db.query(
+        IntakeReport.patient_id,
+        IntakeReport.shared_with_provider_id
+    ).filter(IntakeReport.id == report_id).first()
     
-    if not report:
+    if not owners:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found"
@@ -124,14 +128,14 @@ async def get_report(
     
     # Check authorization
     if current_user:
-        if current_user.role.value == "patient":
-            if report.patient_id != str(current_user.id):
+        if current_user.role is UserRole.PATIENT:
+            if owners.patient_id != str(current_user.id):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Not authorized to view this report"
                 )
-        elif current_user.role.value == "provider":
-            if report.shared_with_provider_id != current_user.id:
+        elif current_user.role is UserRole.PROVIDER:
+            if owners.shared_with_provider_id != current_user.id:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Report not assigned to you"
@@ -142,12 +146,50 @@ async def get_report(
         # They would only have the report_id if they just completed the assessment
         # This is safe since report_id is a UUID and not guessable
         pass
+
+
+@router.get("/{report_id}", response_model=ReportResponse)
+def get_report(
+    report_id: str,
+    request: Request,
+    response: Response,
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+):
+    """
+    Get detailed intake report
+    
+    Authorization:
+    - Anonymous users can access reports they just created (via localStorage)
+    - Patients can access their own reports
+    - Providers can access reports assigned to them
+    - Admins can access any report
+    """
+    _authorize_report_access(report_id, current_user, db)
+    
+    # ReportResponse only reads columns; fail loudly if a relationship ever gets touched
+    report = ReportResponse.model_validate(db.get(IntakeReport, report_id, options=[raiseload("*")]))
+    
+    # The ETag is a digest of the response body itself, so it changes with any write
+    # to the report (from any worker, ORM or Core) and survives restarts.
+    # Reports rarely change after generation, so re-fetches are usually a 304
+    etag = make_etag("report", report.model_dump_json())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=60"
     
     return report
 
 
+async def _pdf_chunks(pdf: bytes):
+    """Send a rendered PDF in fixed-size chunks instead of one response body"""
+    for offset in range(0, len(pdf), PDF_STREAM_CHUNK_SIZE):
+        yield pdf[offset:offset + PDF_STREAM_CHUNK_SIZE]
+
+
 @router.get("/{report_id}/pdf")
-async def download_report_pdf(
+def download_report_pdf(
     report_id: str,
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
@@ -155,31 +197,24 @@ async def download_report_pdf(
     """
     Download report as PDF
     
-    TODO: Implement PDF generation with ReportLab
+    Providers and admins get the clinician report when one exists;
+    everyone else gets the patient-facing report
     """
-    report = db.query(IntakeReport).filter(IntakeReport.id == report_id).first()
-    
-    if not report:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Report not found"
-        )
+    _authorize_report_access(report_id, current_user, db)
+    report = db.get(IntakeReport, report_id, options=[raiseload("*")])
     
-    # Authorization check (same as get_report)
-    if current_user:
-        if current_user.role.value == "patient":
-            if report.patient_id != str(current_user.id):
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-        elif current_user.role.value == "provider":
-            if report.shared_with_provider_id != current_user.id:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-    # Anonymous users allowed (same logic as get_report)
-    
-    # TODO: Generate PDF
-    # For now, return JSON
-    return {
-        "message": "PDF generation coming soon",
-        "report_id": report_id,
-        "download_json": f"/api/v1/reports/{report_id}"
-    }
-
+    if (current_user is not None
+            and current_user.role is not UserRole.PATIENT
+            and report.clinician_report_data):
+        pdf = pdf_service.generate_clinician_report_pdf(report.clinician_report_data)
+    else:
+        pdf = pdf_service.generate_patient_report_pdf(report.report_data)
+    
+    return StreamingResponse(
+        _pdf_chunks(pdf),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="{report_id}.pdf"',
+            "Content-Length": str(len(pdf)),
+        }
+    )
@@ -3,20 +3,34 @@ Telemedicine API Endpoints
 WebRTC consultation and session management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel
-
-from app.db.session import get_db
-from app.models.user import User
+import asyncio
+import orjson
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+from app.db.session import get_db, SessionLocal
+from app.models.user import User, UserRole
 from app.models.telemedicine_session import TelemedicineSession
 from app.core.deps import get_current_user, get_current_provider
+from app.core.security import verify_jwt_token
 from app.services.webrtc_service import webrtc_service
 from app.services.websocket_service import websocket_service
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Clients that offer this WebSocket subprotocol exchange signaling frames as MessagePack
+SIGNALING_MSGPACK_SUBPROTOCOL = "msgpack"
 
 
 # Pydantic models
@@ -114,7 +128,7 @@ async def join_session(
     """
     try:
         # Determine user role
-        user_role = "provider" if current_user.role == "provider" else "patient"
+        user_role = "provider" if current_user.role is UserRole.PROVIDER else "patient"
         
         session_data = await webrtc_service.join_session(
             session_id=request.session_id,
@@ -328,12 +342,10 @@ async def get_user_sessions(
         sessions = await webrtc_service.get_user_sessions(
             user_id=current_user.id,
             status=status,
-            db=db
+            db=db,
+            limit=limit
         )
         
-        # Limit results
-        sessions = sessions[:limit]
-        
         return {
             "success": True,
             "data": sessions,
@@ -347,25 +359,42 @@ async def get_user_sessions(
         )
 
 
+_PONG_JSON = orjson.dumps({"type": "pong"}).decode("utf-8")
+_PONG_MSGPACK = msgpack.packb({"type": "pong"}) if MSGPACK_AVAILABLE else None
+
+
+def _decode_signal(message: Dict[str, Any], use_msgpack: bool) -> Dict[str, Any]:
+    """Decode one signaling frame (MessagePack binary frames when negotiated, JSON otherwise)"""
+    raw = message.get("bytes")
+    if raw is not None:
+        return msgpack.unpackb(raw, raw=False) if use_msgpack else orjson.loads(raw)
+    return orjson.loads(message["text"])
+
+
+def _load_session_members(session_id: str):
+    """
+    Blocking membership lookup (run via asyncio.to_thread)
+    Uses its own short-lived DB session, closed before the socket is accepted, so a
+    long-lived signaling connection never holds a connection or an open transaction
+    """
+    db = SessionLocal()
+    try:
+        return webrtc_service.get_session_members(session_id, db)
+    finally:
+        db.close()
+
+
 @router.websocket("/sessions/{session_id}/signaling")
 async def websocket_signaling(
     websocket: WebSocket,
     session_id: str,
-    token: str,
-    db: Session = Depends(get_db)
+    token: str
 ):
     """
     WebSocket endpoint for WebRTC signaling
     """
     try:
-        # Verify session exists
-        session_info = await webrtc_service.get_session_info(session_id)
-        if not session_info:
-            await websocket.close(code=4004, reason="Session not found")
-            return
-        
-        # Verify token and get user
-        from app.core.security import verify_jwt_token
+        # Verify token first: it needs no I/O and rejects bad clients before any lookup
         payload = verify_jwt_token(token)
         if not payload:
             await websocket.close(code=4001, reason="Invalid token")
@@ -374,18 +403,29 @@ async def websocket_signaling(
         user_id = payload.get("sub")
         user_role = payload.get("role")
         
-        # Verify user has access to session
-        if (user_id != session_info["provider_id"] and 
-            user_id != session_info["patient_id"]):
+        # Verify session exists and user has access to it (cached across reconnects)
+        members = await asyncio.to_thread(_load_session_members, session_id)
+        if members is None:
+            await websocket.close(code=4004, reason="Session not found")
+            return
+        
+        if str(user_id) not in members:
             await websocket.close(code=4003, reason="Access denied")
             return
         
-        await websocket.accept()
+        use_msgpack = (
+            MSGPACK_AVAILABLE
+            and SIGNALING_MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+        )
+        await websocket.accept(subprotocol=SIGNALING_MSGPACK_SUBPROTOCOL if use_msgpack else None)
         
         # Handle WebSocket messages for signaling
         try:
             while True:
-                data = await websocket.receive_json()
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                data = _decode_signal(message, use_msgpack)
                 message_type = data.get("type")
                 
                 if message_type == "ice_candidate":
@@ -401,7 +441,10 @@ async def websocket_signaling(
                         session_id, user_id, data.get("sdp", "")
                     )
                 elif message_type == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    if use_msgpack:
+                        await websocket.send_bytes(_PONG_MSGPACK)
+                    else:
+                        await websocket.send_text(_PONG_JSON)
                 
         except WebSocketDisconnect:
             print(f"WebSocket disconnected for session {session_id}, user {user_id}")
@@ -414,6 +457,21 @@ async def websocket_signaling(
         await websocket.close(code=4000, reason="Connection error")
 
 
+# STUN/TURN servers are fixed at startup, so the config body is serialized once
+_WEBRTC_CONFIG_BODY = orjson.dumps({
+    "success": True,
+    "data": {
+        "stun_servers": webrtc_service.stun_servers,
+        "turn_servers": webrtc_service.turn_servers,
+        "ice_servers": {
+            "stun": webrtc_service.stun_servers,
+            "turn": webrtc_service.turn_servers
+        }
+    }
+})
+_WEBRTC_CONFIG_HEADERS = {"Cache-Control": "private, max-age=3600"}
+
+
 @router.get("/config/webrtc")
 async def get_webrtc_config(
     current_user: User = Depends(get_current_user)
@@ -421,14 +479,8 @@ async def get_webrtc_config(
     """
     Get WebRTC configuration (STUN/TURN servers)
     """
-    return {
-        "success": True,
-        "data": {
-            "stun_servers": webrtc_service.stun_servers,
-            "turn_servers": webrtc_service.turn_servers,
-            "ice_servers": {
-                "stun": webrtc_service.stun_servers,
-                "turn": webrtc_service.turn_servers
-            }
-        }
-    }
+    return Response(
+        content=_WEBRTC_CONFIG_BODY,
+        media_type="application/json",
+        headers=_WEBRTC_CONFIG_HEADERS
+    )
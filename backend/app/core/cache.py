@@ -0,0 +1,147 @@
+"""
+Response cache for read-heavy endpoints
+Shared through Redis when REDIS_URL is set, otherwise a per-process TTL dict
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+
+CacheValue = Union[str, bytes]
+
+
+def _to_bytes(value: CacheValue) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+class InMemoryCache:
+    """
+    Process-local cache with per-key expiry (single worker only)
+
+    Bounded to max_entries: the least recently used entry is evicted first, and
+    expired entries are swept out periodically even if their keys are never read
+    again (generation-keyed entries, for example, never are).
+    """
+
+    SWEEP_INTERVAL_SECONDS = 60
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL_SECONDS
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: str, expires_at: float, value: bytes) -> None:
+        # Caller holds the lock
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.SWEEP_INTERVAL_SECONDS
+            for expired in [k for k, (expiry, _) in self._entries.items() if expiry <= now]:
+                del self._entries[expired]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def setex(self, key: str, ttl_seconds: int, value: CacheValue) -> None:
+        with self._lock:
+            self._store(key, time.monotonic() + ttl_seconds, _to_bytes(value))
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        """
+        Increment a counter with no expiry (starts from 0)
+        Counters are still subject to LRU eviction; every entry keyed by one has its own TTL,
+        so losing a counter can only serve data that was within its TTL anyway
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            value = int(entry[1]) + 1 if entry is not None else 1
+            self._store(key, float("inf"), str(value).encode("utf-8"))
+            return value
+
+
+class RedisCache:
+    """
+    Redis-backed cache shared by all workers
+
+    Redis errors are logged and treated as cache misses so a Redis outage only
+    costs the database round-trips the cache would have saved.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(key)
+        except redis.RedisError as e:
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return None
+
+    def setex(self, key: str, ttl_seconds: int, value: CacheValue) -> None:
+        try:
+            self.client.setex(key, ttl_seconds, value)
+        except redis.RedisError as e:
+            logger.warning("Cache write failed for %s: %s", key, e)
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e)
+
+    def incr(self, key: str) -> Optional[int]:
+        try:
+            return self.client.incr(key)
+        except redis.RedisError as e:
+            logger.warning("Cache increment failed for %s: %s", key, e)
+            return None
+
+
+def create_cache():
+    """Build the cache configured for this process"""
+    if not settings.REDIS_URL:
+        return InMemoryCache(settings.CACHE_MAX_ENTRIES)
+    if not REDIS_AVAILABLE:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-memory cache")
+        return InMemoryCache(settings.CACHE_MAX_ENTRIES)
+    return RedisCache(redis.Redis.from_url(settings.REDIS_URL))
+
+
+# Global cache instance
+cache = create_cache()
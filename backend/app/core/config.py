@@ -2,9 +2,10 @@
 Application Configuration Settings
 Loads environment variables and provides typed settings
 """
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Union, Optional
+from typing import FrozenSet, Tuple, Union, Optional
 
 
 class Settings(BaseSettings):
@@ -20,9 +21,21 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_CACHE_MAX: int = 8192  # Verified tokens kept in memory per worker
+    JWT_CACHE_TTL: int = 30  # Seconds a verified token is trusted before re-checking its signature
     
     # Database
     DATABASE_URL: str = "sqlite:///./psychnow.db"
+    DB_POOL_SIZE: int = 5  # Small default for Render free tier
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Replace connections before managed Postgres idle timeouts drop them
+    
+    # Shared session store (optional - in-memory when unset)
+    REDIS_URL: Optional[str] = None
+    CACHE_MAX_ENTRIES: int = 10000  # In-memory cache size per worker when REDIS_URL is unset
+    SESSION_TTL_SECONDS: int = 3600
+    RATE_LIMIT_STORAGE_URI: Optional[str] = None  # Defaults to REDIS_URL, else in-memory
     
     # OpenAI
     OPENAI_API_KEY: str
@@ -30,14 +43,19 @@ class Settings(BaseSettings):
     OPENAI_MAX_TOKENS: int = 2000
     
     # CORS
-    ALLOWED_ORIGINS: Union[List[str], str] = "http://localhost:5173,http://localhost:3000,http://localhost:3001,http://localhost:3002,http://127.0.0.1:3000,http://127.0.0.1:3001,http://127.0.0.1:3002,http://127.0.0.1:5173,https://psychnow-demo.web.app,https://psychnow-demo.firebaseapp.com,https://psychnow-demo-96530.web.app,https://psychnow-demo-96530.firebaseapp.com"
+    ALLOWED_ORIGINS: Union[Tuple[str, ...], str] = "http://localhost:5173,http://localhost:3000,http://localhost:3001,http://localhost:3002,http://127.0.0.1:3000,http://127.0.0.1:3001,http://127.0.0.1:3002,http://127.0.0.1:5173,https://psychnow-demo.web.app,https://psychnow-demo.firebaseapp.com,https://psychnow-demo-96530.web.app,https://psychnow-demo-96530.firebaseapp.com"
     
     @field_validator('ALLOWED_ORIGINS', mode='before')
     @classmethod
     def parse_cors(cls, v):
         if isinstance(v, str):
-            return [origin.strip() for origin in v.split(',')]
-        return v
+            return tuple(origin.strip() for origin in v.split(','))
+        return tuple(v)
+    
+    @cached_property
+    def ALLOWED_ORIGINS_SET(self) -> FrozenSet[str]:
+        """Allowed origins for O(1) membership checks (CORS runs one per request)"""
+        return frozenset(self.ALLOWED_ORIGINS)
     
     # Provider Invite
     PROVIDER_INVITE_CODE: str = "PSYCHNOW-PROVIDER-2024"
@@ -4,16 +4,77 @@ Reusable dependencies for endpoints
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import datetime
+import json
 
 from app.db.session import get_db
+from app.core.cache import cache
 from app.core.security import decode_access_token
 from app.models.user import User, UserRole
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Every authenticated request resolves its user; cache the profile columns endpoints read.
+# role and is_active are never cached: they are re-read from the database on every request,
+# so a deactivation or role change takes effect immediately on every worker
+USER_CACHE_TTL_SECONDS = 60
+
+
+def _user_cache_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user's cached profile so the next request reloads it"""
+    cache.delete(_user_cache_key(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    # Best effort for profile fields only (this process's cache); access fields are never cached
+    invalidate_cached_user(target.id)
+
+
+def _load_user(user_id: str, db: Session) -> Optional[User]:
+    """
+    Load the user for an authenticated request in one query
+    On a cache hit only role and is_active are read from the database, and the result is a
+    detached, read-only User: column values only, no password hash and no relationships.
+    Endpoints must not modify it or add it to a session; query the user to make changes
+    """
+    cached = cache.get(_user_cache_key(user_id))
+    if cached is not None:
+        access = db.query(User.role, User.is_active).filter(User.id == user_id).first()
+        if access is None:
+            invalidate_cached_user(user_id)
+            return None
+        data = json.loads(cached)
+        return User(
+            id=data["id"],
+            email=data["email"],
+            role=access.role,
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            is_active=access.is_active,
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+        )
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        cache.setex(_user_cache_key(user_id), USER_CACHE_TTL_SECONDS, json.dumps({
+            "id": user.id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+        }))
+    return user
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -50,7 +111,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _load_user(user_id, db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,7 +156,7 @@ async def get_current_user_optional(
         if user_id is None:
             return None
         
-        user = db.query(User).filter(User.id == user_id).first()
+        user = _load_user(user_id, db)
         if user is None or not user.is_active:
             return None
         
@@ -111,38 +172,23 @@ async def get_current_active_user(
     return current_user
 
 
-async def get_current_patient(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current user if they are a patient"""
-    if current_user.role != UserRole.PATIENT:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized as patient"
-        )
-    return current_user
-
-
-async def get_current_provider(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current user if they are a provider"""
-    if current_user.role != UserRole.PROVIDER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized as provider"
-        )
-    return current_user
-
+def require_role(role: UserRole):
+    """Build a dependency that returns the current user only if they have the given role"""
+    detail = f"Not authorized as {role.value}"
+    
+    async def dependency(current_user: User = Depends(get_current_user)) -> User:
+        if current_user.role is not role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return current_user
+    
+    dependency.__name__ = f"get_current_{role.value}"
+    dependency.__doc__ = f"Get current user if they are a {role.value}"
+    return dependency
 
-async def get_current_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current user if they are an admin"""
-    if current_user.role != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized as admin"
-        )
-    return current_user
 
+get_current_patient = require_role(UserRole.PATIENT)
+get_current_provider = require_role(UserRole.PROVIDER)
+get_current_admin = require_role(UserRole.ADMIN)
@@ -2,8 +2,13 @@
 Centralized error handling and logging for FastAPI
 """
 
+import itertools
 import logging
-import uuid
+import logging.handlers
+import os
+import queue
+import time
+from typing import Optional
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -12,18 +17,51 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 logger = logging.getLogger("psychnow")
 
+# Records waiting for the writer thread; when full, the oldest are dropped
+LOG_QUEUE_MAX_RECORDS = 10000
+
+# Trace ids: time + per-process counter, no entropy read needed per error
+_trace_counter = itertools.count()
+_trace_pid = os.getpid() & 0xFFFF
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class _DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller: a full queue sheds its oldest record"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+
+def new_trace_id() -> str:
+    """Unique id for correlating an error response with its log line"""
+    return f"{time.time_ns():016x}{_trace_pid:04x}{next(_trace_counter) & 0xFFFFFFFF:08x}"
+
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    trace_id = str(uuid.uuid4())
-    logger.warning(
-        "HTTPException",
-        extra={
-            "trace_id": trace_id,
-            "path": request.url.path,
-            "status_code": exc.status_code,
-            "detail": exc.detail,
-        },
-    )
+    trace_id = new_trace_id()
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(
+            "HTTPException",
+            extra={
+                "trace_id": trace_id,
+                "path": request.url.path,
+                "status_code": exc.status_code,
+                "detail": exc.detail,
+            },
+        )
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "trace_id": trace_id},
@@ -31,30 +69,34 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    trace_id = str(uuid.uuid4())
-    logger.warning(
-        "ValidationError",
-        extra={
-            "trace_id": trace_id,
-            "path": request.url.path,
-            "errors": exc.errors(),
-        },
-    )
+    trace_id = new_trace_id()
+    # errors() walks and formats every pydantic error; build it once
+    errors = exc.errors()
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(
+            "ValidationError",
+            extra={
+                "trace_id": trace_id,
+                "path": request.url.path,
+                "errors": errors,
+            },
+        )
     return JSONResponse(
         status_code=422,
-        content={"detail": exc.errors(), "trace_id": trace_id},
+        content={"detail": errors, "trace_id": trace_id},
     )
 
 
 async def unhandled_exception_handler(request: Request, exc: Exception):
-    trace_id = str(uuid.uuid4())
-    logger.exception(
-        "UnhandledException",
-        extra={
-            "trace_id": trace_id,
-            "path": request.url.path,
-        },
-    )
+    trace_id = new_trace_id()
+    if logger.isEnabledFor(logging.ERROR):
+        logger.exception(
+            "UnhandledException",
+            extra={
+                "trace_id": trace_id,
+                "path": request.url.path,
+            },
+        )
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "trace_id": trace_id},
@@ -62,11 +104,38 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 
 
 def configure_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-    )
+    """
+    Route root logging through a queue so callers only enqueue records
+    A background listener thread formats them and writes to stderr
+    """
+    global _log_listener, _queue_handler
+    root = logging.getLogger()
+    # Like basicConfig, leave an already-configured root logger alone
+    if not root.handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_MAX_RECORDS)
+        _queue_handler = _DropOldestQueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        root.setLevel(logging.INFO)
+        _log_listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _log_listener.start()
     # Reduce noisy loggers if needed
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
 
+def shutdown_logging():
+    """
+    Flush queued log records and stop the writer thread
+    Anything logged afterwards is written directly, as before configure_logging
+    """
+    global _log_listener, _queue_handler
+    if _log_listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        root.addHandler(handler)
+    _log_listener = None
+    _queue_handler = None
@@ -0,0 +1,41 @@
+"""
+Conditional GET helpers
+Version-based ETags so polling clients get 304 Not Modified when nothing changed
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+
+from app.core.cache import cache
+
+
+def get_version(key: str) -> str:
+    """Current value of a version counter (0 until first bumped)"""
+    return (cache.get(key) or b"0").decode("ascii")
+
+
+def bump_version(key: str) -> None:
+    """Advance a version counter so ETags derived from it stop matching"""
+    cache.incr(key)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given version parts"""
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(
+        tag[2:] == etag if tag.startswith("W/") else tag == etag
+        for tag in candidates
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -3,44 +3,65 @@ Rate limiting configuration (SlowAPI)
 Tiered limits: Development (relaxed), Production (reasonable), with burst support
 """
 
+import importlib.util
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from fastapi import HTTPException, Request, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.core.config import settings
+from app.core.security import decode_access_token
+
+logger = logging.getLogger(__name__)
 
 
 def get_rate_limit_key(request):
     """
-    Use remote address for rate limiting
-    Could be enhanced to use user ID for authenticated requests
+    Rate limit authenticated requests per user, anonymous ones per remote address
+    Users behind a shared NAT or proxy then each get their own bucket
     """
+    authorization = request.headers.get("authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        # Verified payloads are cached, so this rarely re-checks the signature
+        payload = decode_access_token(authorization[7:])
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
     return get_remote_address(request)
 
 
-# Create single limiter instance
-limiter = Limiter(key_func=get_rate_limit_key)
-
-
-# Rate limit configurations by environment
-def get_chat_rate_limit() -> str:
+def get_rate_limit_storage_uri() -> str:
     """
-    Get appropriate rate limit for chat endpoint based on environment
+    Storage backend for rate limit counters
     
-    Returns:
-        Rate limit string in SlowAPI format
-        Format: "requests/period" or "burst/burst_period;sustained/sustained_period"
+    In-memory counters are per worker, so with N uvicorn workers a client gets
+    N times the intended rate. Use shared Redis storage when it is configured.
     """
-    if settings.ENVIRONMENT == "development":
-        # Development: Disable rate limiting for testing
-        return "1000/minute"
-    elif settings.ENVIRONMENT == "production":
-        # Production: Burst-aware limits
-        # Allow 15 rapid clicks in 10 seconds, but max 60 per minute overall
-        return "15/10seconds;60/minute"
-    else:
-        # Default/staging: Moderate limits
-        return "10/10seconds;45/minute"
+    storage_uri = settings.RATE_LIMIT_STORAGE_URI or settings.REDIS_URL
+    if not storage_uri:
+        return "memory://"
+    if storage_uri.startswith(("redis://", "rediss://")) and importlib.util.find_spec("redis") is None:
+        logger.warning("Rate limit storage is Redis but the redis package is not installed; using in-memory counters")
+        return "memory://"
+    return storage_uri
+
+
+# Create single limiter instance
+_storage_uri = get_rate_limit_storage_uri()
+limiter = Limiter(
+    key_func=get_rate_limit_key,
+    storage_uri=_storage_uri,
+    # Shared storage: exact sliding window, and keep limiting per worker if Redis goes away
+    strategy="moving-window" if _storage_uri != "memory://" else "fixed-window",
+    in_memory_fallback_enabled=_storage_uri != "memory://",
+)
 
 
+# Rate limit configurations by environment
 def get_start_rate_limit() -> str:
     """
     Get appropriate rate limit for session start endpoint
@@ -56,18 +77,116 @@ def get_start_rate_limit() -> str:
         return "10/minute"
 
 
-def get_pause_resume_rate_limit() -> str:
+# Token buckets for bursty, click-driven endpoints: a client may spend up to
+# `capacity` requests at once, then gets `refill_per_second` more each second
+TOKEN_BUCKET_MAX_LOCAL_KEYS = 10000
+
+# Refill, spend and save atomically on the Redis server (its clock, shared by all workers)
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return allowed
+"""
+
+
+class TokenBucket:
     """
-    Get appropriate rate limit for pause/resume endpoints
-    
-    Returns:
-        Rate limit string in SlowAPI format
+    Token-bucket limiter, shared through Redis when rate limit storage is Redis
+    Falls back to per-worker buckets when Redis is unavailable
     """
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._local: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._script = None
+        if _storage_uri.startswith(("redis://", "rediss://")):
+            import redis
+            self._redis_error = redis.RedisError
+            self._script = redis.Redis.from_url(_storage_uri).register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def check_and_consume(self, key: str, cost: float = 1) -> bool:
+        """Spend `cost` tokens from the key's bucket; False if it holds too few"""
+        if self._script is not None:
+            try:
+                return bool(self._script(
+                    keys=[f"tb:{self.name}:{key}"],
+                    args=[self.capacity, self.refill_per_second, cost]
+                ))
+            except self._redis_error as e:
+                logger.warning("Token bucket %s unavailable in Redis, limiting per worker: %s", self.name, e)
+        return self._consume_local(key, cost)
+
+    def _consume_local(self, key: str, cost: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            tokens, last_refill = self._local.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last_refill) * self.refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._local[key] = (tokens, now)
+            if len(self._local) > TOKEN_BUCKET_MAX_LOCAL_KEYS:
+                self._local.popitem(last=False)
+        return allowed
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(1 / self.refill_per_second))
+
+
+def _chat_bucket_settings() -> Tuple[float, float]:
+    """(capacity, refill per second) for the chat endpoint"""
     if settings.ENVIRONMENT == "development":
-        # Development: Disable rate limiting for testing
-        return "1000/minute"
+        # Development: effectively unlimited for testing
+        return 1000, 1000 / 60
+    elif settings.ENVIRONMENT == "production":
+        # Production: 15 rapid clicks, then 60 per minute sustained
+        return 15, 1.0
     else:
-        # Production: Reasonable limits for pause/resume actions
-        return "20/minute"
+        # Default/staging: 10 rapid clicks, then 45 per minute sustained
+        return 10, 0.75
+
+
+def _pause_resume_bucket_settings() -> Tuple[float, float]:
+    """(capacity, refill per second) for the pause/resume endpoints"""
+    if settings.ENVIRONMENT == "development":
+        return 1000, 1000 / 60
+    else:
+        # 20 per minute, all of which may be spent at once
+        return 20, 20 / 60
+
+
+chat_token_bucket = TokenBucket("chat", *_chat_bucket_settings())
+pause_resume_token_bucket = TokenBucket("pause_resume", *_pause_resume_bucket_settings())
 
 
+def token_bucket_limit(bucket: TokenBucket) -> Callable:
+    """Build a route dependency that spends one token per request (429 when empty)"""
+    # A plain def, so FastAPI runs it in the threadpool: with Redis storage
+    # check_and_consume is a blocking script call
+    def dependency(request: Request) -> None:
+        if not bucket.check_and_consume(get_rate_limit_key(request)):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(bucket.retry_after_seconds)},
+            )
+    dependency.__name__ = f"{bucket.name}_rate_limit"
+    return dependency
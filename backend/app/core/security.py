@@ -2,28 +2,75 @@
 Security Utilities
 Handles password hashing, JWT token creation/verification
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
+import threading
+import time
 import jwt
 from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-# Password hashing context (using pbkdf2_sha256 - secure and no compilation needed)
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    PasswordHasher = None
+    ARGON2_AVAILABLE = False
+
+# Legacy password hashes (pbkdf2_sha256); still verified so existing users can log in
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+# New hashes use Argon2id when argon2-cffi is installed (OWASP minimum parameters)
+ARGON2_PREFIX = "$argon2"
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1) if ARGON2_AVAILABLE else None
+
+# JWT key material, resolved once instead of on every encode/decode
+_jwt_signing_key = settings.SECRET_KEY.encode("utf-8")
+_jwt_algorithm = settings.ALGORITHM
+_jwt_algorithms = [settings.ALGORITHM]
+
+# Verified token payloads, keyed by a digest of the token (never the raw token).
+# Clients resend the same token on every request, so this skips repeat HMAC checks.
+# Entries live for JWT_CACHE_TTL seconds at most, and never past the token's exp.
+JWT_CACHE_MAX_ENTRIES = settings.JWT_CACHE_MAX
+JWT_CACHE_TTL_SECONDS = settings.JWT_CACHE_TTL
+_jwt_cache: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+_jwt_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password"""
+    """Verify a plain password against a hashed password (Argon2 or legacy pbkdf2)"""
+    if hashed_password.startswith(ARGON2_PREFIX):
+        if password_hasher is None:
+            return False
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
+    if password_hasher is not None:
+        return password_hasher.hash(password)
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a verified hash should be replaced (legacy scheme or outdated Argon2 parameters)"""
+    if password_hasher is None:
+        return False
+    if not hashed_password.startswith(ARGON2_PREFIX):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -43,7 +90,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _jwt_signing_key, algorithm=_jwt_algorithm)
     
     return encoded_jwt
 
@@ -58,11 +105,30 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token data or None if invalid
     """
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    with _jwt_cache_lock:
+        entry = _jwt_cache.get(key)
+        if entry is not None:
+            payload, expires_at = entry
+            if expires_at > time.time():
+                _jwt_cache.move_to_end(key)
+                return payload
+            del _jwt_cache[key]
+    
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _jwt_signing_key, algorithms=_jwt_algorithms)
     except InvalidTokenError:
         return None
+    
+    # Only tokens that expire are cached, and never past their exp claim
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(exp, time.time() + JWT_CACHE_TTL_SECONDS)
+        with _jwt_cache_lock:
+            _jwt_cache[key] = (payload, expires_at)
+            if len(_jwt_cache) > JWT_CACHE_MAX_ENTRIES:
+                _jwt_cache.popitem(last=False)
+    return payload
 
 
 def verify_jwt_token(token: str) -> Optional[dict]:
@@ -0,0 +1,41 @@
+"""
+SQL Functions
+Database-side UTC clock, matching the naive-UTC datetimes the app stores
+"""
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import Date, DateTime
+
+
+class utcnow(FunctionElement):
+    """Current UTC timestamp (timezone-naive), evaluated by the database"""
+    type = DateTime()
+    inherit_cache = True
+
+
+class utc_current_date(FunctionElement):
+    """Current UTC date, evaluated by the database"""
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    # now() follows the session time zone; pin it to UTC like datetime.utcnow()
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utc_current_date)
+def _default_utc_current_date(element, compiler, **kw):
+    # SQLite's DATE('now') is already UTC
+    return "DATE('now')"
+
+
+@compiles(utc_current_date, "postgresql")
+def _pg_utc_current_date(element, compiler, **kw):
+    return "CAST(TIMEZONE('utc', CURRENT_TIMESTAMP) AS DATE)"
@@ -2,6 +2,7 @@
 Database Initialization
 Seeds initial data including admin user
 """
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash
@@ -16,13 +17,13 @@ def init_db(db: Session) -> None:
     - Default admin user
     - System consents (versions)
     """
-    # Check if admin user already exists
-    admin = db.query(User).filter(
+    # Check if admin user already exists (id only; no User is loaded)
+    admin_id = db.scalar(select(User.id).where(
         User.email == "admin@psychnow.com",
         User.role == UserRole.ADMIN
-    ).first()
+    ).limit(1))
     
-    if not admin:
+    if admin_id is None:
         print("Creating default admin user...")
         admin = User(
             email="admin@psychnow.com",
@@ -34,7 +35,6 @@ def init_db(db: Session) -> None:
         )
         db.add(admin)
         db.commit()
-        db.refresh(admin)
         
         print(f"[OK] Admin user created:")
         print(f"   Email: admin@psychnow.com")
@@ -53,11 +53,12 @@ def get_or_create_admin(db: Session) -> User:
     Returns:
         Admin user
     """
-    admin = db.query(User).filter(User.role == UserRole.ADMIN).first()
+    admin_query = select(User).where(User.role == UserRole.ADMIN).limit(1)
+    admin = db.scalar(admin_query)
     
     if not admin:
         init_db(db)
-        admin = db.query(User).filter(User.role == UserRole.ADMIN).first()
+        admin = db.scalar(admin_query)
     
     return admin
 
@@ -2,19 +2,30 @@
 Database Session Management
 Creates and manages database connections
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator, Optional
+from sqlalchemy.pool import StaticPool
+from typing import Any, Dict, Generator, Optional
 import logging
+import threading
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Compiled-statement cache entries (SQLAlchemy default 500); the API issues
+# more distinct statements than that, and a miss means recompiling the SQL
+SQL_COMPILED_CACHE_SIZE = 1200
+
 # Create SQLAlchemy engine with error handling
 engine: Optional[object] = None
 SessionLocal: Optional[sessionmaker] = None
 
+# Separate small pool for scheduled maintenance jobs (session cleanup, stats
+# reconciliation) so batch loops don't compete with request handlers
+cleanup_engine: Optional[object] = None
+CleanupSessionLocal: Optional[sessionmaker] = None
+
 try:
     if "sqlite" in settings.DATABASE_URL:
         # SQLite configuration
@@ -30,20 +41,99 @@ try:
             settings.DATABASE_URL,
             echo=settings.DEBUG,
             pool_pre_ping=True,
-            pool_recycle=3600,
-            pool_size=5,  # Reduced for Render free tier
-            max_overflow=10,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            # Size for concurrent SSE streams, which each hold a connection while saving
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            # Reuse the most recently returned connection so idle extras can time out
+            pool_use_lifo=True,
+            query_cache_size=SQL_COMPILED_CACHE_SIZE,
+        )
+        
+        @event.listens_for(engine, "checkout")
+        def _warn_on_pool_exhaustion(dbapi_connection, connection_record, connection_proxy):
+            # The next request will wait up to DB_POOL_TIMEOUT for a connection
+            pool = engine.pool
+            if pool.checkedout() >= pool.size() + settings.DB_MAX_OVERFLOW:
+                logger.warning(
+                    "Database pool exhausted: %s connections checked out (pool_size=%s, max_overflow=%s)",
+                    pool.checkedout(), pool.size(), settings.DB_MAX_OVERFLOW
+                )
+        
+        cleanup_engine = create_engine(
+            settings.DATABASE_URL,
+            echo=settings.DEBUG,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_size=2,  # the scheduled pass and a queued /cleanup pass may overlap
+            max_overflow=0,
+            pool_use_lifo=True,
         )
     
     # Create session factory
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Maintenance jobs commit per batch and never reuse loaded objects,
+    # so skip expiring the identity map on every commit
+    CleanupSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=cleanup_engine or engine,
+    )
     logger.info("Database connection established successfully")
     
 except Exception as e:
-    logger.error(f"Failed to establish database connection: {e}")
-    logger.warning("Running in database-less mode - some features may be limited")
-    engine = None
-    SessionLocal = None
+    logger.error("Failed to establish database connection: %s", e)
+    logger.warning("Falling back to an in-memory SQLite database - data will not persist across restarts")
+    # One shared connection, so every session sees the same in-memory database
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    cleanup_engine = None
+    CleanupSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=engine,
+    )
+    _fallback_schema_pending = True
+else:
+    _fallback_schema_pending = False
+
+_fallback_schema_lock = threading.Lock()
+
+
+def ensure_fallback_schema() -> None:
+    """
+    Create all tables in the in-memory fallback database (no-op otherwise)
+    Deferred until first use so every model module has registered its table
+    """
+    global _fallback_schema_pending
+    if not _fallback_schema_pending:
+        return
+    with _fallback_schema_lock:
+        if _fallback_schema_pending:
+            from app.db.base import Base
+            Base.metadata.create_all(bind=engine)
+            _fallback_schema_pending = False
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Connection pool usage for the request engine (for saturation monitoring)"""
+    if engine is None:
+        return {"available": False}
+    pool = engine.pool
+    status: Dict[str, Any] = {"available": True, "pool": pool.__class__.__name__}
+    # Not every pool class (e.g. SQLite's) tracks all of these
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            status[name] = counter()
+    return status
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -53,24 +143,7 @@ def get_db() -> Generator[Session, None, None]:
     Yields:
         Database session
     """
-    if SessionLocal is None:
-        # Return a mock session that doesn't do anything
-        class MockQuery:
-            def filter(self, *args): return self
-            def first(self): return None
-            def all(self): return []
-            def count(self): return 0
-        
-        class MockSession:
-            def add(self, obj): pass
-            def commit(self): pass
-            def refresh(self, obj): pass
-            def close(self): pass
-            def query(self, model): return MockQuery()
-            def __enter__(self): return self
-            def __exit__(self, *args): pass
-        yield MockSession()
-        return
+    ensure_fallback_schema()
     
     db = SessionLocal()
     try:
@@ -5,6 +5,7 @@ SQLAlchemy ORM models for all tables
 from app.models.user import User
 from app.models.provider_profile import ProviderProfile
 from app.models.intake_session import IntakeSession
+from app.models.session_stat import SessionStat
 from app.models.intake_report import IntakeReport
 from app.models.provider_review import ProviderReview
 from app.models.consent import Consent
@@ -18,6 +19,7 @@ __all__ = [
     "User",
     "ProviderProfile",
     "IntakeSession",
+    "SessionStat",
     "IntakeReport",
     "ProviderReview",
     "Consent",
@@ -6,6 +6,7 @@ Stores appointment scheduling and management data
 from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Enum
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from datetime import datetime
 import enum
 
 
@@ -80,7 +81,8 @@ class Appointment(Base):
     
     # Metadata
     created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=True)
+    # Set on every UPDATE (ORM or Core); appointment ETags are derived from it
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationships
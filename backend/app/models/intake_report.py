@@ -2,9 +2,10 @@
 Intake Report Model
 Stores the final generated clinical report
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Boolean, Index, Computed
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Tuple
 import uuid
 
 from app.db.base import Base
@@ -13,6 +14,16 @@ from app.db.base import Base
 class IntakeReport(Base):
     """Final intake report generated from session"""
     __tablename__ = "intake_reports"
+    __table_args__ = (
+        # Report lists: patient_id = ? ORDER BY created_at DESC, id DESC LIMIT n (scanned backwards, no sort)
+        Index("ix_intake_reports_patient_created", "patient_id", "created_at", "id"),
+        # Provider report list: shared_with_provider_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_intake_reports_shared_provider_created", "shared_with_provider_id", "created_at", "id"),
+        # Admin report list: ORDER BY created_at DESC, id DESC
+        Index("ix_intake_reports_created_id", "created_at", "id"),
+        # Provider queue / dashboard: assigned_provider_id = ? AND review_status IN (...)
+        Index("ix_intake_reports_assigned_provider_status", "assigned_provider_id", "review_status"),
+    )
     
     # Primary Key
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -24,6 +35,12 @@ class IntakeReport(Base):
     # Report Data
     report_data = Column(JSON, nullable=False)  # Complete structured report
     clinician_report_data = Column(JSON, nullable=True)  # Clinician-focused report
+    # Stored copy of report_data["chief_complaint"], kept in sync by the database
+    chief_complaint = Column(
+        String,
+        Computed(report_data["chief_complaint"].as_string(), persisted=True),
+        nullable=True
+    )
     
     # Classifications
     severity_level = Column(String(20), nullable=True)  # mild, moderate, severe
@@ -41,6 +58,12 @@ class IntakeReport(Base):
     # Sharing
     shared_with_provider_id = Column(String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
+    # Provider assignment and review workflow
+    assigned_provider_id = Column(String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    assigned_at = Column(DateTime, nullable=True)
+    review_status = Column(String(20), nullable=True)  # pending, in_review, completed
+    reviewed_at = Column(DateTime, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -54,3 +77,19 @@ class IntakeReport(Base):
     def __repr__(self):
         return f"<IntakeReport {self.id} - {self.severity_level}/{self.risk_level}>"
 
+
+def report_summary_columns() -> Tuple:
+    """
+    List-view columns for intake reports
+    chief_complaint is a generated column, so the full report JSON is never
+    loaded, parsed or hydrated into IntakeReport objects
+    """
+    return (
+        IntakeReport.id,
+        IntakeReport.patient_id,
+        IntakeReport.severity_level,
+        IntakeReport.risk_level,
+        IntakeReport.urgency,
+        IntakeReport.created_at,
+        IntakeReport.chief_complaint,
+    )
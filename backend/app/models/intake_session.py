@@ -2,7 +2,7 @@
 Intake Session Model
 Stores conversation state and data collection during intake
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -13,6 +13,18 @@ from app.db.base import Base
 class IntakeSession(Base):
     """Intake session tracking conversation and data collection"""
     __tablename__ = "intake_sessions"
+    __table_args__ = (
+        # Expired paused session cleanup: status = 'paused' AND expires_at < now
+        Index("ix_intake_sessions_status_expires_at", "status", "expires_at"),
+        # Resume lookup: resume_token = ? AND status = 'paused' (only paused rows are indexed)
+        Index(
+            "ix_intake_sessions_resume_lookup", "resume_token", "status",
+            postgresql_where=text("status = 'paused'"),
+            sqlite_where=text("status = 'paused'"),
+        ),
+        # /sessions/me: patient_id = ? AND status IN (...) ORDER BY updated_at DESC
+        Index("ix_intake_sessions_patient_status_updated", "patient_id", "status", "updated_at"),
+    )
     
     # Primary Key
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -2,8 +2,9 @@
 Provider Review Model
 Provider's review and notes on intake reports
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import false
 from datetime import datetime
 import uuid
 
@@ -13,6 +14,12 @@ from app.db.base import Base
 class ProviderReview(Base):
     """Provider's clinical review of an intake report"""
     __tablename__ = "provider_reviews"
+    __table_args__ = (
+        # One review per provider per report; create_review upserts against this
+        Index("uq_provider_reviews_report_provider", "report_id", "provider_id", unique=True),
+        # Dashboard completed_today: provider_id = ? AND reviewed_at >= today
+        Index("ix_provider_reviews_provider_reviewed_at", "provider_id", "reviewed_at"),
+    )
     
     # Primary Key
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -27,6 +34,11 @@ class ProviderReview(Base):
     # Clinical Notes
     clinical_notes = Column(Text, nullable=True)
     recommendations = Column(Text, nullable=True)
+    risk_assessment = Column(Text, nullable=True)
+    
+    # Follow-up
+    follow_up_required = Column(Boolean, nullable=False, default=False, server_default=false())
+    follow_up_date = Column(DateTime, nullable=True)
     
     # Timestamps
     reviewed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,95 @@
+"""
+Session Stat Model
+Rollup of intake session counts per status, kept current on write
+"""
+from sqlalchemy import Column, String, Integer, event, inspect, insert, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Dict
+
+from app.db.base import Base
+from app.models.intake_session import IntakeSession
+
+
+class SessionStat(Base):
+    """Number of intake sessions currently in a given status"""
+    __tablename__ = "session_stats"
+
+    status = Column(String(20), primary_key=True)  # active, paused, completed, abandoned, unknown
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SessionStat {self.status}={self.count}>"
+
+
+# Rollup key for sessions with no status, so the total still matches intake_sessions
+UNKNOWN_STATUS = "unknown"
+
+
+def _dialect_insert(connection):
+    """INSERT construct with ON CONFLICT support for the connection's database"""
+    if connection.dialect.name == "postgresql":
+        return pg_insert
+    return sqlite_insert
+
+
+def adjust_session_stats(connection, deltas: Dict[str, int]):
+    """
+    Apply per-status count deltas inside the caller's transaction
+    Upserts each row so concurrent first writes to a status can't collide on the primary key
+    """
+    merged: Dict[str, int] = {}
+    for status, delta in deltas.items():
+        key = status or UNKNOWN_STATUS
+        merged[key] = merged.get(key, 0) + delta
+    for status, delta in merged.items():
+        if not delta:
+            continue
+        stmt = _dialect_insert(connection)(SessionStat).values(status=status, count=delta)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[SessionStat.status],
+                set_={"count": SessionStat.count + delta}
+            )
+        )
+
+
+def rebuild_session_stats(connection):
+    """Recompute the rollup from intake_sessions (reconciliation)"""
+    status_key = func.coalesce(IntakeSession.status, UNKNOWN_STATUS)
+    counts = connection.execute(
+        select(status_key, func.count()).group_by(status_key)
+    ).all()
+    connection.execute(SessionStat.__table__.delete())
+    rows = [{"status": status, "count": count} for status, count in counts]
+    if rows:
+        connection.execute(insert(SessionStat), rows)
+
+
+@event.listens_for(IntakeSession, "after_insert")
+def _session_inserted(mapper, connection, target):
+    adjust_session_stats(connection, {target.status: 1})
+
+
+@event.listens_for(IntakeSession.status, "set", active_history=True)
+def _load_previous_status(target, value, oldvalue, initiator):
+    # active_history loads an expired status before it is overwritten, so after_update sees the old value
+    return value
+
+
+@event.listens_for(IntakeSession, "after_update")
+def _session_updated(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+    deltas: Dict[str, int] = {}
+    for old_status in history.deleted:
+        deltas[old_status] = deltas.get(old_status, 0) - 1
+    for new_status in history.added:
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    adjust_session_stats(connection, deltas)
+
+
+@event.listens_for(IntakeSession, "after_delete")
+def _session_deleted(mapper, connection, target):
+    adjust_session_stats(connection, {target.status: -1})
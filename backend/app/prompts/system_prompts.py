@@ -3,6 +3,9 @@ System Prompts for Ava (AI Intake Specialist)
 Core instructions for conversational intake
 """
 
+# Prompt cache routing key for every request that starts with INTAKE_SYSTEM_PROMPT
+INTAKE_PROMPT_CACHE_KEY = "psychnow-intake"
+
 INTAKE_SYSTEM_PROMPT = """### OPTIONS FORMATTING CONTRACT (STRICT)
 When you offer multiple-choice answers, you **must** include them between these exact delimiters and use dash bullets:
 BEGIN_OPTIONS
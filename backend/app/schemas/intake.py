@@ -55,3 +55,10 @@ class FinishIntakeRequest(BaseModel):
     """Request to finish intake and generate report"""
     session_token: str
 
+
+
+class TransferSessionRequest(BaseModel):
+    """Request to transfer an anonymous session to a new account"""
+    session_token: str = Field(..., min_length=1)
+    new_user_id: str = Field(..., min_length=1)
+    user_name: Optional[str] = None
@@ -20,6 +20,11 @@ class AppointmentRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class RescheduleRequest(BaseModel):
+    """Schema for appointment reschedule request"""
+    new_datetime: datetime = Field(..., description="New start time (ISO datetime)")
+
+
 class AppointmentResponse(BaseModel):
     """Schema for appointment response"""
     success: bool
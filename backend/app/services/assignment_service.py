@@ -6,10 +6,10 @@ Handles auto-assignment, workload balancing, and provider capacity management
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
+from sqlalchemy import and_, func, desc, Row
 
 from app.models.user import User
-from app.models.intake_report import IntakeReport
+from app.models.intake_report import IntakeReport, report_summary_columns
 from app.models.provider_review import ProviderReview
 from app.models.notification import Notification
 from app.services.notification_service import notification_service
@@ -21,6 +21,12 @@ class AssignmentService:
     def __init__(self):
         self.notification_service = notification_service
     
+    def _display_name(self, user: Optional[User], default: str = "") -> str:
+        """First and last name of a user, or default when there is none"""
+        if not user:
+            return default
+        return f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email
+    
     def get_available_providers(self, db: Session) -> List[User]:
         """Get list of available providers (active and approved)"""
         return db.query(User).filter(
@@ -79,7 +85,7 @@ class AssignmentService:
         """Auto-assign report to least-busy available provider"""
         
         # Get the report
-        report = db.query(IntakeReport).filter(IntakeReport.id == report_id).first()
+        report = db.get(IntakeReport, report_id)
         if not report:
             raise ValueError(f"Report with ID {report_id} not found")
         
@@ -141,13 +147,13 @@ class AssignmentService:
         import asyncio
         asyncio.create_task(self.notification_service.create_provider_assignment(
             best_provider_id, 
-            report.patient_name or "Unknown Patient", 
+            self._display_name(report.patient, "Unknown Patient"), 
             report_id, 
             db
         ))
         
         provider_info = provider_workloads[best_provider_id]["provider"]
-        print(f"Report {report_id} auto-assigned to provider {provider_info.name} (ID: {best_provider_id})")
+        print(f"Report {report_id} auto-assigned to provider {self._display_name(provider_info)} (ID: {best_provider_id})")
         
         return best_provider_id
     
@@ -155,7 +161,7 @@ class AssignmentService:
         """Manually assign report to specific provider"""
         
         # Get the report
-        report = db.query(IntakeReport).filter(IntakeReport.id == report_id).first()
+        report = db.get(IntakeReport, report_id)
         if not report:
             raise ValueError(f"Report with ID {report_id} not found")
         
@@ -175,7 +181,7 @@ class AssignmentService:
         workload = self.calculate_provider_workload(provider_id, db)
         
         if workload["pending_reports"] >= capacity["max_caseload"]:
-            raise ValueError(f"Provider {provider.name} is at maximum capacity ({capacity['max_caseload']} reports)")
+            raise ValueError(f"Provider {self._display_name(provider)} is at maximum capacity ({capacity['max_caseload']} reports)")
         
         # Update report assignment
         report.assigned_provider_id = provider_id
@@ -188,19 +194,19 @@ class AssignmentService:
         import asyncio
         asyncio.create_task(self.notification_service.create_provider_assignment(
             provider_id, 
-            report.patient_name or "Unknown Patient", 
+            self._display_name(report.patient, "Unknown Patient"), 
             report_id, 
             db
         ))
         
-        print(f"Report {report_id} manually assigned to provider {provider.name}")
+        print(f"Report {report_id} manually assigned to provider {self._display_name(provider)}")
         return True
     
     def reassign_report(self, report_id: int, new_provider_id: int, db: Session, reason: str = None) -> bool:
         """Reassign report to different provider"""
         
         # Get the report
-        report = db.query(IntakeReport).filter(IntakeReport.id == report_id).first()
+        report = db.get(IntakeReport, report_id)
         if not report:
             raise ValueError(f"Report with ID {report_id} not found")
         
@@ -222,17 +228,16 @@ class AssignmentService:
         
         return success
     
-    def get_provider_assigned_reports(
-        self, 
-        provider_id: int, 
-        status_filter: Optional[str] = None,
-        risk_level_filter: Optional[str] = None,
-        limit: int = 50,
-        db: Session = None
-    ) -> List[IntakeReport]:
-        """Get reports assigned to specific provider with optional filters"""
-        
-        query = db.query(IntakeReport).filter(
+    def _provider_assigned_reports_query(
+        self,
+        query,
+        provider_id: int,
+        status_filter: Optional[str],
+        risk_level_filter: Optional[str],
+        limit: int
+    ):
+        """Apply the assigned-reports filters, ordering and limit to a query"""
+        query = query.filter(
             IntakeReport.assigned_provider_id == provider_id
         )
         
@@ -245,11 +250,38 @@ class AssignmentService:
         return query.order_by(
             desc(IntakeReport.risk_level),
             desc(IntakeReport.assigned_at)
-        ).limit(limit).all()
+        ).limit(limit)
+    
+    def get_provider_assigned_reports(
+        self, 
+        provider_id: int, 
+        status_filter: Optional[str] = None,
+        risk_level_filter: Optional[str] = None,
+        limit: int = 50,
+        db: Session = None
+    ) -> List[IntakeReport]:
+        """Get reports assigned to specific provider with optional filters"""
+        return self._provider_assigned_reports_query(
+            db.query(IntakeReport), provider_id, status_filter, risk_level_filter, limit
+        ).all()
+    
+    def get_provider_assigned_report_summaries(
+        self,
+        provider_id: int,
+        status_filter: Optional[str] = None,
+        risk_level_filter: Optional[str] = None,
+        limit: int = 50,
+        db: Session = None
+    ) -> List[Row]:
+        """List-view columns for a provider's assigned reports"""
+        query = db.query(*report_summary_columns())
+        return self._provider_assigned_reports_query(
+            query, provider_id, status_filter, risk_level_filter, limit
+        ).all()
     
-    def get_unassigned_reports(self, db: Session, limit: int = 50) -> List[IntakeReport]:
-        """Get reports that haven't been assigned to any provider"""
-        return db.query(IntakeReport).filter(
+    def get_unassigned_report_summaries(self, db: Session, limit: int = 50) -> List[Row]:
+        """List-view columns for reports that haven't been assigned to any provider"""
+        return db.query(*report_summary_columns()).filter(
             IntakeReport.assigned_provider_id.is_(None)
         ).order_by(
             desc(IntakeReport.risk_level),
@@ -300,7 +332,7 @@ class AssignmentService:
             
             provider_workloads.append({
                 "provider_id": provider.id,
-                "provider_name": provider.name,
+                "provider_name": self._display_name(provider),
                 "pending_reports": workload["pending_reports"],
                 "high_risk_reports": workload["high_risk_reports"],
                 "max_caseload": capacity["max_caseload"],
@@ -3,11 +3,18 @@ Conversation Service
 Manages intake conversation state and phase transitions
 """
 from typing import List, Dict, Any, Optional, AsyncIterator
+import asyncio
 import logging
+import re
+import threading
+import weakref
+from collections import OrderedDict
 from datetime import datetime
 import uuid
+import orjson
+from sqlalchemy import update
 
-from app.prompts.system_prompts import INTAKE_SYSTEM_PROMPT
+from app.prompts.system_prompts import INTAKE_SYSTEM_PROMPT, INTAKE_PROMPT_CACHE_KEY
 from app.services.llm_service import llm_service
 from app.screeners.registry import screener_registry
 from app.schemas.intake import ChatResponse
@@ -15,6 +22,7 @@ from app.schemas.intake import ChatResponse as CR  # Backup import for error han
 
 logger = logging.getLogger(__name__)
 from app.services.screener_enforcement_service import screener_enforcement_service
+from app.services.session_store import create_session_store
 
 # Import report services for PDF generation
 try:
@@ -26,6 +34,12 @@ except Exception as e:
     logger.warning(f"Report services not available: {e}")
     REPORT_SERVICES_AVAILABLE = False
 
+# Sessions whose last DB write is remembered (least recently saved are forgotten first)
+SAVED_FINGERPRINTS_MAX = 10_000
+
+# A model message asking one of these is waiting on a screener answer
+SCREENER_QUESTION_RE = re.compile(r"(?:PHQ-9|GAD-7|C-SSRS) Question")
+
 # ============================================================================
 # DSM-5 DOMAIN REQUIREMENTS FOR CLINICAL ASSESSMENT
 # ============================================================================
@@ -828,8 +842,25 @@ class ConversationService:
     
     def __init__(self):
         """Initialize conversation service"""
-        # In-memory session storage (will move to Redis/DB later)
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        # In-memory by default, shared via Redis when REDIS_URL is set
+        self.sessions = create_session_store()
+        # Fingerprint of what was last written to the DB, per session token
+        # (saves run as background tasks in the threadpool, hence the lock)
+        self._saved_fingerprints: "OrderedDict[str, int]" = OrderedDict()
+        self._saved_fingerprints_lock = threading.Lock()
+        # One lock per session token while any request is using it
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    
+    def session_lock(self, session_token: str) -> asyncio.Lock:
+        """
+        Lock serializing requests that mutate the same session in this worker
+        Entries disappear once no request holds a reference to the lock
+        """
+        lock = self._session_locks.get(session_token)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_token] = lock
+        return lock
     
     def _track_discussed_topics(self, session_token: str, user_message: str):
         """
@@ -1078,42 +1109,46 @@ class ConversationService:
         return None
     
     def save_session_to_db(self, session_token: str, db_session):
-        """Save session data to database for persistence"""
+        """Save session data to database for persistence (skipped if unchanged since the last save)"""
         try:
             from app.models.intake_session import IntakeSession
-            from sqlalchemy.orm import Session
             
             # Get session data
             session_data = self.get_session(session_token)
             if not session_data:
                 return
             
-            # Find or create database session
-            db_intake_session = db_session.query(IntakeSession).filter(
-                IntakeSession.session_token == session_token
-            ).first()
+            persisted = {
+                "conversation_history": session_data.get("conversation_history", []),
+                "extracted_data": session_data.get("extracted_data", {}),
+                "screener_scores": session_data.get("screener_scores", {}),
+                "current_screener": session_data.get("current_screener"),
+                "completed_screeners": session_data.get("completed_screeners", []),
+            }
+            fingerprint = hash(orjson.dumps(persisted, option=orjson.OPT_NON_STR_KEYS, default=str))
+            with self._saved_fingerprints_lock:
+                if self._saved_fingerprints.get(session_token) == fingerprint:
+                    self._saved_fingerprints.move_to_end(session_token)
+                    return
             
-            if db_intake_session:
-                # Update existing session
-                db_intake_session.conversation_history = session_data.get("conversation_history", [])
-                db_intake_session.extracted_data = session_data.get("extracted_data", {})
-                db_intake_session.screener_scores = session_data.get("screener_scores", {})
-                db_intake_session.current_screener = session_data.get("current_screener")
-                db_intake_session.completed_screeners = session_data.get("completed_screeners", [])
-                db_intake_session.updated_at = datetime.utcnow()
-            else:
+            # Update the existing row in place without loading its JSON columns
+            result = db_session.execute(
+                update(IntakeSession)
+                .where(IntakeSession.session_token == session_token)
+                .values(**persisted, updated_at=datetime.utcnow()),
+                execution_options={"synchronize_session": False},
+            )
+            
+            if result.rowcount == 0:
                 # Create new session (shouldn't happen in normal flow)
-                db_intake_session = IntakeSession(
-                    session_token=session_token,
-                    conversation_history=session_data.get("conversation_history", []),
-                    extracted_data=session_data.get("extracted_data", {}),
-                    screener_scores=session_data.get("screener_scores", {}),
-                    current_screener=session_data.get("current_screener"),
-                    completed_screeners=session_data.get("completed_screeners", [])
-                )
-                db_session.add(db_intake_session)
+                db_session.add(IntakeSession(session_token=session_token, **persisted))
             
             db_session.commit()
+            with self._saved_fingerprints_lock:
+                self._saved_fingerprints[session_token] = fingerprint
+                self._saved_fingerprints.move_to_end(session_token)
+                if len(self._saved_fingerprints) > SAVED_FINGERPRINTS_MAX:
+                    self._saved_fingerprints.popitem(last=False)
             
         except Exception as e:
             logger.error(f"Error saving session to database: {str(e)}")
@@ -1143,6 +1178,7 @@ class ConversationService:
                 }
                 
                 # Store in memory
+                self.derive_pause_flags(session_data)
                 self.sessions[session_token] = session_data
                 return session_data
             
@@ -1151,10 +1187,39 @@ class ConversationService:
         
         return None
     
+    @staticmethod
+    def derive_pause_flags(session: Dict[str, Any]):
+        """Rebuild the flags add_message maintains for a session restored from history"""
+        history = session.get("conversation_history") or []
+        session["safety_assessment_started"] = any(
+            "C-SSRS" in msg.get("content", "") for msg in history
+        )
+        last_message = history[-1] if history else {}
+        session["awaiting_screener_answer"] = last_message.get("role") == "model" and bool(
+            SCREENER_QUESTION_RE.search(last_message.get("content", ""))
+        )
+    
     def update_session(self, session_token: str, updates: Dict[str, Any]):
         """Update session data"""
-        if session_token in self.sessions:
-            self.sessions[session_token].update(updates)
+        self.sessions.mutate(session_token, lambda session: session.update(updates))
+    
+    def mutate_session(self, session_token: str, mutator) -> Optional[Dict[str, Any]]:
+        """Atomically apply mutator to a stored session; returns None if missing"""
+        return self.sessions.mutate(session_token, mutator)
+    
+    def session_scope(self, session_token: str):
+        """
+        Async context manager around a request's in-place work on a session
+        With a shared (Redis) store the session is loaded once on entry and the
+        changes are written back on a clean exit; a failed request writes nothing
+        """
+        return self.sessions.scope(session_token)
+    
+    def discard_session(self, session_token: str):
+        """Drop a session from the session store (e.g. once it has expired)"""
+        self.sessions.pop(session_token, None)
+        with self._saved_fingerprints_lock:
+            self._saved_fingerprints.pop(session_token, None)
     
     def add_message(
         self,
@@ -1178,6 +1243,11 @@ class ConversationService:
                 "timestamp": datetime.utcnow().isoformat()
             }
             session["conversation_history"].append(message)
+            
+            # Keep pause-eligibility flags current so /pause never has to rescan the history
+            if "C-SSRS" in content:
+                session["safety_assessment_started"] = True
+            session["awaiting_screener_answer"] = role == "model" and bool(SCREENER_QUESTION_RE.search(content))
     
     async def get_initial_greeting(self, session_token: str) -> str:
         """Get the initial greeting message from Ava"""
@@ -1195,7 +1265,9 @@ class ConversationService:
                 {"role": "user", "content": "Start the intake process"}
             ]
             
-            response = await llm_service.get_chat_completion(messages, temperature=0.8)
+            response = await llm_service.get_chat_completion(
+                messages, temperature=0.8, prompt_cache_key=INTAKE_PROMPT_CACHE_KEY
+            )
             return response
     
     async def process_user_message(
@@ -1519,7 +1591,7 @@ The following topics have already been discussed in this assessment. DO NOT ask
         # Stream response with error handling
         full_response = ""
         try:
-            async for chunk in llm_service.stream_chat_completion(messages):
+            async for chunk in llm_service.stream_chat_completion(messages, prompt_cache_key=INTAKE_PROMPT_CACHE_KEY):
                 # Additional safety check for chunk content
                 if chunk and isinstance(chunk, str):
                     full_response += chunk
@@ -2436,24 +2508,18 @@ The following topics have already been discussed in this assessment. DO NOT ask
         """
         Restore a paused session with full state
         """
+        # Ensure we have all required fields
+        session_data.setdefault("conversation_history", [])
+        session_data.setdefault("extracted_data", {})
+        session_data.setdefault("screener_scores", {})
+        session_data.setdefault("completed_screeners", [])
+        session_data.setdefault("current_screener", None)
+        session_data.setdefault("screener_progress", {})
+        session_data.setdefault("current_phase", "greeting")
+        self.derive_pause_flags(session_data)
+        
         # Store the complete session state
         self.sessions[session_token] = session_data
-        
-        # Ensure we have all required fields
-        if "conversation_history" not in self.sessions[session_token]:
-            self.sessions[session_token]["conversation_history"] = []
-        if "extracted_data" not in self.sessions[session_token]:
-            self.sessions[session_token]["extracted_data"] = {}
-        if "screener_scores" not in self.sessions[session_token]:
-            self.sessions[session_token]["screener_scores"] = {}
-        if "completed_screeners" not in self.sessions[session_token]:
-            self.sessions[session_token]["completed_screeners"] = []
-        if "current_screener" not in self.sessions[session_token]:
-            self.sessions[session_token]["current_screener"] = None
-        if "screener_progress" not in self.sessions[session_token]:
-            self.sessions[session_token]["screener_progress"] = {}
-        if "current_phase" not in self.sessions[session_token]:
-            self.sessions[session_token]["current_phase"] = "greeting"
 
 
 # Global conversation service instance
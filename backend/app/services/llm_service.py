@@ -2,7 +2,7 @@
 LLM Service
 Wrapper for OpenAI API with streaming support
 """
-from typing import AsyncIterator, List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
 import openai
 from openai import AsyncOpenAI
 import json
@@ -19,10 +19,23 @@ class LLMService:
         self.model = settings.OPENAI_MODEL
         self.max_tokens = settings.OPENAI_MAX_TOKENS
     
+    @staticmethod
+    def _cache_options(prompt_cache_key: Optional[str]) -> Dict[str, Any]:
+        """
+        Extra request options routing calls that share a system prompt together
+        
+        OpenAI caches identical prompt prefixes automatically; the cache key keeps
+        requests with the same long system prompt on the same cache shard.
+        """
+        if not prompt_cache_key:
+            return {}
+        return {"extra_body": {"prompt_cache_key": prompt_cache_key}}
+    
     async def stream_chat_completion(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        prompt_cache_key: Optional[str] = None
     ) -> AsyncIterator[str]:
         """
         Stream chat completion responses
@@ -30,6 +43,7 @@ class LLMService:
         Args:
             messages: List of conversation messages
             temperature: Sampling temperature (0-2)
+            prompt_cache_key: Optional key grouping requests that share a system prompt
             
         Yields:
             Chunks of response text
@@ -40,7 +54,8 @@ class LLMService:
                 messages=messages,
                 temperature=temperature,
                 max_tokens=self.max_tokens,
-                stream=True
+                stream=True,
+                **self._cache_options(prompt_cache_key)
             )
             
             async for chunk in stream:
@@ -69,7 +84,8 @@ class LLMService:
     async def get_chat_completion(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        prompt_cache_key: Optional[str] = None
     ) -> str:
         """
         Get a complete (non-streaming) chat completion
@@ -77,6 +93,7 @@ class LLMService:
         Args:
             messages: List of conversation messages
             temperature: Sampling temperature
+            prompt_cache_key: Optional key grouping requests that share a system prompt
             
         Returns:
             Complete response text
@@ -86,7 +103,8 @@ class LLMService:
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=self.max_tokens
+                max_tokens=self.max_tokens,
+                **self._cache_options(prompt_cache_key)
             )
             
             return response.choices[0].message.content
@@ -5,15 +5,19 @@ Handles notification creation, delivery, and management
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import func
 
 from app.models.notification import Notification
 from app.models.intake_report import IntakeReport
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.core.cache import cache
 from app.services.websocket_service import websocket_service
 
+# Unread badge counts are polled far more often than notifications change
+UNREAD_COUNT_CACHE_TTL_SECONDS = 300
+
 
 class NotificationService:
     """Service for managing notifications and alerts"""
@@ -21,61 +25,91 @@ class NotificationService:
     def __init__(self):
         self.websocket_service = websocket_service
     
+    def _unread_count_key(self, user_id: int) -> str:
+        return f"unread:{user_id}"
+    
+    def invalidate_unread_count(self, user_id: int) -> None:
+        """Drop a user's cached unread count after their notifications change"""
+        cache.delete(self._unread_count_key(user_id))
+    
+    def _role_recipient_ids(self, roles: List[str], db: Session) -> List[str]:
+        """Ids of the active users a role-wide notification is delivered to"""
+        return [
+            user_id for (user_id,) in db.query(User.id).filter(
+                User.role.in_([UserRole(role) for role in roles]),
+                User.is_active.is_(True)
+            ).all()
+        ]
+    
+    def _store_notifications(
+        self,
+        user_ids: List[str],
+        db: Session,
+        report_id: Optional[Any] = None,
+        **fields
+    ) -> List[Notification]:
+        """
+        Write one notification row per recipient and drop their cached unread counts
+        A report the notification is about is linked through resource_type/resource_id
+        """
+        now = datetime.utcnow()
+        notifications = [
+            Notification(
+                user_id=user_id,
+                resource_type="report" if report_id is not None else None,
+                resource_id=str(report_id) if report_id is not None else None,
+                created_at=now,
+                **fields
+            )
+            for user_id in user_ids
+        ]
+        db.add_all(notifications)
+        db.commit()
+        for user_id in user_ids:
+            self.invalidate_unread_count(user_id)
+        return notifications
+    
+    def notifications_version(self, user_id: int, db: Session) -> str:
+        """
+        Changes whenever the user's notification list or unread count may have changed
+        Read from the database (row count plus newest created/read times), so every
+        worker agrees whoever made the change
+        """
+        row = db.query(
+            func.count(Notification.id),
+            func.max(Notification.created_at),
+            func.max(Notification.read_at),
+            func.count(Notification.read_at)
+        ).filter(Notification.user_id == user_id).one()
+        return ".".join(str(part) for part in row)
+    
     async def create_high_risk_alert(
         self, 
         report_id: int, 
         patient_name: str, 
         risk_details: Dict[str, Any], 
         db: Session
-    ) -> Notification:
-        """Create and send high-risk patient alert"""
+    ) -> List[Notification]:
+        """Create and send high-risk patient alert to every active provider and admin"""
         
-        # Create notification record
-        notification = Notification(
+        # Risk details travel with the WebSocket alert; the stored row links the report
+        notifications = self._store_notifications(
+            self._role_recipient_ids(["provider", "admin"], db),
+            db,
+            report_id=report_id,
             type="high_risk_alert",
             title="High-Risk Patient Alert",
             message=f"Patient {patient_name} requires immediate review",
-            priority="critical",
-            data={
-                "report_id": report_id,
-                "patient_name": patient_name,
-                "risk_level": risk_details.get("risk_level"),
-                "urgency": risk_details.get("urgency"),
-                "screener_name": risk_details.get("screener_name"),
-                "score": risk_details.get("score"),
-                "details": risk_details.get("details")
-            },
-            target_role="provider",  # Also sent to admins via WebSocket
-            is_read=False,
-            created_at=datetime.utcnow()
+            priority="critical"
         )
         
-        db.add(notification)
-        db.commit()
-        db.refresh(notification)
-        
         # Send real-time WebSocket notification
         await self.websocket_service.send_high_risk_alert(
             patient_name, report_id, risk_details
         )
         
-        # Create additional notification for admins
-        admin_notification = Notification(
-            type="high_risk_alert",
-            title="High-Risk Patient Alert",
-            message=f"Patient {patient_name} requires immediate review",
-            priority="critical",
-            data=notification.data,
-            target_role="admin",
-            is_read=False,
-            created_at=datetime.utcnow()
-        )
-        
-        db.add(admin_notification)
-        db.commit()
-        
         print(f"High-risk alert created for patient {patient_name} (Report ID: {report_id})")
-        return notification
+        return notifications
     
     async def create_provider_assignment(
         self, 
@@ -92,34 +126,23 @@ class NotificationService:
             raise ValueError(f"Provider with ID {provider_id} not found")
         
         # Create notification record
-        notification = Notification(
+        notification, = self._store_notifications(
+            [provider_id],
+            db,
+            report_id=report_id,
             type="provider_assignment",
             title="New Patient Assignment",
             message=f"New patient report assigned: {patient_name}",
-            priority="medium",
-            data={
-                "report_id": report_id,
-                "patient_name": patient_name,
-                "provider_id": provider_id,
-                "provider_name": provider.name,
-                "assignment_time": datetime.utcnow().isoformat()
-            },
-            target_user_id=provider_id,
-            target_role="provider",
-            is_read=False,
-            created_at=datetime.utcnow()
+            priority="medium"
         )
         
-        db.add(notification)
-        db.commit()
-        db.refresh(notification)
-        
         # Send real-time WebSocket notification
         await self.websocket_service.send_provider_assignment(
             provider_id, patient_name, report_id
         )
         
-        print(f"Provider assignment notification sent to {provider.name} for patient {patient_name}")
+        provider_name = f"{provider.first_name or ''} {provider.last_name or ''}".strip() or provider.email
+        print(f"Provider assignment notification sent to {provider_name} for patient {patient_name}")
         return notification
     
     async def create_system_notification(
@@ -130,24 +153,23 @@ class NotificationService:
         priority: str = "low",
         data: Optional[Dict] = None,
         db: Optional[Session] = None
-    ) -> Optional[Notification]:
-        """Create system-wide notification"""
-        
-        notification = Notification(
-            type="system_notification",
-            title=title,
-            message=message,
-            priority=priority,
-            data=data or {},
-            target_role=target_role,
-            is_read=False,
-            created_at=datetime.utcnow()
-        )
+    ) -> List[Notification]:
+        """
+        Create a notification for every active user in target_role
+        A report_id in data links the stored rows to that report
+        """
         
+        notifications = []
         if db:
-            db.add(notification)
-            db.commit()
-            db.refresh(notification)
+            notifications = self._store_notifications(
+                self._role_recipient_ids([target_role], db),
+                db,
+                report_id=(data or {}).get("report_id"),
+                type="system_notification",
+                title=title,
+                message=message,
+                priority=priority
+            )
         
         # Send real-time WebSocket notification
         await self.websocket_service.send_system_notification(
@@ -155,7 +177,7 @@ class NotificationService:
         )
         
         print(f"System notification sent: {title}")
-        return notification
+        return notifications
     
     def get_user_notifications(
         self, 
@@ -165,52 +187,61 @@ class NotificationService:
         db: Session = None
     ) -> List[Notification]:
         """Get notifications for a specific user"""
-        
-        query = db.query(Notification).filter(
-            or_(
-                Notification.target_user_id == user_id,
-                and_(
-                    Notification.target_user_id.is_(None),
-                    Notification.target_role == db.query(User).filter(User.id == user_id).first().role
-                )
-            )
-        )
+        return self._user_notifications_query(user_id, unread_only, db).limit(limit).all()
+    
+    def get_user_notifications_page(
+        self,
+        user_id: int,
+        limit: int = 50,
+        unread_only: bool = False,
+        db: Session = None
+    ) -> Tuple[List[Notification], int]:
+        """
+        Get notifications for a user plus how many match in total
+        The total comes from COUNT(*) OVER () in the same statement
+        """
+        rows = self._user_notifications_query(user_id, unread_only, db).add_columns(
+            func.count().over().label("total_count")
+        ).limit(limit).all()
+        total = rows[0].total_count if rows else 0
+        return [row[0] for row in rows], total
+    
+    def _user_notifications_query(self, user_id: int, unread_only: bool, db: Session):
+        query = db.query(Notification).filter(Notification.user_id == user_id)
         
         if unread_only:
-            query = query.filter(Notification.is_read == False)
+            query = query.filter(Notification.read_at.is_(None))
         
-        return query.order_by(Notification.created_at.desc()).limit(limit).all()
+        return query.order_by(Notification.created_at.desc())
     
     def get_unread_count(self, user_id: int, db: Session) -> int:
-        """Get count of unread notifications for user"""
-        return db.query(Notification).filter(
-            or_(
-                Notification.target_user_id == user_id,
-                and_(
-                    Notification.target_user_id.is_(None),
-                    Notification.target_role == db.query(User).filter(User.id == user_id).first().role
-                )
-            ),
-            Notification.is_read == False
+        """
+        Get count of unread notifications for user
+        Cached until the user's notifications change (or the TTL runs out)
+        """
+        cache_key = self._unread_count_key(user_id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return int(cached)
+        
+        count = db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None)
         ).count()
+        cache.setex(cache_key, UNREAD_COUNT_CACHE_TTL_SECONDS, str(count))
+        return count
     
-    def mark_notification_read(self, notification_id: int, user_id: int, db: Session) -> bool:
+    def mark_notification_read(self, notification_id: str, user_id: int, db: Session) -> bool:
         """Mark notification as read"""
         notification = db.query(Notification).filter(
             Notification.id == notification_id,
-            or_(
-                Notification.target_user_id == user_id,
-                and_(
-                    Notification.target_user_id.is_(None),
-                    Notification.target_role == db.query(User).filter(User.id == user_id).first().role
-                )
-            )
+            Notification.user_id == user_id
         ).first()
         
         if notification:
-            notification.is_read = True
             notification.read_at = datetime.utcnow()
             db.commit()
+            self.invalidate_unread_count(user_id)
             return True
         
         return False
@@ -218,28 +249,20 @@ class NotificationService:
     def mark_all_notifications_read(self, user_id: int, db: Session) -> int:
         """Mark all notifications as read for user"""
         updated_count = db.query(Notification).filter(
-            or_(
-                Notification.target_user_id == user_id,
-                and_(
-                    Notification.target_user_id.is_(None),
-                    Notification.target_role == db.query(User).filter(User.id == user_id).first().role
-                )
-            ),
-            Notification.is_read == False
-        ).update({
-            "is_read": True,
-            "read_at": datetime.utcnow()
-        })
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None)
+        ).update({"read_at": datetime.utcnow()}, synchronize_session=False)
         
         db.commit()
+        self.invalidate_unread_count(user_id)
         return updated_count
     
     def cleanup_old_notifications(self, days_old: int = 30, db: Session = None) -> int:
         """Clean up old read notifications"""
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
         
+        # Only read notifications are removed, so no unread count changes
         deleted_count = db.query(Notification).filter(
-            Notification.is_read == True,
             Notification.read_at < cutoff_date
         ).delete()
         
@@ -249,7 +272,7 @@ class NotificationService:
     def get_notification_stats(self, db: Session) -> Dict[str, Any]:
         """Get notification statistics for admin dashboard"""
         total_notifications = db.query(Notification).count()
-        unread_notifications = db.query(Notification).filter(Notification.is_read == False).count()
+        unread_notifications = db.query(Notification).filter(Notification.read_at.is_(None)).count()
         
         # Notifications by type
         high_risk_alerts = db.query(Notification).filter(
@@ -293,26 +316,15 @@ class NotificationService:
         """Send notification to multiple users"""
         
         notifications = []
-        
-        for user_id in target_user_ids:
-            notification = Notification(
+        if db:
+            notifications = self._store_notifications(
+                target_user_ids,
+                db,
                 type=notification_type,
                 title=title,
                 message=message,
-                priority=priority,
-                data={"bulk_notification": True},
-                target_user_id=user_id,
-                is_read=False,
-                created_at=datetime.utcnow()
+                priority=priority
             )
-            
-            if db:
-                db.add(notification)
-            
-            notifications.append(notification)
-        
-        if db:
-            db.commit()
         
         # Send WebSocket notifications to online users
         for user_id in target_user_ids:
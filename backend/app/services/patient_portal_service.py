@@ -4,16 +4,20 @@ Handles patient portal functionality including appointments, health records, and
 """
 
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+from sqlalchemy.orm import Session, joinedload, object_session
+from sqlalchemy import and_, or_, func, event, inspect
 
 from app.models.user import User
 from app.models.appointment import Appointment, AppointmentStatus, AppointmentType
 from app.models.intake_report import IntakeReport
 from app.models.intake_session import IntakeSession
 from app.services.notification_service import notification_service
+from app.core.cache import cache
+
+
+AVAILABLE_SLOTS_CACHE_TTL_SECONDS = 60
 
 
 class PatientPortalService:
@@ -22,12 +26,34 @@ class PatientPortalService:
     def __init__(self):
         self.notification_service = notification_service
     
+    def _available_slots_key(self, provider_id: int, date_range: Dict[str, date]) -> str:
+        generation = (cache.get(f"slots:gen:{provider_id}") or b"0").decode("ascii")
+        return f"slots:{provider_id}:{generation}:{date_range['start']}:{date_range['end']}"
+    
+    def invalidate_available_slots(self, provider_id: int) -> None:
+        """Drop every cached slot list for a provider after their bookings change"""
+        cache.incr(f"slots:gen:{provider_id}")
+    
+    def appointments_version(self, patient_id: int, db: Session) -> str:
+        """
+        Changes whenever one of the patient's appointments is created, updated or deleted
+        Read from the database, so every worker agrees whoever made the change
+        """
+        row = db.query(
+            func.count(Appointment.id),
+            func.max(func.coalesce(Appointment.updated_at, Appointment.created_at))
+        ).filter(Appointment.patient_id == patient_id).one()
+        return f"{row[0]}.{row[1]}"
+    
     def get_patient_dashboard_data(
         self,
         patient_id: int,
         db: Session
     ) -> Dict[str, Any]:
-        """Get comprehensive dashboard data for patient"""
+        """
+        Get comprehensive dashboard data for patient
+        Everything the portal home page shows, in one request on one DB session
+        """
         
         # Get upcoming appointments
         upcoming_appointments = self.get_upcoming_appointments(patient_id, db)
@@ -55,6 +81,16 @@ class PatientPortalService:
             )
         }
     
+    @staticmethod
+    def _limit_with_total(query, limit: int) -> Tuple[List[Any], int]:
+        """
+        Apply limit to a single-entity query and also return the unlimited row count
+        COUNT(*) OVER () is evaluated before LIMIT, so one statement gives both
+        """
+        rows = query.add_columns(func.count().over().label("total_count")).limit(limit).all()
+        total = rows[0].total_count if rows else 0
+        return [row[0] for row in rows], total
+    
     def get_upcoming_appointments(
         self,
         patient_id: int,
@@ -62,15 +98,28 @@ class PatientPortalService:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Get upcoming appointments for patient"""
+        return self.get_upcoming_appointments_page(patient_id, db, limit)[0]
+    
+    def get_upcoming_appointments_page(
+        self,
+        patient_id: int,
+        db: Session,
+        limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get upcoming appointments for patient plus the total number of them"""
         
-        appointments = db.query(Appointment).filter(
+        query = db.query(Appointment).options(
+            # provider_name is built from the provider row; load it in the same query
+            joinedload(Appointment.provider)
+        ).filter(
             Appointment.patient_id == patient_id,
             Appointment.status.in_([
                 AppointmentStatus.SCHEDULED,
                 AppointmentStatus.CONFIRMED
             ]),
             Appointment.scheduled_start >= datetime.utcnow()
-        ).order_by(Appointment.scheduled_start.asc()).limit(limit).all()
+        ).order_by(Appointment.scheduled_start.asc())
+        appointments, total_count = self._limit_with_total(query, limit)
         
         return [
             {
@@ -91,7 +140,7 @@ class PatientPortalService:
                 "confirmation_sent": apt.confirmation_sent
             }
             for apt in appointments
-        ]
+        ], total_count
     
     def get_recent_appointments(
         self,
@@ -100,8 +149,19 @@ class PatientPortalService:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Get recent appointments for patient"""
+        return self.get_recent_appointments_page(patient_id, db, limit)[0]
+    
+    def get_recent_appointments_page(
+        self,
+        patient_id: int,
+        db: Session,
+        limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get recent appointments for patient plus the total number of them"""
         
-        appointments = db.query(Appointment).filter(
+        query = db.query(Appointment).options(
+            joinedload(Appointment.provider)
+        ).filter(
             Appointment.patient_id == patient_id,
             Appointment.status.in_([
                 AppointmentStatus.COMPLETED,
@@ -109,7 +169,8 @@ class PatientPortalService:
                 AppointmentStatus.NO_SHOW
             ]),
             Appointment.scheduled_start < datetime.utcnow()
-        ).order_by(Appointment.scheduled_start.desc()).limit(limit).all()
+        ).order_by(Appointment.scheduled_start.desc())
+        appointments, total_count = self._limit_with_total(query, limit)
         
         return [
             {
@@ -128,7 +189,7 @@ class PatientPortalService:
                 "cancellation_reason": apt.cancellation_reason
             }
             for apt in appointments
-        ]
+        ], total_count
     
     def get_patient_health_records(
         self,
@@ -202,7 +263,9 @@ class PatientPortalService:
             })
         
         # Check for upcoming appointments that need confirmation
-        upcoming_apts = db.query(Appointment).filter(
+        upcoming_apts = db.query(Appointment).options(
+            joinedload(Appointment.provider)
+        ).filter(
             Appointment.patient_id == patient_id,
             Appointment.status == AppointmentStatus.SCHEDULED,
             Appointment.scheduled_start >= datetime.utcnow(),
@@ -229,8 +292,17 @@ class PatientPortalService:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get notifications for patient"""
+        return self.get_patient_notifications_page(patient_id, db, limit)[0]
+    
+    def get_patient_notifications_page(
+        self,
+        patient_id: int,
+        db: Session,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get notifications for patient plus the total number of them"""
         
-        notifications = self.notification_service.get_user_notifications(
+        notifications, total_count = self.notification_service.get_user_notifications_page(
             user_id=patient_id,
             limit=limit,
             unread_only=False,
@@ -249,7 +321,7 @@ class PatientPortalService:
                 "data": notif.data
             }
             for notif in notifications
-        ]
+        ], total_count
     
     def create_appointment_request(
         self,
@@ -360,7 +432,7 @@ class PatientPortalService:
         self,
         appointment_id: int,
         patient_id: int,
-        new_datetime: str,
+        new_datetime: datetime,
         db: Session
     ) -> Dict[str, Any]:
         """Reschedule appointment by patient"""
@@ -377,7 +449,7 @@ class PatientPortalService:
             raise ValueError("Appointment cannot be rescheduled at this time")
         
         # Calculate new end time
-        new_start = datetime.fromisoformat(new_datetime)
+        new_start = new_datetime
         new_end = new_start + timedelta(minutes=appointment.duration_minutes)
         
         # Update appointment
@@ -456,13 +528,21 @@ class PatientPortalService:
     def get_available_slots(
         self,
         provider_id: int,
-        date_range: Dict[str, str],
+        date_range: Dict[str, date],
         db: Session
     ) -> List[Dict[str, Any]]:
-        """Get available appointment slots for provider"""
+        """
+        Get available appointment slots for provider
+        Served from cache for up to AVAILABLE_SLOTS_CACHE_TTL_SECONDS
+        """
         
-        start_date = datetime.fromisoformat(date_range["start"])
-        end_date = datetime.fromisoformat(date_range["end"])
+        cache_key = self._available_slots_key(provider_id, date_range)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+        
+        start_date = datetime.combine(date_range["start"], time.min)
+        end_date = datetime.combine(date_range["end"], time.min)
         
         # Get existing appointments for provider in date range
         existing_appointments = db.query(Appointment).filter(
@@ -505,6 +585,7 @@ class PatientPortalService:
             
             current_date += timedelta(days=1)
         
+        cache.setex(cache_key, AVAILABLE_SLOTS_CACHE_TTL_SECONDS, json.dumps(available_slots))
         return available_slots
     
     def _validate_appointment_data(self, data: Dict[str, Any]) -> bool:
@@ -602,5 +683,48 @@ class PatientPortalService:
         }
 
 
+# Appointment columns that decide which slots are free
+_SLOT_ATTRIBUTES = ("provider_id", "status", "scheduled_start", "scheduled_end")
+
+
+def _queue_slot_invalidation(target: Appointment, provider_ids) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("slot_providers", set()).update(p for p in provider_ids if p)
+
+
+@event.listens_for(Appointment, "after_insert")
+@event.listens_for(Appointment, "after_delete")
+def _appointment_added_or_removed(mapper, connection, target):
+    _queue_slot_invalidation(target, [target.provider_id])
+
+
+@event.listens_for(Appointment.provider_id, "set", active_history=True)
+def _load_previous_provider(target, value, oldvalue, initiator):
+    # active_history loads an expired provider_id before it is overwritten, so after_update sees it
+    return value
+
+
+@event.listens_for(Appointment, "after_update")
+def _appointment_updated(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in _SLOT_ATTRIBUTES):
+        return
+    # A provider change frees slots for the previous provider as well
+    _queue_slot_invalidation(target, [target.provider_id, *state.attrs.provider_id.history.deleted])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_slots(session):
+    # Invalidate only once the change is visible, so a concurrent read can't re-cache the old slots
+    for provider_id in session.info.pop("slot_providers", ()):
+        patient_portal_service.invalidate_available_slots(provider_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_slot_invalidations(session):
+    session.info.pop("slot_providers", None)
+
+
 # Global patient portal service instance
 patient_portal_service = PatientPortalService()
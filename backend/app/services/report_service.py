@@ -3,6 +3,7 @@ Report Generation Service
 Creates clinical intake reports from session data
 """
 from typing import Dict, Any, List
+import asyncio
 import json
 import uuid
 from datetime import datetime
@@ -384,9 +385,11 @@ Generate the detailed clinical JSON report now with ALL sections including diagn
         Returns:
             dict with 'patient_report' and 'clinician_report' keys
         """
-        # Generate both reports in parallel would be ideal, but for now sequential is fine
-        patient_report = await self.generate_report(session_data)
-        clinician_report = await self.generate_clinician_report(session_data)
+        # The two reports only read session_data, so run the LLM calls concurrently
+        patient_report, clinician_report = await asyncio.gather(
+            self.generate_report(session_data),
+            self.generate_clinician_report(session_data),
+        )
         
         return {
             "patient_report": patient_report,
@@ -4,9 +4,13 @@ Handles cleanup of expired paused sessions and maintenance tasks
 """
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from app.db import session as db_session_module
 from app.models.intake_session import IntakeSession
+from app.models.session_stat import SessionStat, adjust_session_stats, rebuild_session_stats
 from app.services.conversation_service import conversation_service
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,33 +19,50 @@ class SessionCleanupService:
     """Service for cleaning up expired sessions and maintenance tasks"""
     
     def __init__(self):
-        self.cleanup_interval_hours = 1  # Run cleanup every hour
+        self.cleanup_interval_minutes = 15  # Scheduled cleanup runs every 15 minutes
+        self.cleanup_batch_pause_seconds = 0.05  # Pause between batched updates
+        self.stats_reconcile_interval_hours = 24  # Rebuild the session_stats rollup nightly
     
-    def cleanup_expired_sessions(self, db: Session):
+    def cleanup_expired_sessions(self, db: Session, batch_size: int = 1000):
         """
         Clean up expired paused sessions
         Marks them as abandoned and removes from memory
+        Works in batches so each UPDATE only holds row locks briefly
         """
+        cleaned_count = 0
         try:
-            # Find expired paused sessions
-            expired_sessions = db.query(IntakeSession).filter(
-                IntakeSession.status == "paused",
-                IntakeSession.expires_at < datetime.utcnow()
-            ).all()
+            now = datetime.utcnow()
             
-            cleaned_count = 0
-            for session in expired_sessions:
+            while True:
+                # Find the next batch of expired paused sessions (served by ix_intake_sessions_status_expires_at)
+                batch = db.query(IntakeSession.id, IntakeSession.session_token).filter(
+                    IntakeSession.status == "paused",
+                    IntakeSession.expires_at < now
+                ).limit(batch_size).all()
+                
+                if not batch:
+                    break
+                
                 # Mark as abandoned
-                session.status = "abandoned"
+                db.query(IntakeSession).filter(
+                    IntakeSession.id.in_([row.id for row in batch])
+                ).update({"status": "abandoned"}, synchronize_session=False)
+                # Bulk updates skip ORM events, so every Core/bulk status change must move the rollup counts itself
+                adjust_session_stats(db.connection(), {"paused": -len(batch), "abandoned": len(batch)})
+                db.commit()
                 
                 # Remove from conversation service memory
-                if session.session_token in conversation_service.sessions:
-                    del conversation_service.sessions[session.session_token]
+                for row in batch:
+                    conversation_service.discard_session(row.session_token)
                 
-                cleaned_count += 1
+                cleaned_count += len(batch)
+                if len(batch) < batch_size:
+                    break
+                
+                # Give replicas and other writers some room between batches
+                time.sleep(self.cleanup_batch_pause_seconds)
             
             if cleaned_count > 0:
-                db.commit()
                 logger.info(f"Cleaned up {cleaned_count} expired paused sessions")
             
             return cleaned_count
@@ -49,7 +70,7 @@ class SessionCleanupService:
         except Exception as e:
             logger.error(f"Error cleaning up expired sessions: {e}")
             db.rollback()
-            return 0
+            return cleaned_count
     
     def cleanup_abandoned_sessions(self, db: Session, hours_threshold: int = 48):
         """
@@ -66,8 +87,7 @@ class SessionCleanupService:
             cleaned_count = 0
             for session in abandoned_sessions:
                 # Remove from conversation service memory if still there
-                if session.session_token in conversation_service.sessions:
-                    del conversation_service.sessions[session.session_token]
+                conversation_service.discard_session(session.session_token)
                 
                 cleaned_count += 1
             
@@ -102,26 +122,68 @@ class SessionCleanupService:
             logger.error(f"Error getting expiring sessions: {e}")
             return []
     
+    def run_cleanup_cycle(self):
+        """
+        Run one full cleanup pass on a dedicated DB session
+        Blocking - called from a worker thread by the scheduler
+        """
+        with db_session_module.CleanupSessionLocal() as db:
+            expired_cleaned = self.cleanup_expired_sessions(db)
+            abandoned_cleaned = self.cleanup_abandoned_sessions(db)
+            return expired_cleaned, abandoned_cleaned
+    
+    def reconcile_session_stats(self):
+        """
+        Rebuild the session_stats rollup from intake_sessions
+        Catches any drift from writes that bypassed the ORM listeners
+        """
+        with db_session_module.CleanupSessionLocal() as db:
+            try:
+                rebuild_session_stats(db.connection())
+                db.commit()
+            except Exception as e:
+                logger.error(f"Error reconciling session stats: {e}")
+                db.rollback()
+    
+    async def run_periodic_cleanup(self):
+        """
+        Background loop that keeps session cleanup off the request path
+        Started from the app lifespan and cancelled on shutdown
+        """
+        if db_session_module.CleanupSessionLocal is None:
+            logger.warning("Database not available - scheduled session cleanup disabled")
+            return
+        
+        await asyncio.to_thread(self.reconcile_session_stats)
+        last_reconciled = time.monotonic()
+        
+        while True:
+            await asyncio.sleep(self.cleanup_interval_minutes * 60)
+            if time.monotonic() - last_reconciled >= self.stats_reconcile_interval_hours * 3600:
+                await asyncio.to_thread(self.reconcile_session_stats)
+                last_reconciled = time.monotonic()
+            try:
+                expired_cleaned, abandoned_cleaned = await asyncio.to_thread(self.run_cleanup_cycle)
+                logger.info(
+                    "Scheduled session cleanup: %s expired, %s abandoned",
+                    expired_cleaned, abandoned_cleaned
+                )
+            except Exception as e:
+                logger.error(f"Scheduled session cleanup failed: {e}")
+    
     def get_session_stats(self, db: Session):
         """
         Get statistics about session states
+        Reads the session_stats rollup instead of counting intake_sessions
+        The total includes sessions with no status (kept under the "unknown" row)
         """
         try:
+            counts = dict(db.query(SessionStat.status, SessionStat.count).all())
             stats = {
-                "active": db.query(IntakeSession).filter(
-                    IntakeSession.status == "active"
-                ).count(),
-                "paused": db.query(IntakeSession).filter(
-                    IntakeSession.status == "paused"
-                ).count(),
-                "completed": db.query(IntakeSession).filter(
-                    IntakeSession.status == "completed"
-                ).count(),
-                "abandoned": db.query(IntakeSession).filter(
-                    IntakeSession.status == "abandoned"
-                ).count(),
-                "total": db.query(IntakeSession).count()
+                status: counts.get(status, 0)
+                for status in ("active", "paused", "completed", "abandoned")
             }
+            stats["total"] = sum(counts.values())
             
             return stats
             
@@ -0,0 +1,274 @@
+"""
+Session Store
+Storage backends for in-progress conversation sessions
+
+The default store is a plain in-process dict. When REDIS_URL is configured the
+sessions are also written to Redis so every worker process sees the same state.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+try:
+    import orjson
+
+    def _dumps(value: Dict[str, Any]) -> bytes:
+        return orjson.dumps(value, default=str)
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(value: Dict[str, Any]) -> bytes:
+        return json.dumps(value, default=str).encode("utf-8")
+
+    _loads = json.loads
+
+
+SessionMutator = Callable[[Dict[str, Any]], None]
+
+# Working copies of Redis sessions held by the current request (see RedisSessionStore.scope)
+_working_copies: ContextVar[Optional[Dict[str, "_WorkingCopy"]]] = ContextVar(
+    "session_working_copies", default=None
+)
+
+
+class InMemorySessionStore(dict):
+    """Process-local session store (single worker only)"""
+
+    @asynccontextmanager
+    async def scope(self, session_token: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Sessions are mutated in place, so a request scope needs no load or write-back"""
+        yield self.get(session_token)
+
+    def mutate(self, session_token: str, mutator: SessionMutator) -> Optional[Dict[str, Any]]:
+        """Apply mutator to a session and return it, or None if missing"""
+        session = self.get(session_token)
+        if session is not None:
+            mutator(session)
+        return session
+
+
+class _WorkingCopy:
+    """A request's copy of a session plus the state it was loaded from"""
+
+    __slots__ = ("session", "baseline", "replaced", "deleted")
+
+    def __init__(self, payload: Optional[bytes]):
+        self.session = _loads(payload) if payload is not None else None
+        self.baseline = _loads(payload) if payload is not None else {}
+        self.replaced = False
+        self.deleted = False
+
+
+class RedisSessionStore:
+    """
+    Redis-backed session store shared by all workers
+
+    Each session is stored as one JSON blob under ``<prefix><token>`` with a
+    sliding TTL. Requests that mutate a session in place open ``scope`` around
+    the work: it loads a working copy private to that request (off the event
+    loop), and on a clean exit merges the top-level keys the request changed
+    back into Redis atomically. If the request fails the copy is discarded.
+    Outside a scope every call goes straight to Redis.
+    """
+
+    def __init__(self, client, ttl_seconds: int, key_prefix: str = "intake:session:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _key(self, session_token: str) -> str:
+        return f"{self.key_prefix}{session_token}"
+
+    def _working_copy(self, session_token: str) -> Optional[_WorkingCopy]:
+        copies = _working_copies.get()
+        return copies.get(session_token) if copies else None
+
+    def _read(self, session_token: str) -> Optional[bytes]:
+        try:
+            return self.client.get(self._key(session_token))
+        except redis.RedisError as e:
+            logger.error("Error reading session %s from Redis: %s", session_token, e)
+            return None
+
+    @asynccontextmanager
+    async def scope(self, session_token: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Hold a request-private working copy of a session for the duration of the block"""
+        copy = self._working_copy(session_token)
+        if copy is not None:
+            # Nested scope in the same request: share the outer copy
+            yield copy.session
+            return
+
+        copy = _WorkingCopy(await asyncio.to_thread(self._read, session_token))
+        outer = _working_copies.get()
+        context_token = _working_copies.set({**(outer or {}), session_token: copy})
+        try:
+            yield copy.session
+        except BaseException:
+            self._release(context_token, outer)
+            raise
+        self._release(context_token, outer)
+        await asyncio.to_thread(self._write_back, session_token, copy)
+
+    @staticmethod
+    def _release(context_token, outer) -> None:
+        try:
+            _working_copies.reset(context_token)
+        except ValueError:
+            # Generator finalized from another context; restore the outer mapping instead
+            _working_copies.set(outer)
+
+    def _write_back(self, session_token: str, copy: _WorkingCopy) -> None:
+        key = self._key(session_token)
+        try:
+            if copy.session is None:
+                if copy.deleted:
+                    self.client.delete(key)
+                return
+            if copy.replaced:
+                self.client.setex(key, self.ttl_seconds, _dumps(copy.session))
+                return
+
+            changed = {
+                name: value for name, value in copy.session.items()
+                if name not in copy.baseline or copy.baseline[name] != value
+            }
+            removed = [name for name in copy.baseline if name not in copy.session]
+            if not changed and not removed:
+                self.client.expire(key, self.ttl_seconds)
+                return
+        except redis.RedisError as e:
+            logger.error("Error writing session %s to Redis: %s", session_token, e)
+            return
+
+        def _merge(session: Dict[str, Any]) -> None:
+            session.update(changed)
+            for name in removed:
+                session.pop(name, None)
+
+        self._atomic_update(session_token, _merge)
+
+    def get(self, session_token: str, default=None) -> Optional[Dict[str, Any]]:
+        """Return this request's working copy of a session, or a fresh read from Redis"""
+        copy = self._working_copy(session_token)
+        if copy is not None:
+            session = copy.session
+        else:
+            payload = self._read(session_token)
+            session = _loads(payload) if payload is not None else None
+        return session if session is not None else default
+
+    def __getitem__(self, session_token: str) -> Dict[str, Any]:
+        session = self.get(session_token)
+        if session is None:
+            raise KeyError(session_token)
+        return session
+
+    def __setitem__(self, session_token: str, session: Dict[str, Any]) -> None:
+        copy = self._working_copy(session_token)
+        if copy is not None:
+            copy.session = session
+            copy.replaced = True
+            copy.deleted = False
+            return
+        try:
+            self.client.setex(self._key(session_token), self.ttl_seconds, _dumps(session))
+        except redis.RedisError as e:
+            logger.error("Error writing session %s to Redis: %s", session_token, e)
+
+    def __contains__(self, session_token: str) -> bool:
+        copy = self._working_copy(session_token)
+        if copy is not None:
+            return copy.session is not None
+        try:
+            return bool(self.client.exists(self._key(session_token)))
+        except redis.RedisError:
+            return False
+
+    def __len__(self) -> int:
+        try:
+            return sum(1 for _ in self.client.scan_iter(match=f"{self.key_prefix}*", count=1000))
+        except redis.RedisError as e:
+            logger.error("Error counting sessions in Redis: %s", e)
+            return 0
+
+    def pop(self, session_token: str, default=None):
+        copy = self._working_copy(session_token)
+        if copy is not None:
+            session = copy.session
+            copy.session = None
+            copy.deleted = True
+            return session if session is not None else default
+        session = self.get(session_token, default)
+        try:
+            self.client.delete(self._key(session_token))
+        except redis.RedisError as e:
+            logger.error("Error deleting session %s from Redis: %s", session_token, e)
+        return session
+
+    def mutate(self, session_token: str, mutator: SessionMutator) -> Optional[Dict[str, Any]]:
+        """
+        Atomically read-modify-write a session
+
+        Inside a scope the request's working copy is mutated and merged back
+        when the scope closes; otherwise the change is applied in Redis directly.
+        """
+        copy = self._working_copy(session_token)
+        if copy is not None:
+            if copy.session is not None:
+                mutator(copy.session)
+            return copy.session
+        return self._atomic_update(session_token, mutator)
+
+    def _atomic_update(self, session_token: str, mutator: SessionMutator) -> Optional[Dict[str, Any]]:
+        """
+        WATCH/MULTI/EXEC read-modify-write, so a concurrent write from another
+        request makes this attempt retry instead of being silently overwritten
+        """
+        key = self._key(session_token)
+        try:
+            with self.client.pipeline() as pipe:
+                while True:
+                    try:
+                        pipe.watch(key)
+                        payload = pipe.get(key)
+                        if payload is None:
+                            pipe.unwatch()
+                            break
+                        session = _loads(payload)
+                        mutator(session)
+                        pipe.multi()
+                        pipe.setex(key, self.ttl_seconds, _dumps(session))
+                        pipe.execute()
+                        return session
+                    except redis.WatchError:
+                        continue
+        except redis.RedisError as e:
+            logger.error("Error updating session %s in Redis: %s", session_token, e)
+        return None
+
+
+def create_session_store():
+    """Build the session store configured for this process"""
+    if not settings.REDIS_URL:
+        return InMemorySessionStore()
+    if not REDIS_AVAILABLE:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-memory sessions")
+        return InMemorySessionStore()
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    return RedisSessionStore(client, ttl_seconds=settings.SESSION_TTL_SECONDS)
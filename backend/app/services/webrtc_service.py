@@ -7,7 +7,7 @@ import asyncio
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
@@ -15,6 +15,15 @@ from app.models.user import User
 from app.models.intake_report import IntakeReport
 from app.models.telemedicine_session import TelemedicineSession
 from app.services.websocket_service import websocket_service
+from app.core.cache import cache
+
+
+# Who may join a session never changes, so signaling reconnects can skip the lookup
+SESSION_MEMBERS_CACHE_TTL_SECONDS = 300
+
+
+def _members_key(session_id: str) -> str:
+    return f"tm:members:{session_id}"
 
 
 class WebRTCService:
@@ -287,9 +296,43 @@ class WebRTCService:
             "timestamp": datetime.utcnow().isoformat()
         })
         
+        # An ended session is no longer joinable; drop the cached membership with it
+        cache.delete(_members_key(session_id))
+        
         # Clean up session data after a delay
         asyncio.create_task(self._cleanup_session(session_id, delay=300))  # 5 minutes
     
+    def get_session_members(self, session_id: str, db: Session = None) -> Optional[Tuple[str, str]]:
+        """
+        (provider_id, patient_id) of a joinable session, as strings, or None
+        Checks the cache, then this worker's active sessions, then the database
+        """
+        cache_key = _members_key(session_id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            provider_id, patient_id = cached.decode("utf-8").split("|", 1)
+            return provider_id, patient_id
+        
+        session = self.active_sessions.get(session_id)
+        if session is not None:
+            members = (str(session["provider_id"]), str(session["patient_id"]))
+        elif db is not None:
+            row = db.query(
+                TelemedicineSession.provider_id,
+                TelemedicineSession.patient_id
+            ).filter(
+                TelemedicineSession.session_id == session_id,
+                TelemedicineSession.status.notin_(["ended", "cancelled"])
+            ).first()
+            if row is None:
+                return None
+            members = (str(row.provider_id), str(row.patient_id))
+        else:
+            return None
+        
+        cache.setex(cache_key, SESSION_MEMBERS_CACHE_TTL_SECONDS, "|".join(members))
+        return members
+    
     async def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a telemedicine session"""
         
@@ -316,9 +359,10 @@ class WebRTCService:
         self,
         user_id: int,
         status: Optional[str] = None,
-        db: Session = None
+        db: Session = None,
+        limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Get telemedicine sessions for a user"""
+        """Get up to `limit` telemedicine sessions for a user, live sessions first"""
         
         sessions = []
         
@@ -340,8 +384,11 @@ class WebRTCService:
                         "ended_at": session_data.get("ended_at").isoformat() if session_data.get("ended_at") else None
                     })
         
-        # Get from database for completed sessions
-        if db:
+        sessions = sessions[:limit]
+        
+        # Get from database for completed sessions, only as many rows as are still needed
+        remaining = limit - len(sessions)
+        if db and remaining > 0:
             query = db.query(TelemedicineSession).filter(
                 (TelemedicineSession.provider_id == user_id) |
                 (TelemedicineSession.patient_id == user_id)
@@ -350,23 +397,29 @@ class WebRTCService:
             if status:
                 query = query.filter(TelemedicineSession.status == status)
             
-            db_sessions = query.order_by(TelemedicineSession.created_at.desc()).limit(50).all()
+            # Active sessions are served from memory; exclude them in SQL so LIMIT counts only new rows
+            active_ids = [
+                session_id for session_id, session_data in self.active_sessions.items()
+                if user_id in (session_data["provider_id"], session_data["patient_id"])
+            ]
+            if active_ids:
+                query = query.filter(TelemedicineSession.session_id.notin_(active_ids))
+            
+            db_sessions = query.order_by(TelemedicineSession.created_at.desc()).limit(remaining).all()
             
             for db_session in db_sessions:
-                # Skip if already in active sessions
-                if db_session.session_id not in self.active_sessions:
-                    sessions.append({
-                        "session_id": db_session.session_id,
-                        "provider_id": db_session.provider_id,
-                        "patient_id": db_session.patient_id,
-                        "report_id": db_session.report_id,
-                        "session_type": db_session.session_type,
-                        "status": db_session.status,
-                        "created_at": db_session.created_at.isoformat(),
-                        "started_at": db_session.started_at.isoformat() if db_session.started_at else None,
-                        "ended_at": db_session.ended_at.isoformat() if db_session.ended_at else None,
-                        "duration_seconds": db_session.duration_seconds
-                    })
+                sessions.append({
+                    "session_id": db_session.session_id,
+                    "provider_id": db_session.provider_id,
+                    "patient_id": db_session.patient_id,
+                    "report_id": db_session.report_id,
+                    "session_type": db_session.session_type,
+                    "status": db_session.status,
+                    "created_at": db_session.created_at.isoformat(),
+                    "started_at": db_session.started_at.isoformat() if db_session.started_at else None,
+                    "ended_at": db_session.ended_at.isoformat() if db_session.ended_at else None,
+                    "duration_seconds": db_session.duration_seconds
+                })
         
         return sessions
     
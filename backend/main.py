@@ -2,26 +2,44 @@
 PsychNow Backend - Main FastAPI Application
 Entry point for the API server
 """
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import uvicorn
 
 from app.core.config import settings
+from app.db.session import get_pool_status, ensure_fallback_schema
 from app.api.v1.router import api_router
 from app.core.error_handlers import (
     http_exception_handler,
     validation_exception_handler,
     unhandled_exception_handler,
     configure_logging,
+    shutdown_logging,
 )
 from app.middleware.validation import validate_request_middleware
+from app.core.rate_limit import limiter
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
+from app.services.session_cleanup_service import session_cleanup_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background maintenance jobs for the lifetime of the app"""
+    ensure_fallback_schema()
+    cleanup_task = asyncio.create_task(session_cleanup_service.run_periodic_cleanup())
+    yield
+    cleanup_task.cancel()
+    # Let the loop unwind (it may be waiting on a cleanup thread) before shutdown finishes
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+    shutdown_logging()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -30,6 +48,7 @@ app = FastAPI(
     description="AI-guided psychiatric assessment platform",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # Configure logging
@@ -40,8 +59,7 @@ app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 
-# Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiting (the shared limiter the route decorators register with)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, lambda request, exc: JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"}))
 app.add_middleware(SlowAPIMiddleware)
@@ -52,10 +70,12 @@ app.add_middleware(SlowAPIMiddleware)
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_origins=settings.ALLOWED_ORIGINS_SET,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide non-safelisted response headers from scripts unless exposed
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include API router
@@ -74,6 +94,11 @@ async def health_check():
         }
     )
 
+@app.get("/health/db")
+async def database_health_check():
+    """Connection pool usage, so pool saturation is visible before requests start timing out"""
+    return JSONResponse(content=get_pool_status())
+
 # Root endpoint
 @app.get("/")
 async def root():
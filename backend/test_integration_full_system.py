@@ -223,9 +223,9 @@ class IntegrationTester:
         try:
             response = self.session.post(f"{BASE_URL}/api/v1/intake/cleanup")
             
-            if response.status_code == 200:
+            if response.status_code == 202:
                 data = response.json()
-                self.log_test("Session Cleanup", True, f"Cleaned: {data.get('expired_sessions_cleaned', 0)}")
+                self.log_test("Session Cleanup", True, f"Status: {data.get('status')}")
                 return True
             else:
                 self.log_test("Session Cleanup", False, f"Status: {response.status_code}")
@@ -9,12 +9,17 @@ from sqlalchemy.pool import StaticPool
 
 import sys
 import os
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import main
 app = main.app
 from app.db.base import Base
 from app.db.session import get_db
 from app.core.config import settings
+from app.core.deps import get_current_user, get_current_user_optional
+from app.models.user import User, UserRole
+from app.models.intake_session import IntakeSession
+from app.models.intake_report import IntakeReport
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -72,3 +77,48 @@ def test_provider_data():
         "role": "provider",
         "invite_code": settings.PROVIDER_INVITE_CODE
     }
+
+@pytest.fixture
+def make_user(db_session):
+    """Factory for users stored directly in the test database"""
+    def _make_user(role=UserRole.PATIENT, **fields):
+        user = User(
+            email=fields.pop("email", f"{uuid.uuid4().hex}@example.com"),
+            hashed_password="not-a-real-hash",
+            role=role,
+            **fields
+        )
+        db_session.add(user)
+        db_session.commit()
+        return user
+    return _make_user
+
+@pytest.fixture
+def login_as(client):
+    """Authenticate subsequent client requests as the given user"""
+    def _login_as(user):
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_current_user_optional] = lambda: user
+    return _login_as
+
+@pytest.fixture
+def make_report(db_session):
+    """Factory for intake reports (with their intake session)"""
+    def _make_report(patient=None, **fields):
+        session = IntakeSession(
+            patient_id=patient.id if patient else None,
+            session_token=uuid.uuid4().hex,
+            status="completed"
+        )
+        db_session.add(session)
+        db_session.flush()
+        report = IntakeReport(
+            session_id=session.id,
+            patient_id=patient.id if patient else None,
+            report_data=fields.pop("report_data", {"chief_complaint": "Low mood"}),
+            **fields
+        )
+        db_session.add(report)
+        db_session.commit()
+        return report
+    return _make_report
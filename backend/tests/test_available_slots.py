@@ -0,0 +1,92 @@
+"""
+Test cached available slots follow appointment writes made anywhere through the ORM
+"""
+from datetime import date, datetime, timedelta
+
+from app.models.appointment import Appointment
+from app.models.user import UserRole
+from app.services.patient_portal_service import patient_portal_service
+
+
+def _next_weekday() -> date:
+    day = date.today() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def _slot_starts(provider, day, db_session):
+    slots = patient_portal_service.get_available_slots(
+        provider_id=provider.id,
+        date_range={"start": day, "end": day + timedelta(days=1)},
+        db=db_session
+    )
+    return {slot["start"] for slot in slots}
+
+
+def _book(db_session, patient, provider, start):
+    appointment = Appointment(
+        patient_id=patient.id,
+        provider_id=provider.id,
+        scheduled_start=start,
+        scheduled_end=start + timedelta(hours=1),
+        created_by=provider.id,
+        created_at=datetime.utcnow()
+    )
+    db_session.add(appointment)
+    db_session.commit()
+    return appointment
+
+
+def test_slots_refresh_after_appointment_added_outside_service(db_session, make_user):
+    """Test a booking written straight through the ORM removes the cached slot"""
+    patient = make_user(UserRole.PATIENT)
+    provider = make_user(UserRole.PROVIDER)
+    day = _next_weekday()
+    start = datetime.combine(day, datetime.min.time()).replace(hour=10)
+    assert start.isoformat() in _slot_starts(provider, day, db_session)
+    
+    appointment = _book(db_session, patient, provider, start)
+    assert start.isoformat() not in _slot_starts(provider, day, db_session)
+    
+    db_session.delete(appointment)
+    db_session.commit()
+    assert start.isoformat() in _slot_starts(provider, day, db_session)
+
+
+def test_slots_refresh_for_both_providers_on_reassignment(db_session, make_user):
+    """Test moving an appointment to another provider frees the old provider's slot"""
+    patient = make_user(UserRole.PATIENT)
+    first = make_user(UserRole.PROVIDER)
+    second = make_user(UserRole.PROVIDER)
+    day = _next_weekday()
+    start = datetime.combine(day, datetime.min.time()).replace(hour=14)
+    appointment = _book(db_session, patient, first, start)
+    assert start.isoformat() not in _slot_starts(first, day, db_session)
+    assert start.isoformat() in _slot_starts(second, day, db_session)
+    
+    appointment.provider_id = second.id
+    db_session.commit()
+    
+    assert start.isoformat() in _slot_starts(first, day, db_session)
+    assert start.isoformat() not in _slot_starts(second, day, db_session)
+
+
+def test_rolled_back_booking_keeps_cached_slots(db_session, make_user):
+    """Test a rolled-back write leaves nothing queued for the next commit"""
+    patient = make_user(UserRole.PATIENT)
+    provider = make_user(UserRole.PROVIDER)
+    start = datetime.utcnow() + timedelta(days=1)
+    db_session.add(Appointment(
+        patient_id=patient.id,
+        provider_id=provider.id,
+        scheduled_start=start,
+        scheduled_end=start + timedelta(hours=1),
+        created_by=provider.id,
+        created_at=datetime.utcnow()
+    ))
+    db_session.flush()
+    assert db_session.info.get("slot_providers") == {provider.id}
+    
+    db_session.rollback()
+    assert "slot_providers" not in db_session.info
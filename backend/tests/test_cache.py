@@ -0,0 +1,43 @@
+"""
+Test the in-memory cache bounds
+"""
+from app.core import cache as cache_module
+from app.core.cache import InMemoryCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test the cache never holds more than max_entries"""
+    cache = InMemoryCache(max_entries=2)
+    cache.setex("a", 60, "1")
+    cache.setex("b", 60, "2")
+    assert cache.get("a") == b"1"
+    
+    cache.setex("c", 60, "3")
+    
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+
+
+def test_expired_entries_are_swept_without_being_read(monkeypatch):
+    """Test entries whose keys are never read again still leave the cache"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = InMemoryCache(max_entries=100)
+    for generation in range(10):
+        cache.setex(f"slots:1:{generation}", 60, "[]")
+    
+    now[0] += InMemoryCache.SWEEP_INTERVAL_SECONDS + 1
+    cache.setex("fresh", 60, "x")
+    
+    assert len(cache) == 1
+    assert cache.get("fresh") == b"x"
+
+
+def test_incr_counts_from_zero():
+    """Test counters start at 1 and keep counting"""
+    cache = InMemoryCache()
+    assert cache.incr("gen") == 1
+    assert cache.incr("gen") == 2
+    assert cache.get("gen") == b"2"
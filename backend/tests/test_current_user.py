@@ -0,0 +1,38 @@
+"""
+Test resolving the authenticated user from a bearer token
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+
+
+def _auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.id})}"}
+
+
+def test_deactivation_applies_despite_cached_profile(client: TestClient, db_session, make_user):
+    """Test a deactivated user is refused even while their profile is cached"""
+    user = make_user(UserRole.PATIENT)
+    headers = _auth_headers(user)
+    assert client.get("/api/v1/reports/", headers=headers).status_code == 200
+    assert client.get("/api/v1/reports/", headers=headers).status_code == 200
+    
+    # Core UPDATE, as another worker or an admin script would issue: no ORM events fire here
+    db_session.execute(update(User).where(User.id == user.id).values(is_active=False))
+    db_session.commit()
+    
+    assert client.get("/api/v1/reports/", headers=headers).status_code == 403
+
+
+def test_role_change_applies_despite_cached_profile(client: TestClient, db_session, make_user):
+    """Test a role downgrade takes effect on the next request"""
+    user = make_user(UserRole.PROVIDER)
+    headers = _auth_headers(user)
+    assert client.get("/api/v1/provider/dashboard-stats", headers=headers).status_code == 200
+    
+    db_session.execute(update(User).where(User.id == user.id).values(role=UserRole.PATIENT))
+    db_session.commit()
+    
+    assert client.get("/api/v1/provider/dashboard-stats", headers=headers).status_code == 403
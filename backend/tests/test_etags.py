@@ -0,0 +1,64 @@
+"""
+Test conditional GETs notice writes made outside the serving process's caches
+"""
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.notification import Notification
+from app.models.user import UserRole
+
+
+def test_upcoming_appointments_etag_sees_provider_side_changes(client: TestClient, db_session, make_user, login_as):
+    """Test an appointment change made outside the patient portal still invalidates the ETag"""
+    patient = make_user(UserRole.PATIENT)
+    provider = make_user(UserRole.PROVIDER)
+    start = datetime.utcnow() + timedelta(days=2)
+    appointment = Appointment(
+        patient_id=patient.id,
+        provider_id=provider.id,
+        scheduled_start=start,
+        scheduled_end=start + timedelta(hours=1),
+        created_at=datetime.utcnow() - timedelta(days=1),
+        created_by=provider.id
+    )
+    db_session.add(appointment)
+    db_session.commit()
+    login_as(patient)
+    
+    first = client.get("/api/v1/patient-portal/appointments/upcoming")
+    assert first.status_code == 200
+    assert first.json()["total_count"] == 1
+    etag = first.headers["ETag"]
+    assert client.get(
+        "/api/v1/patient-portal/appointments/upcoming", headers={"If-None-Match": etag}
+    ).status_code == 304
+    
+    # Cancelled by the provider side: no portal service call, no cache bump
+    db_session.execute(
+        update(Appointment).where(Appointment.id == appointment.id).values(status=AppointmentStatus.CANCELLED)
+    )
+    db_session.commit()
+    
+    after = client.get("/api/v1/patient-portal/appointments/upcoming", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.json()["total_count"] == 0
+
+
+def test_provider_notifications_etag_sees_new_rows(client: TestClient, db_session, make_user, login_as):
+    """Test a notification written by another worker changes the notifications ETag"""
+    provider = make_user(UserRole.PROVIDER)
+    login_as(provider)
+    
+    first = client.get("/api/v1/provider/notifications")
+    assert first.json() == []
+    etag = first.headers["ETag"]
+    
+    db_session.add(Notification(user_id=provider.id, type="system_notification", title="Hi", message="Hello"))
+    db_session.commit()
+    
+    after = client.get("/api/v1/provider/notifications", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert len(after.json()) == 1
@@ -0,0 +1,124 @@
+"""
+Test pausing, resuming and finishing intake sessions through the API
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import intake as intake_module
+from app.models.intake_report import IntakeReport
+from app.models.intake_session import IntakeSession
+from app.services.conversation_service import conversation_service
+from app.services.session_cleanup_service import session_cleanup_service
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def intake_session(db_session):
+    """An active intake session, both in the session store and in the database"""
+    session = conversation_service.create_session(user_name="Sam")
+    token = session["session_token"]
+    for role, content in (("model", "What brings you in?"), ("user", "I have been feeling low"),
+                          ("model", "How long has that lasted?")):
+        conversation_service.add_message(token, role, content)
+    # Chat writes the conversation to the database after each message
+    conversation_service.save_session_to_db(token, db_session)
+    yield token
+    conversation_service.discard_session(token)
+
+
+@pytest.fixture(autouse=True)
+def quiet_resume_message(monkeypatch):
+    async def _welcome(session_data):
+        return "Welcome back"
+    monkeypatch.setattr(intake_module, "_generate_resume_message", _welcome)
+
+
+def _row(db_session, token):
+    db_session.expire_all()
+    return db_session.query(IntakeSession).filter(IntakeSession.session_token == token).one()
+
+
+def _pause(client, token):
+    return client.post("/api/v1/intake/pause", json={"session_token": token, "prompt": ""})
+
+
+def test_pause_then_resume_restores_the_conversation(client: TestClient, db_session, intake_session):
+    """Test a paused session comes back with its history and moves the stats both ways"""
+    paused = _pause(client, intake_session)
+    assert paused.status_code == 200
+    resume_token = paused.json()["resume_token"]
+    assert _row(db_session, intake_session).status == "paused"
+    assert session_cleanup_service.get_session_stats(db_session)["paused"] == 1
+    
+    conversation_service.discard_session(intake_session)
+    resumed = client.post("/api/v1/intake/resume", json={"resume_token": resume_token})
+    
+    assert resumed.status_code == 200
+    assert resumed.json()["welcome_message"] == "Welcome back"
+    row = _row(db_session, intake_session)
+    assert row.status == "active"
+    assert row.resume_token is None
+    restored = conversation_service.get_session(intake_session)
+    assert restored["conversation_history"][1]["content"] == "I have been feeling low"
+    stats = session_cleanup_service.get_session_stats(db_session)
+    assert (stats["active"], stats["paused"]) == (1, 0)
+
+
+def test_resume_token_only_works_once(client: TestClient, db_session, intake_session):
+    """Test a second resume with the same token is refused"""
+    resume_token = _pause(client, intake_session).json()["resume_token"]
+    assert client.post("/api/v1/intake/resume", json={"resume_token": resume_token}).status_code == 200
+    
+    again = client.post("/api/v1/intake/resume", json={"resume_token": resume_token})
+    assert again.status_code == 404
+
+
+def test_resume_after_expiry_abandons_the_session(client: TestClient, db_session, intake_session):
+    """Test an expired pause answers 410 and marks the session abandoned"""
+    resume_token = _pause(client, intake_session).json()["resume_token"]
+    row = _row(db_session, intake_session)
+    row.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db_session.commit()
+    
+    response = client.post("/api/v1/intake/resume", json={"resume_token": resume_token})
+    
+    assert response.status_code == 410
+    assert _row(db_session, intake_session).status == "abandoned"
+    assert session_cleanup_service.get_session_stats(db_session)["abandoned"] == 1
+
+
+def test_cannot_pause_mid_screener(client: TestClient, db_session, intake_session):
+    """Test pausing is refused while a screener question is waiting for an answer"""
+    def _mid_screener(session):
+        session["current_phase"] = "screening"
+        session["awaiting_screener_answer"] = True
+    conversation_service.sessions.mutate(intake_session, _mid_screener)
+    
+    response = _pause(client, intake_session)
+    
+    assert response.status_code == 400
+    assert _row(db_session, intake_session).status == "active"
+
+
+def test_finish_stores_report_and_completes_session(client: TestClient, db_session, intake_session, monkeypatch):
+    """Test :finish streams the reports and then records them against the session"""
+    async def _reports(session):
+        report = {"risk_level": "low", "urgency": "routine", "chief_complaint": "Low mood"}
+        return {"patient_report": report, "clinician_report": dict(report)}
+    monkeypatch.setattr(intake_module.report_service, "generate_dual_reports", _reports)
+    monkeypatch.setattr(intake_module.pdf_service, "generate_patient_report_base64", lambda report, name: "cGF0aWVudA==")
+    monkeypatch.setattr(intake_module.pdf_service, "generate_clinician_report_base64", lambda report, name: "Y2xpbmljaWFu")
+    monkeypatch.setattr(intake_module, "email_service", None)
+    monkeypatch.setattr(intake_module, "SessionLocal", TestingSessionLocal)
+    
+    response = client.post("/api/v1/intake/chat", json={"session_token": intake_session, "prompt": ":finish"})
+    
+    assert response.status_code == 200
+    assert "cGF0aWVudA==" in response.text
+    row = _row(db_session, intake_session)
+    assert row.status == "completed"
+    assert db_session.query(IntakeReport).filter(IntakeReport.session_id == row.id).count() == 1
+    stats = session_cleanup_service.get_session_stats(db_session)
+    assert (stats["active"], stats["completed"]) == (0, 1)
@@ -0,0 +1,27 @@
+"""
+Test background jobs started by the app lifespan
+"""
+import asyncio
+
+import main
+from app.services.session_cleanup_service import session_cleanup_service
+
+
+def test_shutdown_waits_for_cleanup_loop(monkeypatch):
+    """Test shutdown cancels the cleanup loop and waits for it to finish"""
+    finished = []
+    
+    async def _loop():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            finished.append(True)
+    monkeypatch.setattr(session_cleanup_service, "run_periodic_cleanup", _loop)
+    monkeypatch.setattr(main, "shutdown_logging", lambda: None)
+    
+    async def _run():
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+        return list(finished)
+    
+    assert asyncio.run(_run()) == [True]
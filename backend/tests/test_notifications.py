@@ -0,0 +1,62 @@
+"""
+Test notification writers store one row per recipient and refresh unread counts
+"""
+import asyncio
+
+from app.models.notification import Notification
+from app.models.user import UserRole
+from app.services.notification_service import notification_service
+
+
+def _rows(db_session, user):
+    return db_session.query(Notification).filter(Notification.user_id == user.id).all()
+
+
+def test_high_risk_alert_reaches_active_providers_and_admins(db_session, make_user):
+    """Test a high-risk alert is stored for each active provider and admin"""
+    provider = make_user(UserRole.PROVIDER)
+    admin = make_user(UserRole.ADMIN)
+    inactive = make_user(UserRole.PROVIDER, is_active=False)
+    patient = make_user(UserRole.PATIENT)
+    assert notification_service.get_unread_count(provider.id, db_session) == 0
+    
+    asyncio.run(notification_service.create_high_risk_alert(
+        "report-1", "Sam", {"risk_level": "high"}, db_session
+    ))
+    
+    assert notification_service.get_unread_count(provider.id, db_session) == 1
+    assert notification_service.get_unread_count(admin.id, db_session) == 1
+    assert _rows(db_session, inactive) == []
+    assert _rows(db_session, patient) == []
+    row, = _rows(db_session, provider)
+    assert (row.resource_type, row.resource_id) == ("report", "report-1")
+
+
+def test_system_notification_targets_role(db_session, make_user):
+    """Test a system notification is stored for the target role only"""
+    provider = make_user(UserRole.PROVIDER)
+    admin = make_user(UserRole.ADMIN)
+    
+    asyncio.run(notification_service.create_system_notification(
+        "Report Reassigned", "Report #7 has been reassigned", target_role="provider",
+        data={"report_id": 7}, db=db_session
+    ))
+    
+    row, = _rows(db_session, provider)
+    assert row.resource_id == "7"
+    assert _rows(db_session, admin) == []
+
+
+def test_bulk_notification_refreshes_cached_counts(db_session, make_user):
+    """Test a bulk send shows up in each recipient's already-cached unread count"""
+    first = make_user(UserRole.PATIENT)
+    second = make_user(UserRole.PATIENT)
+    for user in (first, second):
+        assert notification_service.get_unread_count(user.id, db_session) == 0
+    
+    asyncio.run(notification_service.send_bulk_notification(
+        "Maintenance", "The portal is down tonight", [first.id, second.id], db=db_session
+    ))
+    
+    assert notification_service.get_unread_count(first.id, db_session) == 1
+    assert notification_service.get_unread_count(second.id, db_session) == 1
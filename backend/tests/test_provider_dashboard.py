@@ -0,0 +1,83 @@
+"""
+Test provider dashboard statistics
+"""
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.models.notification import Notification
+from app.models.user import UserRole
+
+
+def _add_notification(db_session, user, read=False):
+    db_session.add(Notification(
+        user_id=user.id,
+        type="provider_assignment",
+        title="New Patient Assignment",
+        message="New patient report assigned",
+        read_at=datetime.utcnow() if read else None
+    ))
+    db_session.commit()
+
+
+def test_dashboard_stats_counts(client: TestClient, db_session, make_user, make_report, login_as):
+    """Test dashboard counts cover only the provider's own reports and notifications"""
+    provider = make_user(UserRole.PROVIDER)
+    other_provider = make_user(UserRole.PROVIDER)
+    make_report(assigned_provider_id=provider.id, review_status="pending", risk_level="high")
+    make_report(assigned_provider_id=provider.id, review_status="in_review", risk_level="low")
+    make_report(assigned_provider_id=provider.id, review_status="completed", risk_level="high")
+    make_report(assigned_provider_id=other_provider.id, review_status="pending", risk_level="high")
+    make_report()
+    _add_notification(db_session, provider)
+    _add_notification(db_session, provider, read=True)
+    _add_notification(db_session, other_provider)
+    login_as(provider)
+    
+    response = client.get("/api/v1/provider/dashboard-stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_assigned": 3,
+        "pending_review": 2,
+        "high_risk_pending": 1,
+        "completed_today": 0,
+        "unread_notifications": 1
+    }
+
+
+def test_dashboard_stats_refresh_after_review(client: TestClient, make_user, make_report, login_as):
+    """Test a submitted review is reflected immediately and changes the ETag"""
+    provider = make_user(UserRole.PROVIDER)
+    report = make_report(assigned_provider_id=provider.id, review_status="pending", risk_level="high")
+    login_as(provider)
+    
+    before = client.get("/api/v1/provider/dashboard-stats")
+    assert before.json()["pending_review"] == 1
+    etag = before.headers["ETag"]
+    assert client.get("/api/v1/provider/dashboard-stats", headers={"If-None-Match": etag}).status_code == 304
+    
+    client.post(f"/api/v1/provider/reports/{report.id}/review", json={"clinical_notes": "Reviewed"})
+    
+    after = client.get("/api/v1/provider/dashboard-stats", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.json()["pending_review"] == 0
+    assert after.json()["high_risk_pending"] == 0
+    assert after.json()["completed_today"] == 1
+
+
+def test_mark_notification_read_updates_unread_count(client: TestClient, db_session, make_user, login_as):
+    """Test reading a notification drops it from the unread list and count"""
+    provider = make_user(UserRole.PROVIDER)
+    _add_notification(db_session, provider)
+    login_as(provider)
+    
+    unread = client.get("/api/v1/provider/notifications", params={"unread_only": True})
+    assert unread.status_code == 200
+    assert len(unread.json()) == 1
+    assert client.get("/api/v1/provider/dashboard-stats").json()["unread_notifications"] == 1
+    
+    notification_id = unread.json()[0]["id"]
+    assert client.post(f"/api/v1/provider/notifications/{notification_id}/read").status_code == 200
+    
+    assert client.get("/api/v1/provider/notifications", params={"unread_only": True}).json() == []
+    assert client.get("/api/v1/provider/dashboard-stats").json()["unread_notifications"] == 0
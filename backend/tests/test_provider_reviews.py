@@ -0,0 +1,94 @@
+"""
+Test provider review submission
+"""
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.models.intake_report import IntakeReport
+from app.models.provider_review import ProviderReview
+from app.models.user import UserRole
+
+
+def test_create_review_marks_report_completed(client: TestClient, db_session, make_user, make_report, login_as):
+    """Test that a provider can review a report assigned to them"""
+    provider = make_user(UserRole.PROVIDER)
+    report = make_report(
+        assigned_provider_id=provider.id,
+        assigned_at=datetime.utcnow(),
+        review_status="pending"
+    )
+    login_as(provider)
+    
+    response = client.post(
+        f"/api/v1/provider/reports/{report.id}/review",
+        json={"clinical_notes": "Stable, follow up in two weeks", "treatment_plan": "CBT"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["report_id"] == report.id
+    assert data["provider_id"] == provider.id
+    assert data["status"] == "completed"
+    
+    db_session.expire_all()
+    report = db_session.get(IntakeReport, report.id)
+    assert report.review_status == "completed"
+    assert report.reviewed_at is not None
+
+
+def test_create_review_twice_updates_existing_review(client: TestClient, db_session, make_user, make_report, login_as):
+    """Test that a second review by the same provider overwrites the first"""
+    provider = make_user(UserRole.PROVIDER)
+    report = make_report(assigned_provider_id=provider.id, review_status="pending")
+    login_as(provider)
+    
+    first = client.post(f"/api/v1/provider/reports/{report.id}/review", json={"clinical_notes": "First"})
+    second = client.post(f"/api/v1/provider/reports/{report.id}/review", json={"clinical_notes": "Second"})
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json()["id"] == first.json()["id"]
+    
+    reviews = db_session.query(ProviderReview).filter(ProviderReview.report_id == report.id).all()
+    assert len(reviews) == 1
+    assert reviews[0].clinical_notes == "Second"
+
+
+def test_create_review_keeps_follow_up_and_risk_fields(client: TestClient, db_session, make_user, make_report, login_as):
+    """Test that follow-up and risk assessment fields are stored, and updated on resubmit"""
+    provider = make_user(UserRole.PROVIDER)
+    report = make_report(assigned_provider_id=provider.id, review_status="pending")
+    login_as(provider)
+    
+    first = client.post(
+        f"/api/v1/provider/reports/{report.id}/review",
+        json={
+            "clinical_notes": "Notes",
+            "follow_up_required": True,
+            "follow_up_date": "2026-11-01T10:00:00",
+            "risk_assessment": "Low risk, no current ideation"
+        }
+    )
+    assert first.status_code == 200
+    assert first.json()["follow_up_required"] is True
+    assert first.json()["risk_assessment"] == "Low risk, no current ideation"
+    
+    client.post(
+        f"/api/v1/provider/reports/{report.id}/review",
+        json={"clinical_notes": "Notes", "risk_assessment": "Moderate risk"}
+    )
+    db_session.expire_all()
+    review = db_session.query(ProviderReview).filter(ProviderReview.report_id == report.id).one()
+    assert review.follow_up_required is False
+    assert review.follow_up_date is None
+    assert review.risk_assessment == "Moderate risk"
+
+
+def test_create_review_requires_assignment(client: TestClient, make_user, make_report, login_as):
+    """Test that a provider cannot review a report assigned to someone else"""
+    provider = make_user(UserRole.PROVIDER)
+    other_provider = make_user(UserRole.PROVIDER)
+    report = make_report(assigned_provider_id=other_provider.id, review_status="pending")
+    login_as(provider)
+    
+    response = client.post(f"/api/v1/provider/reports/{report.id}/review", json={"clinical_notes": "Notes"})
+    assert response.status_code == 404
@@ -0,0 +1,37 @@
+"""
+Test the token-bucket route dependency
+"""
+import threading
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import TokenBucket, token_bucket_limit
+
+
+def test_token_bucket_dependency_runs_off_the_event_loop(monkeypatch):
+    """Test the bucket is checked in a worker thread and answers 429 once empty"""
+    bucket = TokenBucket("test", capacity=1, refill_per_second=0.001)
+    threads = []
+    loop_threads = []
+    consume = bucket.check_and_consume
+    
+    def _record_thread(key, cost=1):
+        threads.append(threading.current_thread())
+        return consume(key, cost)
+    monkeypatch.setattr(bucket, "check_and_consume", _record_thread)
+    
+    app = FastAPI()
+    
+    @app.get("/limited", dependencies=[Depends(token_bucket_limit(bucket))])
+    async def limited():
+        loop_threads.append(threading.current_thread())
+        return {}
+    
+    with TestClient(app) as client:
+        assert client.get("/limited").status_code == 200
+        response = client.get("/limited")
+    
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(bucket.retry_after_seconds)
+    assert threads[0] is not loop_threads[0]
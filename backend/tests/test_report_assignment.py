@@ -0,0 +1,57 @@
+"""
+Test provider assigned-report and admin unassigned-report lists
+"""
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.models.user import UserRole
+
+
+def test_assigned_reports_lists_only_own_reports(client: TestClient, make_user, make_report, login_as):
+    """Test the provider list returns their assigned reports, highest risk first"""
+    provider = make_user(UserRole.PROVIDER)
+    other_provider = make_user(UserRole.PROVIDER)
+    now = datetime.utcnow()
+    low = make_report(assigned_provider_id=provider.id, assigned_at=now, review_status="pending", risk_level="low")
+    high = make_report(
+        assigned_provider_id=provider.id,
+        assigned_at=now - timedelta(hours=1),
+        review_status="pending",
+        risk_level="moderate",
+        report_data={"chief_complaint": "Panic attacks"}
+    )
+    make_report(assigned_provider_id=other_provider.id, review_status="pending", risk_level="high")
+    make_report(risk_level="high")
+    login_as(provider)
+    
+    response = client.get("/api/v1/provider/assigned-reports")
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [high.id, low.id]
+    assert data[0]["chief_complaint"] == "Panic attacks"
+
+
+def test_assigned_reports_status_filter(client: TestClient, make_user, make_report, login_as):
+    """Test the provider list can be filtered by review status"""
+    provider = make_user(UserRole.PROVIDER)
+    pending = make_report(assigned_provider_id=provider.id, review_status="pending")
+    make_report(assigned_provider_id=provider.id, review_status="completed")
+    login_as(provider)
+    
+    response = client.get("/api/v1/provider/assigned-reports", params={"status_filter": "pending"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [pending.id]
+
+
+def test_unassigned_reports_for_admin(client: TestClient, make_user, make_report, login_as):
+    """Test the admin list returns only reports without a provider"""
+    admin = make_user(UserRole.ADMIN)
+    provider = make_user(UserRole.PROVIDER)
+    unassigned = make_report(risk_level="high")
+    make_report(assigned_provider_id=provider.id, review_status="pending")
+    login_as(admin)
+    
+    response = client.get("/api/v1/admin/unassigned-reports")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [unassigned.id]
@@ -0,0 +1,84 @@
+"""
+Test report listing and conditional GETs
+"""
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.config import settings
+
+from app.models.intake_report import IntakeReport
+from app.models.user import UserRole
+
+
+def test_get_report_etag_tracks_content(client: TestClient, db_session, make_user, make_report, login_as):
+    """Test a report re-fetch is a 304 until the report changes, however it is written"""
+    patient = make_user(UserRole.PATIENT)
+    report = make_report(patient, risk_level="low")
+    login_as(patient)
+    
+    first = client.get(f"/api/v1/reports/{report.id}")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    
+    repeat = client.get(f"/api/v1/reports/{report.id}", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    
+    # A Core UPDATE fires no ORM events; the ETag must still move
+    db_session.execute(update(IntakeReport).where(IntakeReport.id == report.id).values(risk_level="high"))
+    db_session.commit()
+    
+    changed = client.get(f"/api/v1/reports/{report.id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["risk_level"] == "high"
+    assert changed.headers["ETag"] != etag
+
+
+def test_get_report_of_another_patient_is_forbidden(client: TestClient, make_user, make_report, login_as):
+    """Test a patient cannot read someone else's report"""
+    owner = make_user(UserRole.PATIENT)
+    other = make_user(UserRole.PATIENT)
+    report = make_report(owner)
+    login_as(other)
+    
+    assert client.get(f"/api/v1/reports/{report.id}").status_code == 403
+
+
+def test_list_reports_pages_through_shared_timestamps(client: TestClient, make_user, make_report, login_as):
+    """Test cursor pages neither skip nor repeat reports created at the same instant"""
+    patient = make_user(UserRole.PATIENT)
+    created_at = datetime(2026, 1, 1, 12, 0, 0)
+    reports = [make_report(patient, created_at=created_at) for _ in range(5)]
+    login_as(patient)
+    
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["after"] = cursor
+        response = client.get("/api/v1/reports/", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    
+    assert sorted(seen) == sorted(report.id for report in reports)
+    assert len(seen) == len(set(seen))
+
+
+def test_list_reports_rejects_bad_cursor(client: TestClient, make_user, login_as):
+    """Test a malformed cursor is a 400"""
+    login_as(make_user(UserRole.PATIENT))
+    assert client.get("/api/v1/reports/", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_cors_exposes_pagination_headers(client: TestClient):
+    """Test cross-origin scripts can read the cursor and ETag headers"""
+    origin = next(iter(settings.ALLOWED_ORIGINS_SET))
+    response = client.get("/health", headers={"Origin": origin})
+    exposed = response.headers["access-control-expose-headers"]
+    assert "X-Next-Cursor" in exposed
+    assert "ETag" in exposed
@@ -0,0 +1,30 @@
+"""
+Test the on-demand session cleanup trigger
+"""
+from app.api.v1 import intake as intake_module
+from app.services.session_cleanup_service import session_cleanup_service
+
+
+def test_cleanup_endpoint_queues_a_pass(client, monkeypatch):
+    """Test the cleanup endpoint schedules a cleanup cycle"""
+    calls = []
+    monkeypatch.setattr(session_cleanup_service, "run_cleanup_cycle", lambda: calls.append(1))
+    
+    response = client.post("/api/v1/intake/cleanup")
+    
+    assert response.status_code == 202
+    assert response.json()["status"] == "scheduled"
+    assert calls == [1]
+
+
+def test_cleanup_endpoint_without_cleanup_sessions(client, monkeypatch):
+    """Test the cleanup endpoint reports it can't schedule anything"""
+    calls = []
+    monkeypatch.setattr(intake_module, "CleanupSessionLocal", None)
+    monkeypatch.setattr(session_cleanup_service, "run_cleanup_cycle", lambda: calls.append(1))
+    
+    response = client.post("/api/v1/intake/cleanup")
+    
+    assert response.status_code == 503
+    assert calls == []
+
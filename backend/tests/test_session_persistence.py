@@ -0,0 +1,35 @@
+"""
+Test writing conversation sessions to the database
+"""
+from app.models.intake_session import IntakeSession
+from app.services import conversation_service as conversation_module
+from app.services.conversation_service import conversation_service
+
+
+def test_save_session_to_db_writes_history(db_session):
+    """Test a conversation session is written to its row"""
+    session = conversation_service.create_session(user_name="Sam")
+    token = session["session_token"]
+    conversation_service.add_message(token, "user", "I have been feeling low")
+    
+    conversation_service.save_session_to_db(token, db_session)
+    
+    row = db_session.query(IntakeSession).filter(IntakeSession.session_token == token).one()
+    assert row.conversation_history[-1]["content"] == "I have been feeling low"
+    conversation_service.discard_session(token)
+
+
+def test_saved_fingerprints_are_bounded(db_session, monkeypatch):
+    """Test the unchanged-session fingerprints keep only the most recent sessions"""
+    monkeypatch.setattr(conversation_module, "SAVED_FINGERPRINTS_MAX", 2)
+    tokens = [conversation_service.create_session()["session_token"] for _ in range(3)]
+    
+    for token in tokens:
+        conversation_service.save_session_to_db(token, db_session)
+    
+    assert tokens[0] not in conversation_service._saved_fingerprints
+    assert all(token in conversation_service._saved_fingerprints for token in tokens[1:])
+    
+    for token in tokens:
+        conversation_service.discard_session(token)
+    assert not any(token in conversation_service._saved_fingerprints for token in tokens)
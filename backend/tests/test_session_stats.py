@@ -0,0 +1,79 @@
+"""
+Test the session_stats rollup stays in step with intake_sessions
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.api.v1.intake import _set_paused_session_status
+from app.models.intake_session import IntakeSession
+from app.models.session_stat import adjust_session_stats, rebuild_session_stats
+from app.services.session_cleanup_service import session_cleanup_service
+
+
+def _add_session(db_session, status="active", **fields):
+    session = IntakeSession(session_token=uuid.uuid4().hex, status=status, **fields)
+    db_session.add(session)
+    db_session.commit()
+    return session
+
+
+def _stats(db_session):
+    return session_cleanup_service.get_session_stats(db_session)
+
+
+def test_stats_follow_pause_resume_and_cleanup(db_session):
+    """Test counts after ORM pause, Core resume and bulk cleanup"""
+    resumed = _add_session(db_session)
+    expired = _add_session(db_session)
+    for session in (resumed, expired):
+        session.status = "paused"
+        session.expires_at = datetime.utcnow() - timedelta(hours=1)
+    db_session.commit()
+    assert _stats(db_session)["paused"] == 2
+    
+    _set_paused_session_status(db_session, resumed.id, "active")
+    assert _stats(db_session)["active"] == 1
+    assert _stats(db_session)["paused"] == 1
+    
+    assert session_cleanup_service.cleanup_expired_sessions(db_session) == 1
+    stats = _stats(db_session)
+    assert stats["paused"] == 0
+    assert stats["abandoned"] == 1
+    assert stats["total"] == 2
+
+
+def test_resume_of_non_paused_session_leaves_stats(db_session):
+    """Test a lost resume race does not move any counts"""
+    session = _add_session(db_session, status="completed")
+    
+    _set_paused_session_status(db_session, session.id, "active")
+    
+    stats = _stats(db_session)
+    assert stats["completed"] == 1
+    assert stats["active"] == 0
+
+
+def test_total_includes_sessions_without_status(db_session):
+    """Test sessions with a NULL status still count towards the total"""
+    _add_session(db_session)
+    db_session.execute(
+        update(IntakeSession).values(status=None)
+    )
+    rebuild_session_stats(db_session.connection())
+    db_session.commit()
+    _add_session(db_session)
+    
+    stats = _stats(db_session)
+    assert stats["active"] == 1
+    assert stats["total"] == 2
+
+
+def test_adjust_upserts_first_write_for_a_status(db_session):
+    """Test adjusting a status with no row yet creates it, and again adds to it"""
+    adjust_session_stats(db_session.connection(), {"paused": 1})
+    adjust_session_stats(db_session.connection(), {"paused": 2})
+    db_session.commit()
+    
+    assert _stats(db_session)["paused"] == 3
@@ -0,0 +1,139 @@
+"""
+Test the Redis session store's per-request working copies
+"""
+import asyncio
+
+import pytest
+
+from app.services.session_store import RedisSessionStore, _loads
+
+
+class FakePipeline:
+    """Just enough of a redis pipeline for WATCH/MULTI/EXEC updates"""
+
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        pass
+
+    def unwatch(self):
+        pass
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def multi(self):
+        self.queued = []
+
+    def setex(self, key, ttl, value):
+        self.queued.append((key, ttl, value))
+
+    def execute(self):
+        for key, ttl, value in self.queued:
+            self.client.setex(key, ttl, value)
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis client calls the store makes"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        return [key for key in self.data if key.startswith(prefix)]
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def store():
+    store = RedisSessionStore(FakeRedis(), ttl_seconds=60)
+    store["abc"] = {"conversation_history": [], "current_phase": "greeting"}
+    return store
+
+
+def _stored(store, token="abc"):
+    return _loads(store.client.data[store._key(token)])
+
+
+def test_scope_writes_back_changes(store):
+    """Test in-place changes inside a scope reach Redis when the scope closes"""
+    async def request():
+        async with store.scope("abc"):
+            store.get("abc")["conversation_history"].append({"role": "user", "content": "hi"})
+    
+    asyncio.run(request())
+    assert _stored(store)["conversation_history"] == [{"role": "user", "content": "hi"}]
+
+
+def test_failed_scope_writes_nothing(store):
+    """Test a request that raises leaves the stored session untouched and holds no copy"""
+    async def request():
+        async with store.scope("abc"):
+            store.get("abc")["current_phase"] = "screening"
+            raise RuntimeError("boom")
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(request())
+    assert _stored(store)["current_phase"] == "greeting"
+    assert store.get("abc")["current_phase"] == "greeting"
+
+
+def test_concurrent_scopes_keep_both_changes(store):
+    """Test two overlapping requests on one worker each keep their own changes"""
+    async def set_phase(started, release):
+        async with store.scope("abc"):
+            store.get("abc")["current_phase"] = "screening"
+            started.set()
+            await release.wait()
+    
+    async def add_message(started, release):
+        await started.wait()
+        async with store.scope("abc"):
+            store.get("abc")["conversation_history"].append({"role": "user", "content": "hi"})
+        release.set()
+    
+    async def main():
+        started, release = asyncio.Event(), asyncio.Event()
+        await asyncio.gather(set_phase(started, release), add_message(started, release))
+    
+    asyncio.run(main())
+    session = _stored(store)
+    assert session["current_phase"] == "screening"
+    assert session["conversation_history"] == [{"role": "user", "content": "hi"}]
+
+
+def test_mutate_outside_scope_updates_redis(store):
+    """Test mutate with no open scope applies the change in Redis directly"""
+    store.mutate("abc", lambda session: session.update(user_name="Sam"))
+    assert _stored(store)["user_name"] == "Sam"
+    assert len(store) == 1
+    
+    store.pop("abc")
+    assert "abc" not in store
+    assert len(store) == 0
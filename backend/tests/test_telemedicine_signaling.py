@@ -0,0 +1,40 @@
+"""
+Test telemedicine signaling access checks
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.cache import cache
+from app.core.security import create_access_token
+from app.services.webrtc_service import webrtc_service
+
+
+def test_end_session_forgets_cached_members():
+    """Test an ended session's membership is not served from cache afterwards"""
+    session_id = "test-session-end"
+    webrtc_service.active_sessions[session_id] = {
+        "provider_id": "p1", "patient_id": "u1", "status": "active", "participants": {}
+    }
+    assert webrtc_service.get_session_members(session_id) == ("p1", "u1")
+    assert cache.get(f"tm:members:{session_id}") is not None
+    
+    async def end():
+        await webrtc_service.end_session(session_id, "p1")
+    
+    asyncio.run(end())
+    webrtc_service.active_sessions.pop(session_id, None)
+    
+    assert cache.get(f"tm:members:{session_id}") is None
+    assert webrtc_service.get_session_members(session_id) is None
+
+
+def test_signaling_rejects_unknown_session(client: TestClient):
+    """Test connecting to a session that does not exist is closed with 4004"""
+    token = create_access_token({"sub": "someone"})
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(f"/api/v1/telemedicine/sessions/missing/signaling?token={token}"):
+            pass
+    assert exc_info.value.code == 4004